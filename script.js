@@ -14,7 +14,7 @@ const TIMING = {
 };
 
 const DATA_URLS = {
-    VIZ: 'data/viz_data.json',
+    VIZ: 'data/viz/manifest.json',
     STORY: 'data/curated_story.json',
     TRENDS: 'data/word_trends.json'
 };
@@ -22,13 +22,23 @@ const DATA_URLS = {
 // =============================================================================
 // STATE - Module-scoped, not global window.*
 // =============================================================================
-let vizData = null;
+let vizManifest = null;
 let storyData = null;
 let wordTrendsData = null;
 let svg = null;
 let dots = null;
 let currentSection = null;
-let filteredParagraphs = null;
+let filteredParagraphs = [];
+let speechSummaries = new Map();
+let speechDots = new Map();
+let speechShards = new Map();
+let dotColumns = null;
+let dotsLoaded = null;
+let shardRequests = new Map();
+let dotLayout = null;
+let dotGroup = null;
+let highlightedRange = null;
+let hoverPanelDot = null;
 let yearPositions = {};
 let interactiveModeCooldown = false;
 let interactiveModeTimeout = null;
@@ -79,6 +89,8 @@ function getResponsiveConfig() {
         marginLeft: isMobile ? 10 : 25,
         hideAnnotations: isMobile,
         maxCols: isSmallMobile ? 4 : (isMobile ? 5 : 6),
+        // Names the precomputed year spans to use (BREAKPOINTS in scripts/viz_layout.py)
+        breakpoint: isSmallMobile ? 'small' : (isMobile ? 'mobile' : 'desktop'),
         isMobile: isMobile,
         isSmallMobile: isSmallMobile,
         hideSvgLegend: isMobile, // Hide SVG legend on mobile, use CSS legend
@@ -192,6 +204,137 @@ async function fetchJSON(url) {
     return response.json();
 }
 
+async function fetchBuffer(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch ${url}: ${response.status} ${response.statusText}`);
+    }
+    return response.arrayBuffer();
+}
+
+// Paths in the manifest are relative to it
+function vizUrl(path) {
+    return DATA_URLS.VIZ.slice(0, DATA_URLS.VIZ.lastIndexOf('/') + 1) + path;
+}
+
+// Each text shard is requested at most once
+function fetchShard(path) {
+    if (!shardRequests.has(path)) {
+        shardRequests.set(path, fetchJSON(vizUrl(path)).catch(error => {
+            shardRequests.delete(path); // allow a retry
+            throw error;
+        }));
+    }
+    return shardRequests.get(path);
+}
+
+const dotCount = counts => counts.promise.citizen + counts.promise.firm +
+    counts.obligation.citizen + counts.obligation.firm;
+
+// A dot is a row of the dots.bin and layout.bin columns; only its text lives on the object
+class Dot {
+    constructor(i) {
+        this.i = i;
+        this.text = undefined;
+    }
+    get _uid() { return this.i; }
+    // Slot in the year's grid (layout.bin): column = slot % cols, row = slot / cols
+    get xPos() {
+        const { dotSize, dotGap } = dotLayout;
+        const grid = dotLayout.grid[this.year];
+        return grid.x + (dotColumns.slot[this.i] % grid.cols) * (dotSize + dotGap) + dotSize / 2;
+    }
+    get yPos() {
+        const { dotSize, dotGap, baseline } = dotLayout;
+        const row = Math.floor(dotColumns.slot[this.i] / dotLayout.grid[this.year].cols);
+        return this.primary_type === 'promise'
+            ? baseline - dotSize - row * (dotSize + dotGap)   // Promises ABOVE baseline
+            : baseline + dotSize + row * (dotSize + dotGap);  // Obligations BELOW baseline
+    }
+    get year() { return dotColumns.year[this.i]; }
+    get speech_id() { return dotColumns.speechId[this.i]; }
+    get primary_type() { return dotColumns.categories[dotColumns.category[this.i]][0]; }
+    get primary_value() { return dotColumns.categories[dotColumns.category[this.i]][1]; }
+    get fm_name() { return dotColumns.fmNames[dotColumns.fmName[this.i]]; }
+    get _shard() { return speechShards.get(this.speech_id); }
+}
+
+// dots.bin (see generate_viz_data_from_v9.py): 'BVZ1', Uint32 count, then the
+// columns Uint16 year, Uint16 speech_id, Uint8 category, Uint8 fm_name, viewed
+// in place (little-endian, as every browser is)
+function decodeDots(buffer, spec) {
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    const count = new DataView(buffer).getUint32(4, true);
+    if (magic !== 'BVZ1' || count !== spec.count || buffer.byteLength !== 8 + 6 * count) {
+        throw new Error('Invalid dots.bin: does not match the manifest - regenerate both');
+    }
+    return {
+        year: new Uint16Array(buffer, 8, count),
+        speechId: new Uint16Array(buffer, 8 + 2 * count, count),
+        category: new Uint8Array(buffer, 8 + 4 * count, count),
+        fmName: new Uint8Array(buffer, 8 + 5 * count, count),
+        categories: spec.categories,
+        fmNames: spec.fm_names
+    };
+}
+
+// layout.bin: Uint16 slot[count], each dot's place in its year's grid
+function decodeSlots(buffer, spec) {
+    if (spec.count !== vizManifest.dots.count || buffer.byteLength !== 2 * spec.count) {
+        throw new Error('Invalid layout.bin: does not match the manifest - regenerate both');
+    }
+    return new Uint16Array(buffer, 0, spec.count);
+}
+
+// Dots load after the first chart (axes, year widths, labels), which only waits for the manifest
+function loadDots() {
+    dotsLoaded = Promise.all([
+        fetchBuffer(vizUrl(vizManifest.dots.path)),
+        fetchBuffer(vizUrl(vizManifest.layout.path))
+    ]).then(([dotsBuffer, layoutBuffer]) => {
+        dotColumns = decodeDots(dotsBuffer, vizManifest.dots);
+        dotColumns.slot = decodeSlots(layoutBuffer, vizManifest.layout);
+        addDots();
+    });
+    dotsLoaded.catch(error => console.error('[Data] Failed to load dots:', error));
+}
+
+function addDots() {
+    // Rows are in corpus order, so a speech's dots are normally one run of rows;
+    // a speech that turns up again later gets its later runs appended
+    const { speechId } = dotColumns;
+    filteredParagraphs = Array.from(speechId, (_, i) => new Dot(i));
+    for (let start = 0, end = 0; start < speechId.length; start = end) {
+        while (end < speechId.length && speechId[end] === speechId[start]) end++;
+        const run = filteredParagraphs.slice(start, end);
+        const dots = speechDots.get(speechId[start]);
+        speechDots.set(speechId[start], dots ? dots.concat(run) : run);
+    }
+
+    renderDots();
+}
+
+// Paragraph text is fetched per shard, when its era is highlighted or a dot is hovered
+function loadShardText(shard) {
+    // A shard's texts are in dots.bin row order, whatever order its speeches are listed in
+    return Promise.all([dotsLoaded, fetchShard(shard.text)]).then(([, texts]) => {
+        [...new Set(shard.speeches)]
+            .flatMap(id => speechDots.get(id) || [])
+            .sort((a, b) => a.i - b.i)
+            .forEach((d, i) => { d.text = texts[i]; });
+    });
+}
+
+function loadTextForYears(start, end) {
+    vizManifest.shards
+        .filter(shard => shard.speeches.some(id => {
+            const year = speechSummaries.get(id).year;
+            return year >= start && year <= end;
+        }))
+        .forEach(shard => loadShardText(shard).catch(error =>
+            console.error(`[Data] Failed to load ${shard.text}:`, error)));
+}
+
 function showLoadingState() {
     const container = document.getElementById('timeline-viz');
     if (container) {
@@ -228,31 +371,31 @@ document.addEventListener('DOMContentLoaded', async () => {
     try {
         console.log('[Init] Fetching data...');
         // Fetch all data with proper error handling
-        const [vizResult, storyResult, trendsResult] = await Promise.all([
+        const [manifestResult, storyResult, trendsResult] = await Promise.all([
             fetchJSON(DATA_URLS.VIZ),
             fetchJSON(DATA_URLS.STORY),
             fetchJSON(DATA_URLS.TRENDS)
         ]);
         console.log('[Init] Data fetched successfully');
 
-        vizData = vizResult;
+        vizManifest = manifestResult;
         storyData = storyResult;
         wordTrendsData = trendsResult;
 
         // Validate data structure
-        if (!vizData.paragraphs || !Array.isArray(vizData.paragraphs)) {
-            throw new Error('Invalid viz_data.json: missing paragraphs array');
+        if (!Array.isArray(vizManifest.years) || !Array.isArray(vizManifest.shards) ||
+            !vizManifest.dots || !vizManifest.layout) {
+            throw new Error('Invalid viz manifest: missing years, shards, dots or layout');
         }
         if (!storyData.sections || !Array.isArray(storyData.sections)) {
             throw new Error('Invalid curated_story.json: missing sections array');
         }
         console.log('[Init] Data validated');
 
-        // Add unique IDs for D3 keying if not present
-        filteredParagraphs = vizData.paragraphs
-            .filter(p => p.primary_value && p.primary_value !== 'none')
-            .map((p, idx) => ({ ...p, _uid: p.id || `para_${idx}` }));
-        console.log('[Init] Filtered paragraphs:', filteredParagraphs.length);
+        speechSummaries = new Map(vizManifest.speeches.map(s => [s.speech_id, s]));
+        vizManifest.shards.forEach(shard => shard.speeches.forEach(id => speechShards.set(id, shard)));
+        console.log('[Init] Manifest:', vizManifest.shards.length, 'shards,',
+            d3.sum(vizManifest.years, y => dotCount(y.counts)), 'dots');
 
         generateStorySections();
         console.log('[Init] Story sections generated');
@@ -264,6 +407,7 @@ document.addEventListener('DOMContentLoaded', async () => {
 
         setupScrollTriggers();
         setupButtonListeners();
+        loadDots();
         console.log('[Init] Complete');
 
     } catch (error) {
@@ -634,42 +778,21 @@ function initVisualization() {
         .attr('width', width)
         .attr('height', height);
 
-    const yearGroups = d3.group(filteredParagraphs, d => d.year);
-    const years = [...yearGroups.keys()].sort((a, b) => a - b);
-
-    // Variable width calculation - now responsive
+    // Year spans (fractions of the chart width) are precomputed per breakpoint and dot
+    // slots once for all (scripts/viz_layout.py); only the columns depend on the width
     const dotSize = config.dotSize;
     const dotGap = config.dotGap;
-    const yearGap = 2;
-    const maxCols = config.maxCols;
-
+    const breakpoint = vizManifest.layout.breakpoints.find(b => b.name === config.breakpoint);
     const availableWidth = width - margin.left - margin.right;
 
-    let yearWidths = {};
-    let totalWidth = 0;
-
-    years.forEach(year => {
-        const count = yearGroups.get(year).length;
-        const cols = Math.min(count, maxCols);
-        const yearWidth = cols * (dotSize + dotGap) + yearGap;
-        yearWidths[year] = { count, cols, width: yearWidth };
-        totalWidth += yearWidth;
-    });
-
-    const scale = totalWidth > 0 ? availableWidth / totalWidth : 1;
-
-    let currentX = margin.left;
     yearPositions = {};
-
-    years.forEach(year => {
-        const scaledWidth = yearWidths[year].width * scale;
+    breakpoint.years.forEach(([year, start, center, end]) => {
         yearPositions[year] = {
-            start: currentX,
-            center: currentX + scaledWidth / 2,
-            end: currentX + scaledWidth - yearGap * scale,
-            width: scaledWidth - yearGap * scale
+            start: margin.left + start * availableWidth,
+            center: margin.left + center * availableWidth,
+            end: margin.left + end * availableWidth,
+            width: (end - start) * availableWidth
         };
-        currentX += scaledWidth;
     });
 
     // Position dots - Diverging chart: promises ABOVE baseline, demands BELOW baseline
@@ -677,64 +800,26 @@ function initVisualization() {
     const chartHeight = height - margin.top - margin.bottom;
     const baseline = margin.top + chartHeight * 0.5; // Middle of chart
 
-    years.forEach(year => {
-        const yearParas = yearGroups.get(year);
-        const yearPos = yearPositions[year];
-        const effectiveWidth = yearPos.width;
+    dotLayout = { dotSize, dotGap, baseline, grid: {} };
+    const yearMaxY = {};
+
+    vizManifest.years.filter(y => yearPositions[y.year]).forEach(({ year, counts }) => {
+        const effectiveWidth = yearPositions[year].width;
         const cols = Math.max(1, Math.floor(effectiveWidth / (dotSize + dotGap)));
         const gridWidth = cols * (dotSize + dotGap);
-        const offsetX = (effectiveWidth - gridWidth) / 2;
+        dotLayout.grid[year] = { cols, x: yearPositions[year].start + (effectiveWidth - gridWidth) / 2 };
 
-        // Separate promises and obligations
-        const promises = yearParas.filter(p => p.primary_type === 'promise');
-        const obligations = yearParas.filter(p => p.primary_type === 'obligation');
-
-        // Sort promises: darker (citizen) closer to baseline, lighter (firm) further up
-        promises.sort((a, b) => {
-            const order = (p) => p.primary_value === 'citizen' ? 0 : 1;
-            return order(a) - order(b);
-        });
-
-        // Sort obligations: darker (citizen) closer to baseline, lighter (firm) further down
-        obligations.sort((a, b) => {
-            const order = (p) => p.primary_value === 'citizen' ? 0 : 1;
-            return order(a) - order(b);
-        });
-
-        // Position promises ABOVE baseline (going upward)
-        promises.forEach((p, idx) => {
-            const row = Math.floor(idx / cols);
-            const col = idx % cols;
-
-            p.xPos = yearPos.start + offsetX + col * (dotSize + dotGap) + dotSize / 2;
-            p.yPos = baseline - dotSize - row * (dotSize + dotGap); // Above baseline
-        });
-
-        // Position obligations BELOW baseline (going downward)
-        obligations.forEach((p, idx) => {
-            const row = Math.floor(idx / cols);
-            const col = idx % cols;
-
-            p.xPos = yearPos.start + offsetX + col * (dotSize + dotGap) + dotSize / 2;
-            p.yPos = baseline + dotSize + row * (dotSize + dotGap); // Below baseline
-        });
+        // Bottom edge of the year's dots, for its label
+        const obligationRows = Math.ceil((counts.obligation.citizen + counts.obligation.firm) / cols);
+        yearMaxY[year] = (obligationRows > 0
+            ? baseline + dotSize + (obligationRows - 1) * (dotSize + dotGap)
+            : baseline - dotSize) + dotSize / 2;
     });
 
     // Year labels positioned dynamically below where each year's boxes end
     const labelYears = [1965, 1980, 2000, 2020, 2026];
     const yearLabelPadding = config.isMobile ? 12 : 15;
 
-    // Calculate max y position for each label year
-    const yearMaxY = {};
-    labelYears.forEach(year => {
-        const yearParas = filteredParagraphs.filter(p => p.year === year);
-        if (yearParas.length > 0) {
-            yearMaxY[year] = Math.max(...yearParas.map(p => p.yPos)) + dotSize / 2;
-        } else {
-            yearMaxY[year] = baseline; // fallback
-        }
-    });
-
     svg.selectAll('.year-label')
         .data(labelYears.filter(y => yearPositions[y]))
         .join('text')
@@ -823,10 +908,37 @@ function initVisualization() {
         });
     }
 
-    // Dots - use unique ID for stable data binding across resize
-    dots = svg.selectAll('.dot')
+    // Dots go in their own group, filled in by renderDots() once dots.bin loads
+    dotGroup = svg.append('g').attr('class', 'dots');
+    dots = null;
+    renderDots();
+
+    // Touch slide support for mobile - allows sliding finger across squares
+    // Store references for cleanup on resize
+    setupTouchListeners(svg.node());
+
+    // Highlight box - must not block pointer events on dots
+    svg.append('rect')
+        .attr('class', 'highlight-box')
+        .attr('y', margin.top)
+        .attr('height', height - margin.top - margin.bottom)
+        .attr('fill', '#fad8ac8f')
+        .attr('opacity', 0)
+        .style('pointer-events', 'none');
+}
+
+// Draw dots not yet on the chart
+function renderDots() {
+    if (!dotGroup || !dotColumns) return;
+
+    // Dots - use unique ID for stable data binding across resize. Only entering
+    // dots are set up: dots already drawn keep their place
+    const { dotSize } = dotLayout;
+    const interactive = document.body.classList.contains('interactive-mode');
+    const entering = dotGroup.selectAll('.dot')
         .data(filteredParagraphs, d => d._uid)
-        .join('rect')
+        .enter()
+        .append('rect')
         .attr('class', 'dot')
         .attr('x', d => d.xPos - dotSize / 2)
         .attr('y', d => d.yPos - dotSize / 2)
@@ -846,7 +958,10 @@ function initVisualization() {
 
             return '#b0b0b0';
         })
-        .attr('opacity', 0.9)
+        .attr('opacity', d => !interactive && highlightedRange
+            ? ((d.year >= highlightedRange[0] && d.year <= highlightedRange[1]) ? 1 : 0.12)
+            : 0.9)
+        .style('pointer-events', interactive ? 'auto' : null)
         .attr('stroke', 'none')
         .attr('stroke-width', 0)
         .style('cursor', d => {
@@ -897,18 +1012,7 @@ function initVisualization() {
             pinQuote();
         });
 
-    // Touch slide support for mobile - allows sliding finger across squares
-    // Store references for cleanup on resize
-    setupTouchListeners(svg.node());
-
-    // Highlight box - must not block pointer events on dots
-    svg.append('rect')
-        .attr('class', 'highlight-box')
-        .attr('y', margin.top)
-        .attr('height', height - margin.top - margin.bottom)
-        .attr('fill', '#fad8ac8f')
-        .attr('opacity', 0)
-        .style('pointer-events', 'none');
+    dots = dots ? dots.merge(entering) : entering;
 }
 
 // Scroll triggers
@@ -1043,6 +1147,8 @@ function enableInteractiveMode() {
 }
 
 function highlightYearRange(start, end) {
+    highlightedRange = [start, end];
+    loadTextForYears(start, end);
     if (!dots) return;
 
     const years = Object.keys(yearPositions).map(Number).filter(y => y >= start && y <= end);
@@ -1090,7 +1196,21 @@ function showHoverPanel(d) {
 
     panel.querySelector('.hover-panel-year').textContent = d.year;
     panel.querySelector('.hover-panel-fm').textContent = d.fm_name || '';
-    panel.querySelector('.hover-panel-quote').textContent = `"${d.text}"`;
+    const quote = panel.querySelector('.hover-panel-quote');
+    hoverPanelDot = d;
+    if (d.text !== undefined) {
+        quote.textContent = `"${d.text}"`;
+    } else {
+        quote.textContent = 'Loading…';
+        loadShardText(d._shard)
+            .then(() => {
+                if (hoverPanelDot === d) quote.textContent = `"${d.text}"`;
+            })
+            .catch(error => {
+                console.error(`[Data] Failed to load ${d._shard.text}:`, error);
+                if (hoverPanelDot === d) quote.textContent = 'Could not load this paragraph.';
+            });
+    }
 
     const tag = panel.querySelector('.hover-panel-tag');
     if (d.primary_type === 'promise') {
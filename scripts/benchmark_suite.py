@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: time and peak memory of each stage on synthetic corpora.
+
+Generates (once, then reuses) synthetic corpora at 1x, 10x and 100x the 67
+real speeches with processing/synthetic_corpus.py, then runs each stage the
+way its script does, file in -> file out:
+1. segment - process_speech_file() on every speech, paragraph CSV written
+2. clean - clean_corpus_v3.py main() over the paragraph CSV, report included
+3. viz - generate_viz_data_from_v9 load_paragraphs() + write_viz_json() and the summary,
+   against a synthetic classification CSV (the LLM step isn't benchmarked)
+4. word_freq - the loading, tokenising and per-year counting cells of
+   word_frequency_analysis.ipynb, executed as they are
+
+Each stage runs in a fresh process, so peak RSS (from getrusage) is that
+stage's alone. Results are appended to benchmarks/results.jsonl with the
+git commit they were measured at; `compare` sets two commits side by side.
+
+Usage:
+    python scripts/benchmark_suite.py run --scales 1 10 100
+    python scripts/benchmark_suite.py run --scales 10 --stages segment clean
+    python scripts/benchmark_suite.py compare                  # last two commits
+    python scripts/benchmark_suite.py compare --base 1f5d85a --head HEAD
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'processing'))
+
+from synthetic_corpus import REAL_SPEECHES, generate
+
+STAGES = ['segment', 'clean', 'viz', 'word_freq']
+CATEGORIES = ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral']
+# Word-frequency notebook cells that load, tokenise and count (no pandas needed)
+WORD_FREQ_CELLS = [1, 2]
+
+
+def stage_segment(work: Path):
+    from process_speeches_to_paragraphs import PARAGRAPH_FIELDS, load_metadata, process_speech_file
+    metadata = load_metadata(work / 'metadata.csv')
+    with open(work / 'paragraphs.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PARAGRAPH_FIELDS)
+        writer.writeheader()
+        for file_path in sorted((work / 'corpus').glob('*.txt')):
+            writer.writerows(process_speech_file(file_path, metadata[file_path.name]))
+
+
+def stage_clean(work: Path):
+    import clean_corpus_v3
+    argv = ['clean_corpus_v3.py', '--input', str(work / 'paragraphs.csv'), '--output', str(work / 'clean.csv'),
+            '--removed', str(work / 'removed.csv')]
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        sys.argv = argv
+        clean_corpus_v3.main()
+
+
+def write_classifications(work: Path):
+    """Synthetic V9 results for the clean corpus (category from a hash of the id)."""
+    with open(work / 'clean.csv', 'r', encoding='utf-8') as src, \
+            open(work / 'classifications.csv', 'w', encoding='utf-8', newline='') as dst:
+        writer = csv.DictWriter(dst, fieldnames=['paragraph_id', 'speech_id', 'paragraph_num', 'year', 'date',
+                                                 'fm_name', 'pm_name', 'paragraph_text', 'category'])
+        writer.writeheader()
+        for row in csv.DictReader(src):
+            text = row['paragraph_text']
+            writer.writerow({
+                'paragraph_id': row['paragraph_id'], 'speech_id': row['speech_id'],
+                'paragraph_num': row['paragraph_num'], 'year': row['year'], 'date': row['date'],
+                'fm_name': row['fm_name'], 'pm_name': row['pm_name'],
+                'paragraph_text': text[:200] + '...' if len(text) > 200 else text,
+                'category': CATEGORIES[zlib.crc32(row['paragraph_id'].encode()) % len(CATEGORIES)],
+            })
+
+
+def stage_viz(work: Path):
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    from generate_viz_data_from_v9 import VizSummary, load_paragraphs, write_viz_json, write_viz_summary
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        paragraphs = load_paragraphs(work / 'classifications.csv', work / 'clean.csv')
+    summary = VizSummary()
+    write_viz_json(summary.track(paragraphs), work / 'viz_data.json')
+    write_viz_summary(summary, work / 'viz_summary.json')
+
+
+def stage_word_freq(work: Path):
+    notebook = json.loads((SCRIPTS_DIR / 'word_frequency_analysis.ipynb').read_text(encoding='utf-8'))
+    cells = [c for c in notebook['cells'] if c['cell_type'] == 'code']
+    os.environ['BUDGET_CORPUS_DIR'] = str(work / 'corpus')
+    namespace = {}
+    exec('import os, re\nfrom pathlib import Path\nfrom collections import Counter, defaultdict', namespace)
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for i in WORD_FREQ_CELLS:
+            source = cells[i]['source']
+            exec(source if isinstance(source, str) else ''.join(source), namespace)
+
+
+def _run_in_child(stage, work, queue):
+    """Child process: run one stage, report (seconds, peak RSS MB, RSS MB before the stage)."""
+    stage_fn = globals()[f"stage_{stage}"]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    stage_fn(Path(work))
+    seconds = time.perf_counter() - start
+    queue.put((seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, before))
+
+
+def measure(stage: str, work: Path) -> dict:
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_in_child, args=(stage, str(work), queue))
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        raise RuntimeError(f"stage {stage} failed (exit code {proc.exitcode})")
+    seconds, peak_mb, base_mb = queue.get()
+    return {'seconds': round(seconds, 3), 'peak_rss_mb': round(peak_mb, 1), 'stage_rss_mb': round(peak_mb - base_mb, 1)}
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def corpus_for(scale: float, root: Path) -> Path:
+    work = root / f"scale_{scale:g}x"
+    if not (work / 'metadata.csv').exists():
+        speeches = max(1, round(REAL_SPEECHES * scale))
+        print(f"Generating {speeches:,} synthetic speeches in {work}...")
+        generate(work, speeches)
+    return work
+
+
+def run(args):
+    commit = git_commit()
+    root = Path(args.corpus_root)
+    results_path = Path(args.results)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print("="*72)
+    print(f"BENCHMARK SUITE @ {commit}")
+    print("="*72)
+    for scale in args.scales:
+        work = corpus_for(scale, root)
+        size_mb = sum(p.stat().st_size for p in (work / 'corpus').glob('*.txt')) / 1e6
+        print(f"\n{scale:g}x ({size_mb:.1f} MB of speeches)")
+        print(f"{'stage':<12} {'time (s)':>9} {'MB/s':>7} {'peak RSS (MB)':>14} {'stage RSS (MB)':>15}")
+        for stage in [s for s in STAGES if s in args.stages]:
+            # Stages read the files earlier stages write, even when those aren't measured
+            if stage in ('clean', 'viz') and not (work / 'paragraphs.csv').exists():
+                stage_segment(work)
+            if stage == 'viz' and not (work / 'clean.csv').exists():
+                stage_clean(work)
+            if stage == 'viz' and not (work / 'classifications.csv').exists():
+                write_classifications(work)
+            result = measure(stage, work)
+            if stage == 'clean':
+                # Fresh synthetic labels for the new clean corpus
+                write_classifications(work)
+            print(f"{stage:<12} {result['seconds']:>9.2f} {size_mb/result['seconds']:>7.1f} "
+                  f"{result['peak_rss_mb']:>14,.0f} {result['stage_rss_mb']:>15,.0f}")
+            record = {'commit': commit, 'ts': time.time(), 'scale': scale, 'stage': stage,
+                      'corpus_mb': round(size_mb, 1), 'python': platform.python_version(),
+                      'machine': platform.machine(), 'cpus': os.cpu_count(), **result}
+            with open(results_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+    print(f"\nResults appended to {results_path} (compare with: python {Path(__file__).name} compare)")
+
+
+def compare(args):
+    with open(args.results) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    commits = list(dict.fromkeys(r['commit'] for r in records))
+    if not commits:
+        sys.exit(f"No results in {args.results}")
+
+    def resolve(commit):
+        commit = git_commit() if commit == 'HEAD' else commit
+        return next((c for c in commits if c.startswith(commit) or commit.startswith(c)), None)
+
+    head = resolve(args.head) if args.head else commits[-1]
+    base = resolve(args.base) if args.base else (commits[-2] if len(commits) > 1 else None)
+    if head is None:
+        sys.exit(f"No results for {args.head} in {args.results}")
+
+    def latest(commit):
+        # The most recent measurement per (scale, stage) at that commit
+        return {(r['scale'], r['stage']): r for r in records if r['commit'] == commit}
+
+    head_results, base_results = latest(head), latest(base) if base else {}
+    print("="*80)
+    print(f"BENCHMARK COMPARISON: {base or '-'} -> {head}")
+    print("="*80)
+    print(f"{'scale':>6} {'stage':<10} {'base (s)':>9} {'head (s)':>9} {'change':>8} "
+          f"{'base RSS':>9} {'head RSS':>9} {'change':>8}")
+    for key in sorted(head_results, key=lambda k: (k[0], STAGES.index(k[1]))):
+        h, b = head_results[key], base_results.get(key)
+        if b:
+            print(f"{key[0]:>5g}x {key[1]:<10} {b['seconds']:>9.2f} {h['seconds']:>9.2f} "
+                  f"{(h['seconds']/b['seconds'] - 1)*100:>+7.1f}% {b['peak_rss_mb']:>9,.0f} "
+                  f"{h['peak_rss_mb']:>9,.0f} {(h['peak_rss_mb']/b['peak_rss_mb'] - 1)*100:>+7.1f}%")
+        else:
+            print(f"{key[0]:>5g}x {key[1]:<10} {'-':>9} {h['seconds']:>9.2f} {'':>8} {'-':>9} "
+                  f"{h['peak_rss_mb']:>9,.0f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-stage time and memory on synthetic corpora")
+    parser.add_argument('--results', default=str(REPO_DIR / 'benchmarks' / 'results.jsonl'))
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    r = sub.add_parser('run')
+    r.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100],
+                   help=f"multiples of the real {REAL_SPEECHES}-speech corpus (default: 1 10 100)")
+    r.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    r.add_argument('--corpus-root', default=os.path.join(tempfile.gettempdir(), 'budget_benchmark'),
+                   help="where synthetic corpora are generated and kept between runs")
+
+    c = sub.add_parser('compare')
+    c.add_argument('--base', help="commit to compare against (default: the previous one measured)")
+    c.add_argument('--head', help="commit to compare (default: the last one measured; HEAD for the checkout)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark the page's dot payload: JSON against the packed dots.bin.
+
+Builds, from one set of classification results:
+1. viz_data.json - the indented JSON the page used to load whole
+2. layout JSON - only the fields drawing needs (year, speech_id,
+   primary_type, primary_value, fm_name) for the drawn paragraphs, minified
+3. dots.bin - the same fields packed in columns (generate_viz_data_from_v9.py)
+
+and reports for each the size (raw and gzipped, as a server would send it),
+the time to parse it into something drawable (JSON.parse of the text, or
+typed-array views on the buffer) and the heap that result holds. Parse time
+and heap are measured in node, which runs the same V8 as Chrome; without
+node only sizes are reported.
+
+Usage:
+    python scripts/benchmark_viz_payload.py --classifications data/classification_results_full_corpus_v9.csv \\
+        --corpus data/budget_speeches_paragraphs_v3_clean.csv
+    python scripts/benchmark_viz_payload.py --scale 10
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'processing'))
+
+from benchmark_suite import corpus_for, stage_clean, stage_segment, write_classifications
+from generate_viz_data_from_v9 import VizShardWriter, VizSummary, is_dot, load_paragraphs, write_viz_json
+
+LAYOUT_FIELDS = ['year', 'speech_id', 'primary_type', 'primary_value', 'fm_name']
+
+# Parse a payload `runs` times; print the median time and the heap the result holds
+NODE_MEASURE = r'''
+const fs = require('fs');
+const [kind, file, runs] = process.argv.slice(1);
+const bytes = fs.readFileSync(file);
+const freshBuffer = () => bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.byteLength);
+function parse(buffer) {
+    if (kind === 'json') return JSON.parse(Buffer.from(buffer).toString('utf8'));
+    const n = new DataView(buffer).getUint32(4, true);
+    return [new Uint16Array(buffer, 8, n), new Uint16Array(buffer, 8 + 2 * n, n),
+            new Uint8Array(buffer, 8 + 4 * n, n), new Uint8Array(buffer, 8 + 5 * n, n)];
+}
+const used = () => { global.gc(); global.gc(); const m = process.memoryUsage(); return m.heapUsed + m.arrayBuffers; };
+const times = [];
+for (let i = 0; i < Number(runs); i++) {
+    const buffer = freshBuffer();  // what fetch() hands over
+    const start = process.hrtime.bigint();
+    parse(buffer);
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+}
+times.sort((a, b) => a - b);
+const before = used();
+const kept = parse(freshBuffer());
+const heap = used() - before;
+console.log(JSON.stringify({ ms: times[times.length >> 1], heap_mb: heap / 1e6, rows: kept.paragraphs ? kept.paragraphs.length : kept[0].length }));
+'''
+
+
+def build_payloads(classifications: Path, corpus: Path, out: Path) -> dict:
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        paragraphs = load_paragraphs(classifications, corpus)
+    summary = VizSummary()
+    shards = VizShardWriter(out / 'viz', 'year')
+    write_viz_json(shards.track(summary.track(paragraphs)), out / 'viz_data.json')
+    shards.close(summary)
+    with open(out / 'layout.json', 'w') as f:
+        json.dump({'paragraphs': [{k: p[k] for k in LAYOUT_FIELDS} for p in paragraphs if is_dot(p)]},
+                  f, separators=(',', ':'))
+    return {
+        'viz_data.json': ('json', out / 'viz_data.json'),
+        'layout JSON': ('json', out / 'layout.json'),
+        'dots.bin': ('bin', out / 'viz' / 'dots.bin'),
+    }
+
+
+def measure_in_node(kind: str, path: Path, runs: int):
+    node = shutil.which('node')
+    if not node:
+        return None
+    result = subprocess.run([node, '--expose-gc', '-e', NODE_MEASURE, kind, str(path), str(runs)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Size, parse time and heap of the viz dot payloads")
+    parser.add_argument('--classifications', help="V9 classification CSV (with --corpus)")
+    parser.add_argument('--corpus', help="clean corpus CSV")
+    parser.add_argument('--scale', type=float, help="use a synthetic corpus this many times the real one instead")
+    parser.add_argument('--corpus-root', default=os.path.join(tempfile.gettempdir(), 'budget_benchmark'),
+                        help="where synthetic corpora are kept (shared with benchmark_suite.py)")
+    parser.add_argument('--runs', type=int, default=9)
+    args = parser.parse_args()
+    if not args.scale and not (args.classifications and args.corpus):
+        parser.error("give --classifications and --corpus, or --scale")
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.scale:
+        work = corpus_for(args.scale, Path(args.corpus_root))
+        if not (work / 'clean.csv').exists():
+            stage_segment(work)
+            stage_clean(work)
+        if not (work / 'classifications.csv').exists():
+            write_classifications(work)
+        classifications, corpus = work / 'classifications.csv', work / 'clean.csv'
+        label = f"synthetic {args.scale:g}x"
+    else:
+        classifications, corpus = Path(args.classifications), Path(args.corpus)
+        label = str(classifications)
+
+    print("="*72)
+    print(f"VIZ PAYLOAD: {label}")
+    print("="*72)
+    with tempfile.TemporaryDirectory() as tmp:
+        payloads = build_payloads(classifications, corpus, Path(tmp))
+        print(f"{'payload':<14} {'size (KB)':>11} {'gzip (KB)':>10} {'parse (ms)':>11} {'heap (MB)':>10} {'rows':>9}")
+        for name, (kind, path) in payloads.items():
+            data = path.read_bytes()
+            node = measure_in_node(kind, path, args.runs)
+            timing = f"{node['ms']:>11.2f} {node['heap_mb']:>10.2f} {node['rows']:>9,}" if node else f"{'-':>11} {'-':>10} {'-':>9}"
+            print(f"{name:<14} {len(data)/1e3:>11,.1f} {len(gzip.compress(data, 6))/1e3:>10,.1f} {timing}")
+    if not shutil.which('node'):
+        print("\nnode not found: parse time and heap not measured")
+    print("="*72)
+
+
+if __name__ == '__main__':
+    main()
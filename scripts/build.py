@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Build runner: reruns only the stages whose inputs or code changed.
+
+Stages, with declared inputs and outputs (a stage depends on whichever
+stages produce its inputs):
+1. segment - corpus/*.txt + metadata.csv -> budget_speeches_paragraphs.csv
+2. clean - -> budget_speeches_paragraphs_v3_clean.csv, removed_paragraphs_v3.csv
+3. classify - -> classification_results_full_corpus_v9.csv
+4. viz - -> data/viz_data.json, data/viz_summary.json, data/viz/ (the page's dots.bin, layout.bin and text shards)
+5. word_trends - corpus/*.txt -> word_frequency_data.json, word_frequency_summary.csv
+   (executes word_frequency_analysis.ipynb; needs jupyter)
+
+A stage's fingerprint covers its command, the content of every input, and
+its code: the script plus every local module it imports, transitively (so
+an edit to should_remove() makes cleaning stale), or the notebook's code
+cells. A stage runs when its fingerprint differs from the last successful
+run or an output is missing. If it rewrites its outputs unchanged, stages
+downstream stay up to date.
+
+Independent stages (word_trends and the segment -> classify chain) run in
+parallel; each stage's output goes to <workdir>/logs/<stage>.log. Fingerprints
+and file hashes are kept in <workdir>/build_state.json.
+
+Paths default to the repo layout and work from any directory.
+
+Usage:
+    python scripts/build.py                    # everything that's stale
+    python scripts/build.py viz --dry-run      # what viz needs, and why
+    python scripts/build.py --force classify --classify-args="--async --backend fake"
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+MODULE_DIRS = [SCRIPTS_DIR, SCRIPTS_DIR / 'processing', SCRIPTS_DIR / 'classification']
+
+
+class Stage:
+    """A command with declared input/output files and the code it runs."""
+
+    def __init__(self, name, command, inputs, outputs, code, cwd=None, env=None, scratch=()):
+        self.name = name
+        self.command = [str(c) for c in command]
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.code = [Path(p) for p in code]
+        self.cwd = cwd
+        self.env = env or {}
+        # Deleted before each run (e.g. a resume journal that would go stale)
+        self.scratch = [Path(p) for p in scratch]
+        self.fingerprint = None
+
+
+def local_imports(path: Path) -> list:
+    """Repo modules imported by a script, transitively (including the script itself)."""
+    seen, todo = [], [path]
+    while todo:
+        current = todo.pop()
+        if current in seen:
+            continue
+        seen.append(current)
+        for node in ast.walk(ast.parse(current.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                for directory in [current.parent] + MODULE_DIRS:
+                    candidate = directory / (name.split('.')[0] + '.py')
+                    if candidate.exists():
+                        todo.append(candidate)
+                        break
+    return sorted(seen)
+
+
+class FileHasher:
+    """sha256 of files, reusing the previous hash while size and mtime are unchanged."""
+
+    def __init__(self, known: dict):
+        self.known = known
+
+    def file(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+        cached = self.known.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        if path.suffix == '.ipynb':
+            # Only the code counts, not stored outputs or execution counts
+            cells = json.loads(path.read_text(encoding='utf-8'))['cells']
+            digest.update(json.dumps([c['source'] for c in cells if c['cell_type'] == 'code']).encode('utf-8'))
+        else:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        self.known[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return self.known[key][2]
+
+    def tree(self, path: Path) -> dict:
+        """{file: hash} for a file, or every file under a directory."""
+        if path.is_dir():
+            return {str(p): self.file(p) for p in sorted(path.rglob('*')) if p.is_file()}
+        return {str(path): self.file(path)} if path.exists() else {str(path): None}
+
+
+def fingerprint(stage: Stage, hasher: FileHasher) -> dict:
+    inputs, code = {}, {}
+    for path in stage.inputs:
+        inputs.update(hasher.tree(path))
+    for path in stage.code:
+        for module in (local_imports(path) if path.suffix == '.py' else [path]):
+            code[str(module)] = hasher.file(module)
+    return {'command': stage.command, 'env': stage.env, 'inputs': inputs, 'code': code}
+
+
+def stale_reasons(stage: Stage, current: dict, previous: dict) -> list:
+    """Why a stage must run; empty if it's up to date."""
+    if previous is None:
+        return ['never built']
+    reasons = []
+    missing = [p.name for p in stage.outputs if not p.exists()]
+    if missing:
+        reasons.append(f"missing {', '.join(missing)}")
+    if current['command'] != previous['command'] or current['env'] != previous['env']:
+        reasons.append('command changed')
+    for kind in ('inputs', 'code'):
+        changed = [Path(p).name for p, h in current[kind].items() if previous[kind].get(p) != h]
+        changed += [Path(p).name for p in previous[kind] if p not in current[kind]]
+        if changed:
+            shown = ', '.join(changed[:3]) + (f" (+{len(changed) - 3} more)" if len(changed) > 3 else '')
+            reasons.append(f"{kind} changed: {shown}")
+    return reasons
+
+
+def dependencies(stages: list) -> dict:
+    producers = {out: s.name for s in stages for out in s.outputs}
+    return {s.name: sorted({producers[i] for i in s.inputs if i in producers} - {s.name}) for s in stages}
+
+
+def run_stage(stage: Stage, log_dir: Path):
+    """Run a stage's command; returns (ok, seconds)."""
+    for path in stage.scratch:
+        if path.exists():
+            path.unlink()
+    start = time.perf_counter()
+    with open(log_dir / f"{stage.name}.log", 'w') as log:
+        result = subprocess.run(stage.command, cwd=stage.cwd, env=dict(os.environ, **stage.env),
+                                stdout=log, stderr=subprocess.STDOUT)
+    ok = result.returncode == 0 and all(p.exists() for p in stage.outputs)
+    return ok, time.perf_counter() - start
+
+
+def build_stages(args) -> list:
+    work = Path(args.workdir)
+    corpus, metadata = Path(args.corpus_dir), Path(args.metadata)
+    paragraphs = work / 'budget_speeches_paragraphs.csv'
+    clean = work / 'budget_speeches_paragraphs_v3_clean.csv'
+    removed = work / 'removed_paragraphs_v3.csv'
+    results = work / 'classification_results_full_corpus_v9.csv'
+    viz = work / 'viz_data.json'
+    viz_summary = work / 'viz_summary.json'
+    viz_shards = work / 'viz'
+    notebook = SCRIPTS_DIR / 'word_frequency_analysis.ipynb'
+    py = sys.executable
+
+    segment = SCRIPTS_DIR / 'processing' / 'process_speeches_to_paragraphs.py'
+    clean_script = SCRIPTS_DIR / 'processing' / 'clean_corpus_v3.py'
+    classify = SCRIPTS_DIR / 'classification' / 'classify_full_corpus_v9.py'
+    generate_viz = SCRIPTS_DIR / 'generate_viz_data_from_v9.py'
+    return [
+        Stage('segment', [py, segment, '--corpus-dir', corpus, '--metadata', metadata, '--output', paragraphs,
+                          '--quiet'],
+              inputs=[corpus, metadata], outputs=[paragraphs], code=[segment]),
+        Stage('clean', [py, clean_script, '--input', paragraphs, '--output', clean, '--removed', removed],
+              inputs=[paragraphs], outputs=[clean, removed], code=[clean_script]),
+        # classify_full_corpus_v9.py reads and writes fixed names in its working directory. Its resume
+        # state is keyed by paragraph_id, which re-segmenting or re-cleaning can give to another paragraph
+        Stage('classify', [py, classify] + shlex.split(args.classify_args),
+              inputs=[clean], outputs=[results], code=[classify], cwd=work,
+              scratch=[work / 'classification_journal_v9.jsonl', work / 'classification_dead_letters_v9.jsonl',
+                       work / 'classification_checkpoint_v9.csv']),
+        Stage('viz', [py, generate_viz, '--classifications', results, '--corpus', clean, '--output', viz,
+                      '--summary', viz_summary, '--shard-dir', viz_shards],
+              inputs=[results, clean],
+              outputs=[viz, viz_summary, viz_shards / 'manifest.json', viz_shards / 'dots.bin',
+                       viz_shards / 'layout.bin'],
+              code=[generate_viz, SCRIPTS_DIR / 'viz_layout.py']),
+        Stage('word_trends', [py, '-m', 'jupyter', 'nbconvert', '--to', 'notebook', '--execute',
+                              '--output-dir', work / 'logs', notebook],
+              inputs=[corpus], code=[notebook], env={'BUDGET_CORPUS_DIR': str(corpus)},
+              outputs=[SCRIPTS_DIR / 'word_frequency_data.json', SCRIPTS_DIR / 'word_frequency_summary.csv']),
+    ]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the stages whose inputs or code changed")
+    parser.add_argument('targets', nargs='*', help="stages to bring up to date, with their dependencies (default: all)")
+    parser.add_argument('--corpus-dir', default=str(REPO_DIR / 'corpus'))
+    parser.add_argument('--metadata', default=str(REPO_DIR / 'metadata.csv'))
+    parser.add_argument('--workdir', default=str(REPO_DIR / 'data'), help="where intermediate and final files go")
+    parser.add_argument('--classify-args', default='--async', help="extra classify_full_corpus_v9.py arguments")
+    parser.add_argument('--force', nargs='+', default=[], metavar='STAGE', help="run these even if up to date")
+    parser.add_argument('-j', '--jobs', type=int, default=2, help="stages to run at once (default: 2)")
+    parser.add_argument('--dry-run', action='store_true', help="report what's stale without running anything")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    stages = build_stages(args)
+    by_name = {s.name: s for s in stages}
+    deps = dependencies(stages)
+
+    unknown = [t for t in args.targets + args.force if t not in by_name]
+    if unknown:
+        sys.exit(f"Unknown stage(s): {', '.join(unknown)} (stages: {', '.join(by_name)})")
+
+    # The targets and everything upstream of them
+    wanted, todo = set(), list(args.targets or by_name)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(deps[name])
+
+    work = Path(args.workdir)
+    log_dir = work / 'logs'
+    log_dir.mkdir(parents=True, exist_ok=True)
+    state_path = work / 'build_state.json'
+    state = json.loads(state_path.read_text()) if state_path.exists() else {'stages': {}, 'files': {}}
+    hasher = FileHasher(state['files'])
+
+    print("="*60)
+    print(f"BUILD{' (dry run)' if args.dry_run else ''}: {', '.join(s.name for s in stages if s.name in wanted)}")
+    print("="*60)
+
+    status = {}  # name -> 'built' | 'up to date' | 'failed' | 'blocked' | 'stale'
+    running = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        while len(status) < len(wanted):
+            for stage in stages:
+                name = stage.name
+                if name not in wanted or name in status or name in running.values():
+                    continue
+                if any(status.get(d) in ('failed', 'blocked') for d in deps[name]):
+                    status[name] = 'blocked'
+                    print(f"  {name:<12} blocked (dependency failed)")
+                    continue
+                if args.dry_run:
+                    # Upstream stages that would run make this one stale too
+                    if any(d not in status for d in deps[name]):
+                        continue
+                    upstream = [d for d in deps[name] if status[d] == 'stale']
+                elif any(status.get(d) not in ('built', 'up to date') for d in deps[name]):
+                    continue
+                else:
+                    upstream = []
+
+                current = fingerprint(stage, hasher)
+                reasons = stale_reasons(stage, current, state['stages'].get(name))
+                reasons += [f"upstream {d} is stale" for d in upstream]
+                if name in args.force:
+                    reasons.insert(0, 'forced')
+                if not reasons:
+                    status[name] = 'up to date'
+                    print(f"  {name:<12} up to date")
+                elif args.dry_run:
+                    status[name] = 'stale'
+                    print(f"  {name:<12} stale: {'; '.join(reasons)}")
+                else:
+                    print(f"  {name:<12} running ({'; '.join(reasons)})")
+                    running[pool.submit(run_stage, stage, log_dir)] = name
+                    stage.fingerprint = current
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                ok, seconds = future.result()
+                if ok:
+                    status[name] = 'built'
+                    state['stages'][name] = by_name[name].fingerprint
+                    print(f"  {name:<12} built in {seconds:.1f}s")
+                else:
+                    status[name] = 'failed'
+                    print(f"  {name:<12} FAILED after {seconds:.1f}s - see {log_dir / (name + '.log')}")
+                # Save after every stage so an interrupted build keeps its progress
+                state_path.write_text(json.dumps(state, indent=1))
+
+    if not args.dry_run:
+        state_path.write_text(json.dumps(state, indent=1))
+    counts = {}
+    for s in status.values():
+        counts[s] = counts.get(s, 0) + 1
+    print(f"\n{', '.join(f'{v} {k}' for k, v in counts.items())} in {time.perf_counter() - start:.1f}s")
+    sys.exit(1 if counts.get('failed') else 0)
+
+
+if __name__ == '__main__':
+    main()
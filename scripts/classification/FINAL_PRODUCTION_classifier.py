@@ -30,11 +30,11 @@ Next steps to reach 95%:
 
 import csv
 import time
-import os
-import google.generativeai as genai
 
-# Configure Gemini API - set GEMINI_API_KEY environment variable
-genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+from backends import create_backend
+from metrics import MeteredBackend, MetricsRecorder
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache, cached_generate
+from streaming import StreamingBackend
 
 # System and User prompts - VERSION 4
 SYSTEM_PROMPT = """You are an expert classifier specializing in analyzing Singapore political discourse for themes related to fiscal redistribution and civic obligation. Your sole task is to determine if a provided text articulates a PROMISE (prosperity, help, sharing, stability, recovery) or a DEMAND (discipline, participation, compliance, restraint) directed at citizens or firms, and, if so, to categorize it according to a strict set of five themes.
@@ -360,33 +360,69 @@ framing_signal: [crisis_framing, collective_future_framing, vulnerability_framin
 reason: [max 12 words OR "none" if neutral]"""
 
 
-def classify_text(text: str, model_name: str = "gemini-2.0-flash-001") -> dict:
-    """Classify a single text using Gemini API."""
-    model = genai.GenerativeModel(
-        model_name=model_name,
-        system_instruction=SYSTEM_PROMPT
-    )
-    prompt = USER_PROMPT_TEMPLATE.format(text=text)
+# Clients are created once per (backend, model) and reused across calls
+_backends = {}
+
+
+def get_backend(model_name: str = "gemini-2.0-flash-001", backend_name: str = 'gemini', **kwargs):
+    """Return a cached backend for this model, creating it on first use."""
+    key = (backend_name, model_name)
+    if key not in _backends:
+        _backends[key] = create_backend(backend_name, SYSTEM_PROMPT, model_name=model_name, **kwargs)
+    return _backends[key]
+
+
+RESPONSE_FIELDS = ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral',
+                   'supportive_demand', 'framing_signal', 'reason']
+
+
+def parse_response(result_text: str) -> dict:
+    """Parse the eight-line response into a dict (raises ValueError if any field is missing)."""
+    lines = result_text.strip().split('\n')
+    result = {}
+    for line in lines:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip()
+            value = value.strip()
+            if key in ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral', 'supportive_demand']:
+                result[key] = int(value)
+            elif key == 'framing_signal':
+                result[key] = value
+            elif key == 'reason':
+                result[key] = value
+
+    missing = [k for k in RESPONSE_FIELDS if k not in result]
+    if missing:
+        raise ValueError(f"unparseable response (missing {', '.join(missing)})")
+    return result
+
+
+def classify_text(text: str, model_name: str = "gemini-2.0-flash-001", backend=None, cache=None,
+                  metrics=None, selector=None, stream=False) -> dict:
+    """Classify a single text using Gemini API (or the given backend), via an optional ResponseCache.
+
+    With a MetricsRecorder, the request's latency, tokens and outcome are recorded.
+    With a few_shot.FewShotSelector, the prompt carries only the most similar examples.
+    With stream=True, the response is streamed and cut off once all eight fields are in.
+    """
+    backend = backend or get_backend(model_name)
+    if stream:
+        backend = StreamingBackend(backend)
+    backend = MeteredBackend(backend)
+    started = time.perf_counter()
+    template = selector.user_template(text) if selector else USER_PROMPT_TEMPLATE
+    prompt = template.format(text=text)
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-        lines = result_text.split('\n')
-        result = {}
-        for line in lines:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                if key in ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral', 'supportive_demand']:
-                    result[key] = int(value)
-                elif key == 'framing_signal':
-                    result[key] = value
-                elif key == 'reason':
-                    result[key] = value
-        return result
+        result = cached_generate(backend, cache, template, text, prompt, parse=parse_response)
     except Exception as e:
         print(f"Error: {e}")
+        if metrics:
+            metrics.record(backend, started, 1, len(text), 'failed', e)
         return None
+    if metrics:
+        metrics.record(backend, started, 1, len(text), 'ok' if backend.attempts else 'cache_hit')
+    return result
 
 def load_validation_data(csv_path: str) -> list:
     """Load the 68-row validation sample."""
@@ -424,8 +460,14 @@ def compare_with_human_audit(predicted: dict, actual_row: dict) -> dict:
         'human_notes': human_logic
     }
 
-def test_prompt_on_validation_set(csv_path: str, output_path: str):
-    """Test the prompt on all 68 rows and save results."""
+def test_prompt_on_validation_set(csv_path: str, output_path: str, cache_path: str = DEFAULT_CACHE_PATH,
+                                  metrics_path: str = 'validation_metrics.jsonl'):
+    """Test the prompt on all 68 rows and save results.
+
+    Pass cache_path=None to skip the cache, metrics_path=None to skip per-request metrics.
+    """
+    cache = ResponseCache(cache_path) if cache_path else None
+    metrics = MetricsRecorder(metrics_path, source='validation') if metrics_path else None
     print("Loading validation data...")
     data = load_validation_data(csv_path)
     print(f"Loaded {len(data)} rows\n")
@@ -435,7 +477,9 @@ def test_prompt_on_validation_set(csv_path: str, output_path: str):
     for i, row in enumerate(data, 1):
         print(f"[{i}/{len(data)}] Processing row {row['speech_id']}...")
         text = row['paragraph']
-        predicted = classify_text(text)
+        hits_before = cache.hits if cache else 0
+        predicted = classify_text(text, cache=cache, metrics=metrics)
+        cache_hit = cache is not None and cache.hits > hits_before
         if predicted is None:
             print(f"  ⚠ Classification failed")
             continue
@@ -466,7 +510,8 @@ def test_prompt_on_validation_set(csv_path: str, output_path: str):
             'human_notes': comparison['human_notes']
         }
         results.append(result_row)
-        time.sleep(1)
+        if not cache_hit:
+            time.sleep(1)
     print(f"\n\nWriting results to {output_path}...")
     fieldnames = [
         'speech_id', 'paragraph_number', 'year', 'paragraph',
@@ -488,6 +533,12 @@ def test_prompt_on_validation_set(csv_path: str, output_path: str):
     print(f"Correct classifications: {correct}")
     print(f"Accuracy: {accuracy:.1f}%")
     print(f"Improvement from V4: +{correct - 53} correct")
+    if cache:
+        cache.print_stats()
+        cache.close()
+    if metrics:
+        metrics.close()
+        print(f"Per-request metrics: {metrics_path} (summarise with: python metrics.py {metrics_path} --run {metrics.run_id})")
     print(f"{'='*60}\n")
 
 if __name__ == '__main__':
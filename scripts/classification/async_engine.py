@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Concurrent classification engine.
+
+Runs a blocking classify function over many paragraphs with:
+1. A fixed number of in-flight requests (concurrency limit)
+2. A shared RPM / TPM token bucket (see rate_limit.py)
+3. In-order delivery - results are handed back in corpus order, so checkpoints
+   and final output match the serial run exactly
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+async def _run_ordered(items, classify_fn, on_result, concurrency, limiter, token_estimate, skip_limit):
+    queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    pending = {}
+    order = [idx for idx, _ in items]
+    next_pos = 0
+
+    def drain():
+        # Hand back the contiguous prefix of finished items in input order
+        nonlocal next_pos
+        while next_pos < len(order) and order[next_pos] in pending:
+            idx = order[next_pos]
+            on_result(idx, pending.pop(idx))
+            next_pos += 1
+
+    async def worker():
+        while True:
+            try:
+                idx, payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if limiter and not (skip_limit and skip_limit(payload)):
+                await limiter.acquire(token_estimate(payload) if token_estimate else 0)
+            pending[idx] = await asyncio.to_thread(classify_fn, payload)
+            drain()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    drain()
+
+
+def run_concurrent(items, classify_fn, on_result, concurrency=8, limiter=None, token_estimate=None,
+                   skip_limit=None):
+    """Classify `items` concurrently and deliver results in input order.
+
+    items: list of (index, payload) pairs
+    classify_fn: blocking function payload -> prediction (or None on failure)
+    on_result: called as on_result(index, prediction) in the order of `items`
+    limiter: optional RateLimiter shared by all workers
+    token_estimate: optional payload -> token count, charged against the TPM bucket
+    skip_limit: optional payload -> bool; True bypasses the limiter (e.g. cached responses)
+    """
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    try:
+        loop.run_until_complete(
+            _run_ordered(items, classify_fn, on_result, concurrency, limiter, token_estimate, skip_limit)
+        )
+    finally:
+        loop.close()
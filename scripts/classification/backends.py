@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Classifier backends - where the prompts actually get sent.
+
+Each backend builds its client once and reuses it for every call:
+1. GeminiBackend - google.generativeai, one GenerativeModel per (model, system prompt)
+2. HTTPBackend - the local stand-in server in fake_llm_server.py, for offline
+   load testing (keep-alive connection per thread)
+
+Both expose generate(prompt) -> raw response text, and generate_stream(prompt)
+yielding the text in chunks as it is produced (closing the generator early
+abandons the rest of the response). Failures raise BackendError.
+"""
+
+import http.client
+import json
+import os
+import threading
+from urllib.parse import urlparse
+
+DEFAULT_MODEL = "gemini-2.0-flash-001"
+
+
+class BackendError(Exception):
+    """A failed call. `status` and `retry_after` (seconds) are set when known."""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class ClassifierBackend:
+    """Interface: send one user prompt under a fixed system prompt."""
+
+    name = 'base'
+
+    def __init__(self, system_prompt: str, model_name: str = DEFAULT_MODEL):
+        self.system_prompt = system_prompt
+        self.model_name = model_name
+
+    def generate(self, prompt: str, max_output_tokens: int = None) -> str:
+        raise NotImplementedError
+
+    def generate_stream(self, prompt: str, max_output_tokens: int = None):
+        """Yield response text chunks. Default: one chunk from generate()."""
+        yield self.generate(prompt)
+
+
+class GeminiBackend(ClassifierBackend):
+    """Google Gemini via google.generativeai. Requires GEMINI_API_KEY."""
+
+    name = 'gemini'
+
+    def __init__(self, system_prompt: str, model_name: str = DEFAULT_MODEL):
+        super().__init__(system_prompt, model_name)
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+        self.model = genai.GenerativeModel(model_name, system_instruction=system_prompt)
+
+    def generate(self, prompt: str, max_output_tokens: int = None) -> str:
+        config = {'max_output_tokens': max_output_tokens} if max_output_tokens else None
+        response = self.model.generate_content(prompt, generation_config=config)
+        return response.text
+
+    def generate_stream(self, prompt: str, max_output_tokens: int = None):
+        config = {'max_output_tokens': max_output_tokens} if max_output_tokens else None
+        for chunk in self.model.generate_content(prompt, stream=True, generation_config=config):
+            yield chunk.text
+
+
+class HTTPBackend(ClassifierBackend):
+    """Client for fake_llm_server.py (POST /generate with JSON body)."""
+
+    name = 'fake'
+
+    def __init__(self, system_prompt: str, model_name: str = 'fake-llm',
+                 url: str = 'http://127.0.0.1:8765', timeout: float = 30.0):
+        super().__init__(system_prompt, model_name)
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self):
+        # The next call reconnects
+        self._local.conn.close()
+        self._local.conn = None
+
+    def _post(self, request: dict):
+        """Send the request; return the response once its headers arrive."""
+        body = json.dumps(dict(request, model=self.model_name, system=self.system_prompt))
+        conn = self._connection()
+        try:
+            conn.request('POST', '/generate', body=body,
+                          headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            if response.status != 200:
+                payload = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._drop_connection()
+            raise BackendError(f"connection error: {e}")
+
+        if response.status != 200:
+            retry_after = response.getheader('Retry-After')
+            raise BackendError(
+                f"HTTP {response.status}: {payload.decode('utf-8', 'replace')[:200]}",
+                status=response.status,
+                retry_after=float(retry_after) if retry_after else None,
+            )
+        return response
+
+    def generate(self, prompt: str, max_output_tokens: int = None) -> str:
+        response = self._post({'prompt': prompt, 'max_tokens': max_output_tokens})
+        try:
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._drop_connection()
+            raise BackendError(f"connection error: {e}")
+        return json.loads(payload)['text']
+
+    def generate_stream(self, prompt: str, max_output_tokens: int = None):
+        """Yield the response line by line (chunked transfer encoding)."""
+        response = self._post({'prompt': prompt, 'stream': True, 'max_tokens': max_output_tokens})
+        finished = False
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    finished = True
+                    return
+                yield line.decode('utf-8')
+        except (OSError, http.client.HTTPException) as e:
+            raise BackendError(f"connection error: {e}")
+        finally:
+            if not finished:
+                # Stopped early (or broke): the rest of the body is still in flight
+                self._drop_connection()
+
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'fake': HTTPBackend,
+}
+
+
+def create_backend(name: str, system_prompt: str, **kwargs) -> ClassifierBackend:
+    """Build a backend by name ('gemini' or 'fake')."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (choose from: {', '.join(BACKENDS)})")
+    return BACKENDS[name](system_prompt, **kwargs)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Multi-paragraph batched prompts for the V9 classifier.
+
+The V9 system prompt is re-sent with every request, so classifying one
+paragraph per call spends most input tokens on overhead. Batch mode packs
+several paragraphs into one request with id-tagged blocks:
+
+    <<<P17>>>
+    "paragraph text"
+
+and asks for one eight-line block per paragraph, headed by the same tag:
+
+    [P17]
+    promise_citizen: 0
+    ...
+    reason: none
+
+Blocks are parsed back into the usual fields; items whose block is missing or
+malformed are returned separately so the caller can retry them one by one. A
+response with no usable block at all raises, so it is retried and never cached.
+"""
+
+import re
+
+from rate_limit import estimate_tokens
+
+BINARY_FIELDS = ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral', 'supportive_demand']
+REQUIRED_FIELDS = BINARY_FIELDS + ['framing_signal', 'reason']
+
+BATCH_USER_TEMPLATE = """Classify each of the following {count} paragraphs from a Singapore Budget speech independently.
+Each paragraph starts with a tag like <<<P1>>>.
+
+{paragraphs}
+
+For EACH paragraph, in the same order, output its tag in square brackets on its own line (e.g. [P1]),
+followed by EXACTLY EIGHT LINES (rule 8 applies to each block):
+promise_citizen: [0 or 1]
+promise_firm: [0 or 1]
+demand_citizen: [0 or 1]
+demand_firm: [0 or 1]
+neutral: [0 or 1]
+supportive_demand: [0 or 1]
+framing_signal: [crisis_framing, collective_future_framing, vulnerability_framing, or none]
+reason: [max 12 words OR "none" if neutral]
+
+Output nothing else."""
+
+PARAGRAPH_TAG = '<<<{tag}>>>\n"{text}"'
+
+BLOCK_HEADER = re.compile(r'^\s*\[(P\d+)\]\s*$', re.MULTILINE)
+
+
+def build_batches(items, max_items=10, max_tokens=4000):
+    """Group (index, text) items into consecutive batches.
+
+    A batch closes when it holds max_items paragraphs or adding the next one
+    would take its paragraph text past max_tokens (estimated). A paragraph
+    larger than the ceiling gets a batch of its own.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for idx, text in items:
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append((idx, text))
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def format_batch_prompt(batch):
+    """Build the user prompt for a batch. Tags are P1..Pn in batch order."""
+    paragraphs = '\n\n'.join(
+        PARAGRAPH_TAG.format(tag=f"P{n}", text=text) for n, (_, text) in enumerate(batch, 1)
+    )
+    return BATCH_USER_TEMPLATE.format(count=len(batch), paragraphs=paragraphs)
+
+
+def parse_block(block_text):
+    """Parse one eight-line block. Returns None if any field is missing or invalid."""
+    result = {}
+    for line in block_text.strip().split('\n'):
+        if ':' not in line:
+            continue
+        k, v = [x.strip() for x in line.split(':', 1)]
+        if k in BINARY_FIELDS:
+            v_clean = v.strip('[]').strip()
+            if v_clean not in ('0', '1'):
+                return None
+            result[k] = int(v_clean)
+        elif k in ('framing_signal', 'reason'):
+            result[k] = v
+
+    if any(f not in result for f in REQUIRED_FIELDS):
+        return None
+    return result
+
+
+def parse_batch_response(text, batch):
+    """Demultiplex a batch response.
+
+    Returns (predictions, missing): predictions maps corpus index -> parsed
+    dict; missing lists the (index, text) items with no valid block. Raises
+    ValueError if no block parses.
+    """
+    tag_to_item = {f"P{n}": item for n, item in enumerate(batch, 1)}
+    predictions = {}
+
+    headers = list(BLOCK_HEADER.finditer(text))
+    for pos, header in enumerate(headers):
+        tag = header.group(1)
+        if tag not in tag_to_item:
+            continue
+        end = headers[pos + 1].start() if pos + 1 < len(headers) else len(text)
+        parsed = parse_block(text[header.end():end])
+        idx = tag_to_item[tag][0]
+        # First valid block wins if the model repeats a tag
+        if parsed is not None and idx not in predictions:
+            predictions[idx] = parsed
+
+    if not predictions:
+        raise ValueError(f"unparseable batch response (no valid block for {len(batch)} items)")
+    missing = [item for item in batch if item[0] not in predictions]
+    return predictions, missing
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-paragraph vs batched V9 requests, against fake_llm_server.py.
+
+For each batch size, classifies the same paragraphs with the concurrent engine
+and reports paragraphs/second, requests made, and estimated input/output
+tokens per paragraph (system prompt included). Paragraph texts come from the
+clean corpus CSV if given, otherwise synthetic.
+
+Usage:
+    python benchmark_batching.py --corpus budget_speeches_paragraphs_v3_clean.csv --paragraphs 500
+    python benchmark_batching.py --batch-sizes 1,5,10,20 --ms-per-token 2
+"""
+
+import argparse
+import csv
+import threading
+import time
+
+import classify_full_corpus_v9 as v9
+from async_engine import run_concurrent
+from backends import create_backend
+from batching import build_batches
+from fake_llm_server import start_server
+from rate_limit import estimate_tokens
+
+
+class CountingBackend:
+    """Wraps a backend and tallies requests and estimated tokens."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt = backend.system_prompt
+        self.system_tokens = estimate_tokens(backend.system_prompt)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def generate(self, prompt):
+        text = self.backend.generate(prompt)
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += self.system_tokens + estimate_tokens(prompt)
+            self.output_tokens += estimate_tokens(text)
+        return text
+
+
+def load_texts(args):
+    if args.corpus:
+        with open(args.corpus, 'r') as f:
+            texts = [row['paragraph_text'] for row in csv.DictReader(f)]
+        return texts[:args.paragraphs]
+    base = ("The Government will continue to review the scheme to ensure that support reaches "
+            "those who need it most, while keeping our finances sustainable for the future.")
+    return [f"{base} (Synthetic paragraph {i}.)" for i in range(args.paragraphs)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark batched vs single-paragraph classification")
+    parser.add_argument('--corpus', help="clean corpus CSV to take paragraph texts from")
+    parser.add_argument('--paragraphs', type=int, default=300)
+    parser.add_argument('--batch-sizes', default='1,5,10,20')
+    parser.add_argument('--batch-tokens', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--latency-sigma', type=float, default=0.3)
+    parser.add_argument('--ms-per-token', type=float, default=1.0)
+    parser.add_argument('--batch-drop-rate', type=float, default=0.0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.host = '127.0.0.1'
+    args.error_rate = 0.0
+    args.error_status = 429
+    args.retry_after = 1
+    args.verbose = False
+    args.ramble_rate = 0.0
+    args.ramble_tokens = 0
+
+    server = start_server(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    backend = CountingBackend(create_backend('fake', v9.SYSTEM_PROMPT, url=f"http://{args.host}:{args.port}"))
+    items = list(enumerate(load_texts(args)))
+
+    print("="*80)
+    print("BATCHING BENCHMARK (fake LLM)")
+    print("="*80)
+    print(f"Paragraphs: {len(items):,} | Concurrency: {args.concurrency} | "
+          f"Latency: {args.latency_ms:.0f}ms + {args.ms_per_token}ms/output token")
+    print(f"\n{'batch':>6} {'requests':>9} {'para/s':>8} {'in tok/para':>12} {'out tok/para':>13} {'failed':>7}")
+
+    for size in [int(s) for s in args.batch_sizes.split(',')]:
+        backend.reset()
+        predictions = {}
+        t0 = time.perf_counter()
+
+        if size == 1:
+            run_concurrent(items, lambda text: v9.classify_paragraph(text, backend=backend),
+                           lambda i, pred: predictions.__setitem__(i, pred),
+                           concurrency=args.concurrency)
+        else:
+            batches = build_batches(items, max_items=size, max_tokens=args.batch_tokens)
+            run_concurrent(list(enumerate(batches)), lambda batch: v9.classify_batch(batch, backend=backend),
+                           lambda _, preds: predictions.update(preds),
+                           concurrency=args.concurrency)
+
+        elapsed = time.perf_counter() - t0
+        n = len(items)
+        failed = sum(1 for p in predictions.values() if not p) + (n - len(predictions))
+        print(f"{size:>6} {backend.requests:>9,} {n/elapsed:>8.1f} "
+              f"{backend.input_tokens/n:>12.0f} {backend.output_tokens/n:>13.0f} {failed:>7}")
+
+    server.shutdown()
+    print("\n" + "="*80)
+
+
+if __name__ == '__main__':
+    main()
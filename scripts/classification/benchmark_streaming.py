@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: blocking vs streaming (early-terminated) V9 requests, against
+fake_llm_server.py.
+
+The fake server streams answers line by line at --ms-per-token and makes a
+share of them ramble past the eight lines. Streaming both caps the output
+(MAX_OUTPUT_TOKENS) and stops reading once the eight fields are in, so three
+modes run:
+1. blocking - no output cap
+2. blocking+max_tokens - the same cap, no early stop
+3. streaming - cap and early stop
+and the latency reductions are split into the cap's share and the early
+stop's. Reports mean and tail latency, and output tokens read per request.
+
+Usage:
+    python benchmark_streaming.py --paragraphs 300 --ramble-rate 0.3 --ramble-tokens 300
+"""
+
+import argparse
+import threading
+import time
+
+import classify_full_corpus_v9 as v9
+from async_engine import run_concurrent
+from backends import create_backend
+from fake_llm_server import start_server
+from metrics import percentile
+from rate_limit import estimate_tokens
+from streaming import MAX_OUTPUT_TOKENS, StreamingBackend
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark blocking vs streaming classification calls")
+    parser.add_argument('--paragraphs', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--latency-ms', type=float, default=300, help="time to first token (median)")
+    parser.add_argument('--latency-sigma', type=float, default=0.3)
+    parser.add_argument('--ms-per-token', type=float, default=10.0, help="generation time per output token")
+    parser.add_argument('--ramble-rate', type=float, default=0.3)
+    parser.add_argument('--ramble-tokens', type=int, default=300)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.host = '127.0.0.1'
+    args.error_rate = 0.0
+    args.error_status = 429
+    args.retry_after = 1
+    args.batch_drop_rate = 0.0
+    args.verbose = False
+
+    server = start_server(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    blocking = create_backend('fake', v9.SYSTEM_PROMPT, url=f"http://{args.host}:{args.port}")
+    streaming = StreamingBackend(blocking)
+    modes = [('blocking', blocking.generate),
+             ('blocking+max_tokens', lambda prompt: blocking.generate(prompt, MAX_OUTPUT_TOKENS)),
+             ('streaming', streaming.generate)]
+    texts = [f"Synthetic paragraph {i}: the Government will review the scheme in due course."
+             for i in range(args.paragraphs)]
+
+    print("="*80)
+    print("STREAMING BENCHMARK (fake LLM)")
+    print("="*80)
+    print(f"Paragraphs: {len(texts):,} | Concurrency: {args.concurrency} | "
+          f"First token: {args.latency_ms:.0f}ms + {args.ms_per_token}ms/token | "
+          f"Rambling: {args.ramble_rate*100:.0f}% x {args.ramble_tokens} tokens")
+    print(f"\n{'mode':>20} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'out tok':>8} {'failed':>7}")
+
+    summary = {}
+    for label, generate in modes:
+        latencies, out_tokens, failed = [], [], 0
+
+        def classify(text):
+            t0 = time.perf_counter()
+            response = generate(v9.USER_PROMPT_TEMPLATE.format(paragraph_text=text))
+            latency = time.perf_counter() - t0
+            try:
+                v9.parse_response(response)
+                ok = True
+            except ValueError:
+                ok = False
+            return latency, estimate_tokens(response), ok
+
+        def on_result(_, result):
+            nonlocal failed
+            latency, tokens, ok = result
+            latencies.append(latency)
+            out_tokens.append(tokens)
+            failed += not ok
+
+        run_concurrent(list(enumerate(texts)), classify, on_result, concurrency=args.concurrency)
+        latencies.sort()
+        summary[label] = {'mean': sum(latencies) / len(latencies), 'p95': percentile(latencies, 95),
+                          'p99': percentile(latencies, 99)}
+        print(f"{label:>20} {summary[label]['mean']*1000:>8.0f} {percentile(latencies, 50)*1000:>8.0f} "
+              f"{percentile(latencies, 95)*1000:>8.0f} {percentile(latencies, 99)*1000:>8.0f} "
+              f"{sum(out_tokens)/len(out_tokens):>8.0f} {failed:>7}")
+
+    def reduction(mode, base):
+        return ' | '.join(f"{k} {(1 - summary[mode][k] / summary[base][k])*100:.1f}%" for k in ('mean', 'p95', 'p99'))
+
+    print(f"\nLatency reduction, streaming vs blocking (total):         {reduction('streaming', 'blocking')}")
+    print(f"  max_tokens={MAX_OUTPUT_TOKENS} alone (blocking+max_tokens vs blocking): "
+          f"{reduction('blocking+max_tokens', 'blocking')}")
+    print(f"  early stop alone (streaming vs blocking+max_tokens):    {reduction('streaming', 'blocking+max_tokens')}")
+    server.shutdown()
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
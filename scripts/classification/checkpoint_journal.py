@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for full-corpus classification.
+
+One JSON line per classified paragraph, keyed by paragraph_id:
+1. Appending costs O(1) per record (no rewrite of earlier results)
+2. fsync runs every `sync_every` records, so a crash loses at most one batch
+3. Resume classifies exactly the ids not in the journal - FAILED paragraphs
+   are never written, so they are retried instead of shifting later rows
+4. compact() writes the final CSV in corpus order (last record per id wins),
+   through a temp file so a crash never leaves a half-written one
+
+Usage:
+    python checkpoint_journal.py classification_journal_v9.jsonl \\
+        budget_speeches_paragraphs_v3_clean.csv classification_results_full_corpus_v9.csv
+"""
+
+import csv
+import json
+import os
+import sys
+
+# Columns of a result row (classify_full_corpus_v9.build_result), for a CSV with no rows yet
+RESULT_FIELDS = ['paragraph_id', 'speech_id', 'paragraph_num', 'year', 'date', 'fm_name', 'pm_name',
+                 'paragraph_text', 'paragraph_length', 'category', 'promise_citizen', 'promise_firm',
+                 'demand_citizen', 'demand_firm', 'neutral', 'supportive_demand', 'framing_signal', 'reason']
+
+
+class CheckpointJournal:
+    """JSONL write-ahead journal of result rows."""
+
+    def __init__(self, path: str, sync_every: int = 25):
+        self.path = path
+        self.sync_every = sync_every
+        self._unsynced = 0
+        self._file = None
+
+    def load(self) -> dict:
+        """Return {paragraph_id: row} for everything journaled so far.
+
+        Blank lines are skipped. A torn final line (crash mid-write, so no
+        newline) is ignored and trimmed so new appends start on a clean line.
+        Any other line that doesn't parse raises ValueError: trimming there
+        would throw away the records after it.
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        good_bytes = 0
+        with open(self.path, 'rb') as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    break  # only the last line can lack one
+                if line.strip():
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        raise ValueError(f"{self.path}: line {number} is corrupt; fix or remove it by hand") from None
+                    records[row['paragraph_id']] = row
+                good_bytes += len(line)
+
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_bytes)
+
+        return records
+
+    def append(self, row: dict):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def import_csv_checkpoint(self, checkpoint_path: str) -> int:
+        """Seed an empty journal from an old CSV checkpoint. Returns rows imported."""
+        with open(checkpoint_path, 'r') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            self.append(row)
+        self.sync()
+        return len(rows)
+
+
+def compact(records: dict, corpus: list, output_path: str) -> list:
+    """Write journaled rows to a CSV in corpus order (header only if none). Returns the rows written."""
+    rows = [records[para['paragraph_id']] for para in corpus if para['paragraph_id'] in records]
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys() if rows else RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, output_path)
+
+    return rows
+
+
+def main():
+    if len(sys.argv) != 4:
+        print(__doc__)
+        sys.exit(1)
+
+    journal_path, corpus_path, output_path = sys.argv[1:]
+    with open(corpus_path, 'r') as f:
+        corpus = list(csv.DictReader(f))
+
+    records = CheckpointJournal(journal_path).load()
+    rows = compact(records, corpus, output_path)
+
+    print(f"Journal: {len(records):,} records")
+    print(f"Wrote {len(rows):,}/{len(corpus):,} paragraphs to {output_path}")
+    missing = len(corpus) - len(rows)
+    if missing:
+        print(f"Missing: {missing:,} paragraphs not yet classified")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,16 +4,69 @@ Full Corpus Classification with V9 (91.2% accuracy)
 
 Classify all 11,560 paragraphs from budget_speeches_paragraphs_v3_clean.csv
 Expected runtime: ~3.2 hours (1 second per paragraph)
+
+Concurrent mode (--async) runs --concurrency requests at a time under an
+RPM/TPM token bucket instead of sleeping 1 second per paragraph. Output order,
+checkpoints and the category breakdown are identical to the serial run.
+
+--backend fake sends requests to fake_llm_server.py instead of Gemini, for
+offline load testing.
+
+Responses are cached in classification_cache.sqlite (see response_cache.py),
+so reruns only pay for paragraphs or prompts that changed.
+
+--batch-size N packs up to N paragraphs (and at most --batch-tokens of text)
+into one request (see batching.py); missing or malformed items in a batch
+response are retried one at a time.
+
+Progress is kept in an append-only journal keyed by paragraph_id (see
+checkpoint_journal.py). Resuming classifies exactly the paragraphs not in the
+journal, and the final CSV is compacted from it in corpus order.
+
+Failed calls are retried with jittered exponential backoff behind a shared
+circuit breaker (see retry.py). Paragraphs that still fail go to
+classification_dead_letters_v9.jsonl; re-drive them with
+redrive_dead_letters.py.
+
+--triage MODEL labels paragraphs the local pre-classifier is confident about
+(see triage.py) and only sends the rest to the LLM.
+
+--stream reads responses as they are generated and stops as soon as the
+eight fields are complete (see streaming.py).
+
+--shard i/N classifies one hash partition of the corpus into per-shard
+files; sharding.py merges them back in corpus order.
+
+Every request's latency, estimated tokens, retry count and outcome are
+appended to classification_metrics_v9.jsonl; summarise with metrics.py.
+
+--db reads the clean corpus from the SQLite corpus store and saves the
+results to its classifications table as well as the CSV (see
+scripts/processing/corpus_store.py).
 """
 
+import argparse
 import csv
-import time
 import os
-import google.generativeai as genai
+import sys
+import time
 from datetime import datetime, timedelta
 
-# Configure Gemini API - set GEMINI_API_KEY environment variable
-genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+from async_engine import run_concurrent
+from backends import DEFAULT_MODEL, create_backend
+from batching import BATCH_USER_TEMPLATE, BINARY_FIELDS, build_batches, format_batch_prompt, parse_batch_response
+from checkpoint_journal import CheckpointJournal, compact
+from metrics import MeteredBackend, MetricsRecorder
+from rate_limit import RateLimiter, estimate_tokens
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache, cache_key, cached_generate
+from retry import (CircuitBreaker, ClassificationFailure, DeadLetterQueue, RetryExhausted,
+                   RetryPolicy, call_with_retry)
+from sharding import parse_shard, shard_of, shard_path
+from streaming import StreamingBackend
+from triage import TriageModel, triage_prediction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'processing'))
+from corpus_store import CorpusStore
 
 # V9 PRODUCTION SYSTEM PROMPT (91.2% accuracy)
 SYSTEM_PROMPT = """You are an expert classifier specializing in analyzing Singapore political discourse for themes related to fiscal redistribution and civic obligation.
@@ -56,133 +109,416 @@ framing_signal: [crisis_framing, collective_future_framing, vulnerability_framin
 reason: [max 12 words OR "none" if neutral]"""
 
 
-def classify_paragraph(para_text):
-    """Classify a single paragraph using V9 prompt."""
-    model = genai.GenerativeModel("gemini-2.0-flash-001", system_instruction=SYSTEM_PROMPT)
+# Shared client, created once (Gemini unless main() picks another backend)
+_backend = None
+# Optional response cache shared by all calls
+_cache = None
+# Retry policy and circuit breaker shared by all workers
+_retry_policy = RetryPolicy()
+_breaker = CircuitBreaker()
+# Per-request metrics (see metrics.py); None disables recording
+_metrics = None
+
+
+def get_backend():
+    """Return the shared backend, creating the Gemini client on first use."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend('gemini', SYSTEM_PROMPT, model_name=DEFAULT_MODEL)
+    return _backend
+
+
+def set_backend(backend):
+    """Use `backend` for all subsequent classify_paragraph() calls."""
+    global _backend
+    _backend = backend
+
+
+def set_cache(cache):
+    """Use `cache` (a ResponseCache, or None to disable) for classify_paragraph()."""
+    global _cache
+    _cache = cache
+
+
+def is_cached(para_text):
+    """True if this paragraph's response is already in the cache."""
+    if _cache is None:
+        return False
+    backend = get_backend()
+    return _cache.contains(cache_key(backend.model_name, backend.system_prompt, USER_PROMPT_TEMPLATE, para_text))
+
+
+def set_retry_policy(policy):
+    global _retry_policy
+    _retry_policy = policy
+
+
+def set_metrics(metrics):
+    global _metrics
+    _metrics = metrics
+
+
+def parse_response(text):
+    """Parse the eight-line response into a dict (raises ValueError if unparseable)."""
+    result = {}
+
+    for line in text.strip().split('\n'):
+        if ':' in line:
+            k, v = [x.strip() for x in line.split(':', 1)]
+            if k in ['promise_citizen','promise_firm','demand_citizen','demand_firm','neutral','supportive_demand']:
+                # Handle both "0" and "[0]" formats
+                v_clean = v.strip('[]').strip()
+                result[k] = int(v_clean)
+            else:
+                result[k] = v
+
+    missing = [k for k in BINARY_FIELDS if k not in result]
+    if missing:
+        raise ValueError(f"unparseable response (missing {', '.join(missing)})")
+
+    return result
+
+
+def classify_paragraph(para_text, backend=None):
+    """Classify a single paragraph using V9 prompt.
+
+    Transient failures are retried; returns the parsed dict, or a falsy
+    ClassificationFailure once retries are exhausted.
+    """
+    backend = MeteredBackend(backend or get_backend())
+    started = time.perf_counter()
 
     prompt = USER_PROMPT_TEMPLATE.format(paragraph_text=para_text)
 
     try:
-        response = model.generate_content(prompt)
-        result = {}
-
-        for line in response.text.strip().split('\n'):
-            if ':' in line:
-                k, v = [x.strip() for x in line.split(':', 1)]
-                if k in ['promise_citizen','promise_firm','demand_citizen','demand_firm','neutral','supportive_demand']:
-                    # Handle both "0" and "[0]" formats
-                    v_clean = v.strip('[]').strip()
-                    result[k] = int(v_clean)
-                else:
-                    result[k] = v
-
-        return result
-
-    except Exception as e:
+        pred = call_with_retry(
+            lambda: cached_generate(backend, _cache, USER_PROMPT_TEMPLATE, para_text, prompt, parse=parse_response),
+            _retry_policy, _breaker,
+        )
+
+    except RetryExhausted as e:
         print(f"    ERROR: {e}")
-        return None
+        if _metrics:
+            _metrics.record(backend, started, 1, len(para_text), 'failed', e.last_error)
+        return ClassificationFailure(e.last_error, e.attempts)
+
+    if _metrics:
+        _metrics.record(backend, started, 1, len(para_text), 'ok' if backend.attempts else 'cache_hit')
+    return pred
+
+
+def request_batch(batch, backend=None):
+    """Classify (index, text) items in one request.
+
+    Returns (predictions, missing): {index: prediction} and the items missing
+    or malformed in the response (all of them if the request failed).
+    """
+    backend = backend or get_backend()
+    predictions = {}
+    missing = batch
+
+    if len(batch) > 1:
+        prompt = format_batch_prompt(batch)
+        # Cache on the batch's texts in order, under the batch template
+        batch_text = '\x00'.join(text for _, text in batch)
+        meter = MeteredBackend(backend)
+        started = time.perf_counter()
+        error = None
+        try:
+            predictions, missing = call_with_retry(
+                lambda: cached_generate(meter, _cache, BATCH_USER_TEMPLATE, batch_text, prompt,
+                                        parse=lambda r: parse_batch_response(r, batch)),
+                _retry_policy, _breaker,
+            )
+        except RetryExhausted as e:
+            print(f"    ERROR (batch of {len(batch)}): {e}")
+            error = e.last_error
+        if _metrics:
+            outcome = 'failed' if error else 'ok' if meter.attempts else 'cache_hit'
+            _metrics.record(meter, started, len(batch) - len(missing), len(batch_text), outcome, error)
+        if missing:
+            print(f"    Retrying {len(missing)}/{len(batch)} batch items individually")
+
+    return predictions, missing
+
+
+def classify_batch(batch, backend=None):
+    """Classify (index, text) items in one request; missing items are retried one at a time.
+
+    Returns {index: prediction or ClassificationFailure}.
+    """
+    backend = backend or get_backend()
+    predictions, missing = request_batch(batch, backend)
+    for idx, text in missing:
+        predictions[idx] = classify_paragraph(text, backend=backend)
+    return predictions
+
+
+def estimate_request_tokens(para_text):
+    """Estimated prompt + response tokens for one classification request."""
+    prompt = USER_PROMPT_TEMPLATE.format(paragraph_text=para_text)
+    return estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt) + 60
+
+
+def estimate_batch_tokens(batch):
+    """Estimated prompt + response tokens for one batched request."""
+    return estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(format_batch_prompt(batch)) + 65 * len(batch)
+
+
+def build_result(para, pred):
+    """Turn a parsed prediction into an output row."""
+    # Determine primary category
+    primary_category = next((c for c in ['promise_citizen','promise_firm','demand_citizen','demand_firm','neutral']
+                           if pred.get(c)==1), 'unknown')
+
+    return {
+        'paragraph_id': para['paragraph_id'],
+        'speech_id': para['speech_id'],
+        'paragraph_num': para['paragraph_num'],
+        'year': para['year'],
+        'date': para['date'],
+        'fm_name': para['fm_name'],
+        'pm_name': para['pm_name'],
+        'paragraph_text': para['paragraph_text'][:200] + '...' if len(para['paragraph_text']) > 200 else para['paragraph_text'],
+        'paragraph_length': para['paragraph_length'],
+        'category': primary_category,
+        'promise_citizen': pred.get('promise_citizen', 0),
+        'promise_firm': pred.get('promise_firm', 0),
+        'demand_citizen': pred.get('demand_citizen', 0),
+        'demand_firm': pred.get('demand_firm', 0),
+        'neutral': pred.get('neutral', 0),
+        'supportive_demand': pred.get('supportive_demand', 0),
+        'framing_signal': pred.get('framing_signal', 'none'),
+        'reason': pred.get('reason', '')
+    }
+
+
+def record_prediction(para, pred, journal, dead_letters=None):
+    """Append a prediction to the journal; send failures to the dead-letter queue."""
+    if not pred:
+        print("FAILED")
+        if dead_letters is not None and isinstance(pred, ClassificationFailure):
+            dead_letters.add(para, pred)
+        return
+
+    result = build_result(para, pred)
+    journal.append(result)
+    print(f"✓ {result['category']}")
+
+
+def print_progress(i, total, processed, remaining_count, start_time):
+    """Print a progress line with a naive ETA."""
+    elapsed = (datetime.now() - start_time).total_seconds()
+    rate = processed / elapsed if elapsed > 0 else 0
+    remaining = remaining_count / rate if rate > 0 else 0
+    eta = datetime.now() + timedelta(seconds=remaining)
+
+    print(f"\n[{i}/{total}] {i/total*100:.1f}% | Elapsed: {elapsed/60:.1f}m | ETA: {eta.strftime('%H:%M:%S')}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Classify the full corpus with the V9 prompt")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="classify concurrently under a token-bucket rate limit")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="max in-flight requests in --async mode (default: 8)")
+    parser.add_argument('--rpm', type=float, default=1000,
+                        help="requests per minute budget in --async mode (default: 1000)")
+    parser.add_argument('--tpm', type=float, default=1_000_000,
+                        help="tokens per minute budget in --async mode (default: 1,000,000)")
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="paragraphs per request; 1 disables batching (default: 1)")
+    parser.add_argument('--batch-tokens', type=int, default=4000,
+                        help="max estimated paragraph tokens per batch (default: 4000)")
+    parser.add_argument('--backend', choices=['gemini', 'fake'], default='gemini',
+                        help="where to send requests (default: gemini)")
+    parser.add_argument('--stream', action='store_true',
+                        help="stream responses and stop once all eight fields are in (single-paragraph requests)")
+    parser.add_argument('--fake-url', default='http://127.0.0.1:8765',
+                        help="fake_llm_server.py address for --backend fake")
+    parser.add_argument('--max-attempts', type=int, default=5,
+                        help="attempts per request before dead-lettering (default: 5)")
+    parser.add_argument('--retry-dead-letters', action='store_true',
+                        help="also classify paragraphs already in the dead-letter file")
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help="classify only shard i of N (by paragraph_id hash), with per-shard files; "
+                             "combine with: python sharding.py merge N")
+    parser.add_argument('--triage', metavar='MODEL',
+                        help="triage_model.json from triage.py; label confident paragraphs locally")
+    parser.add_argument('--triage-threshold', type=float, default=0.95,
+                        help="min triage confidence to skip the LLM (default: 0.95)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH,
+                        help=f"response cache file (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument('--no-cache', action='store_true', help="always call the API")
+    parser.add_argument('--metrics', default='classification_metrics_v9.jsonl',
+                        help="per-request metrics file; summarise with metrics.py")
+    parser.add_argument('--no-metrics', action='store_true', help="don't record per-request metrics")
+    parser.add_argument('--db', help="read the clean corpus from / save results to this corpus store")
+    parser.add_argument('--no-sleep', action='store_true',
+                        help="skip the 1s sleep in serial mode (for load testing)")
+    args = parser.parse_args()
+    if args.stream and args.batch_size > 1:
+        parser.error("--stream stops after one eight-line answer, so it can't be combined with --batch-size")
+    return args
 
 
 def main():
+    args = parse_args()
+
+    if args.backend == 'fake':
+        backend = create_backend('fake', SYSTEM_PROMPT, url=args.fake_url)
+    else:
+        backend = create_backend('gemini', SYSTEM_PROMPT, model_name=DEFAULT_MODEL)
+    set_backend(StreamingBackend(backend) if args.stream else backend)
+    if not args.no_cache:
+        set_cache(ResponseCache(args.cache))
+    set_retry_policy(RetryPolicy(max_attempts=args.max_attempts))
+
     input_path = 'budget_speeches_paragraphs_v3_clean.csv'
     output_path = 'classification_results_full_corpus_v9.csv'
     checkpoint_path = 'classification_checkpoint_v9.csv'
+    journal_path = 'classification_journal_v9.jsonl'
+    dead_letter_path = 'classification_dead_letters_v9.jsonl'
 
     # Load corpus
-    with open(input_path, 'r') as f:
-        corpus = list(csv.DictReader(f))
+    store = CorpusStore(args.db) if args.db else None
+    if store:
+        corpus = list(store.clean_paragraphs())
+    else:
+        with open(input_path, 'r') as f:
+            corpus = list(csv.DictReader(f))
+    corpus_size = len(corpus)
+
+    # A shard owns the paragraphs whose id hashes to it, and its own files
+    if args.shard:
+        shard, n_shards = args.shard
+        corpus = [para for para in corpus if shard_of(para['paragraph_id'], n_shards) == shard]
+        output_path, journal_path, dead_letter_path, args.metrics = (
+            shard_path(p, shard, n_shards) for p in (output_path, journal_path, dead_letter_path, args.metrics))
+
+    if not args.no_metrics:
+        set_metrics(MetricsRecorder(args.metrics, source='v9'))
 
     total = len(corpus)
     print("="*80)
     print("FULL CORPUS CLASSIFICATION - V9 (91.2% accuracy)")
     print("="*80)
     print(f"Total paragraphs: {total:,}")
-    print(f"Estimated time: ~{total/60:.1f} minutes (~{total/3600:.1f} hours)")
-    print(f"Rate limit: 1 second per paragraph")
+    if args.shard:
+        print(f"Shard: {shard}/{n_shards} ({total:,} of {corpus_size:,} paragraphs)")
+    if args.use_async:
+        print(f"Concurrency: {args.concurrency} | Rate limit: {args.rpm:,.0f} RPM, {args.tpm:,.0f} TPM")
+    else:
+        print(f"Estimated time: ~{total/60:.1f} minutes (~{total/3600:.1f} hours)")
+        print(f"Rate limit: 1 second per paragraph")
     print(f"Output: {output_path}")
-    print(f"Checkpoints saved to: {checkpoint_path}")
+    print(f"Checkpoint journal: {journal_path}")
     print("="*80)
 
-    # Check if checkpoint exists
-    start_idx = 0
-    results = []
-
-    try:
-        with open(checkpoint_path, 'r') as f:
-            reader = csv.DictReader(f)
-            results = list(reader)
-            start_idx = len(results)
-            print(f"\nResuming from checkpoint: {start_idx:,}/{total:,} completed ({start_idx/total*100:.1f}%)")
-    except FileNotFoundError:
+    # Resume from the journal (or seed it once from an old CSV checkpoint)
+    journal = CheckpointJournal(journal_path)
+    done = journal.load()
+    if not done and os.path.exists(checkpoint_path):
+        imported = journal.import_csv_checkpoint(checkpoint_path)
+        done = journal.load()
+        print(f"\nImported {imported:,} rows from old checkpoint {checkpoint_path}")
+
+    # Dead-lettered paragraphs wait for redrive_dead_letters.py unless asked for
+    dead_letters = DeadLetterQueue(dead_letter_path)
+    skip = set(done)
+    if not args.retry_dead_letters:
+        dead = set(dead_letters.load()) - skip
+        if dead:
+            print(f"\nSkipping {len(dead):,} dead-lettered paragraphs (see {dead_letter_path})")
+        skip |= dead
+
+    items = [(i, para['paragraph_text']) for i, para in enumerate(corpus) if para['paragraph_id'] not in skip]
+    if done:
+        completed = sum(1 for para in corpus if para['paragraph_id'] in done)
+        print(f"\nResuming from journal: {completed:,}/{total:,} completed "
+              f"({completed/total*100:.1f}%), {len(items):,} to go")
+    else:
         print(f"\nStarting fresh classification...")
 
+    if args.triage:
+        model = TriageModel.load(args.triage)
+        uncertain = []
+        for i, para_text in items:
+            category, confidence = model.predict(para_text)
+            if confidence >= args.triage_threshold:
+                journal.append(build_result(corpus[i], triage_prediction(category)))
+            else:
+                uncertain.append((i, para_text))
+        triaged = len(items) - len(uncertain)
+        print(f"Triage: {triaged:,} labelled locally (confidence >= {args.triage_threshold}), "
+              f"{len(uncertain):,} sent to the LLM "
+              f"({triaged/len(items)*100 if items else 0:.1f}% of API calls saved)")
+        items = uncertain
+
     start_time = datetime.now()
+    processed = 0
 
-    # Process paragraphs
-    for i in range(start_idx, total):
+    def on_result(i, pred):
+        nonlocal processed
         para = corpus[i]
-
-        # Progress update
-        if i % 100 == 0:
-            elapsed = (datetime.now() - start_time).total_seconds()
-            rate = (i - start_idx) / elapsed if elapsed > 0 else 0
-            remaining = (total - i) / rate if rate > 0 else 0
-            eta = datetime.now() + timedelta(seconds=remaining)
-
-            print(f"\n[{i}/{total}] {i/total*100:.1f}% | Elapsed: {elapsed/60:.1f}m | ETA: {eta.strftime('%H:%M:%S')}")
-
-        # Classify
+        if processed % 100 == 0:
+            print_progress(i, total, processed, len(items) - processed, start_time)
         print(f"[{i+1}/{total}] {para['paragraph_id']} ({para['year']})...", end=' ')
-
-        pred = classify_paragraph(para['paragraph_text'])
-
-        if pred:
-            # Determine primary category
-            primary_category = next((c for c in ['promise_citizen','promise_firm','demand_citizen','demand_firm','neutral']
-                                   if pred.get(c)==1), 'unknown')
-
-            result = {
-                'paragraph_id': para['paragraph_id'],
-                'speech_id': para['speech_id'],
-                'paragraph_num': para['paragraph_num'],
-                'year': para['year'],
-                'date': para['date'],
-                'fm_name': para['fm_name'],
-                'pm_name': para['pm_name'],
-                'paragraph_text': para['paragraph_text'][:200] + '...' if len(para['paragraph_text']) > 200 else para['paragraph_text'],
-                'paragraph_length': para['paragraph_length'],
-                'category': primary_category,
-                'promise_citizen': pred.get('promise_citizen', 0),
-                'promise_firm': pred.get('promise_firm', 0),
-                'demand_citizen': pred.get('demand_citizen', 0),
-                'demand_firm': pred.get('demand_firm', 0),
-                'neutral': pred.get('neutral', 0),
-                'supportive_demand': pred.get('supportive_demand', 0),
-                'framing_signal': pred.get('framing_signal', 'none'),
-                'reason': pred.get('reason', '')
-            }
-
-            results.append(result)
-            print(f"✓ {primary_category}")
-
-            # Save checkpoint every 50 paragraphs
-            if (i + 1) % 50 == 0:
-                with open(checkpoint_path, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=result.keys())
-                    writer.writeheader()
-                    writer.writerows(results)
-                print(f"    Checkpoint saved ({len(results)} completed)")
+        record_prediction(para, pred, journal, dead_letters)
+        processed += 1
+
+    def on_batch(_, predictions):
+        for i in sorted(predictions):
+            on_result(i, predictions[i])
+
+    limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+
+    if args.batch_size > 1:
+        batches = build_batches(items, max_items=args.batch_size, max_tokens=args.batch_tokens)
+        print(f"Batches: {len(batches):,} requests for {len(items):,} paragraphs")
+
+        if args.use_async:
+            # Items a batch response drops go back through the limiter as single requests
+            missing = []
+
+            def on_batch_request(b, result):
+                predictions, batch_missing = result
+                on_batch(b, predictions)
+                missing.extend(batch_missing)
+
+            run_concurrent(list(enumerate(batches)), request_batch, on_batch_request,
+                           concurrency=args.concurrency, limiter=limiter,
+                           token_estimate=estimate_batch_tokens)
+            run_concurrent(sorted(missing), classify_paragraph, on_result,
+                           concurrency=args.concurrency, limiter=limiter,
+                           token_estimate=estimate_request_tokens, skip_limit=is_cached)
         else:
-            print("FAILED")
-
-        # Rate limit
-        time.sleep(1)
-
-    # Write final results
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=results[0].keys())
-        writer.writeheader()
-        writer.writerows(results)
+            for b, batch in enumerate(batches):
+                on_batch(b, classify_batch(batch))
+                if not args.no_sleep:
+                    time.sleep(1)
+    elif args.use_async:
+        run_concurrent(items, classify_paragraph, on_result,
+                       concurrency=args.concurrency, limiter=limiter,
+                       token_estimate=estimate_request_tokens, skip_limit=is_cached)
+    else:
+        # Process paragraphs
+        for i, para_text in items:
+            hits_before = _cache.hits if _cache else 0
+            pred = classify_paragraph(para_text)
+            on_result(i, pred)
+
+            # Rate limit (cached answers never reached the API)
+            cache_hit = _cache is not None and _cache.hits > hits_before
+            if not args.no_sleep and not cache_hit:
+                time.sleep(1)
+
+    # Compact the journal into the final results, in corpus order
+    journal.close()
+    results = compact(journal.load(), corpus, output_path)
+    if store:
+        store.save_classifications(results)
+        store.close()
 
     # Statistics
     total_time = (datetime.now() - start_time).total_seconds()
@@ -193,7 +529,19 @@ def main():
     print(f"Total paragraphs: {len(results):,}")
     print(f"Time taken: {total_time/60:.1f} minutes ({total_time/3600:.2f} hours)")
     print(f"Average rate: {len(results)/total_time:.2f} paragraphs/second")
-    print(f"\nResults saved to: {output_path}")
+    print(f"\nResults saved to: {output_path}" + (f" and {args.db}" if store else ""))
+    if _cache:
+        _cache.print_stats()
+    if _breaker.times_opened:
+        print(f"Circuit breaker opened {_breaker.times_opened} times")
+    if _metrics:
+        _metrics.close()
+        print(f"Per-request metrics: {args.metrics} (run {_metrics.run_id}; "
+              f"summarise with: python metrics.py {args.metrics} --run {_metrics.run_id})")
+    failed = len(dead_letters.load()) if os.path.exists(dead_letter_path) else 0
+    if failed:
+        print(f"Dead letters: {failed:,} paragraphs in {dead_letter_path} "
+              f"(re-drive with: python redrive_dead_letters.py)")
 
     # Category breakdown
     categories = {}
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini API, for offline load testing.
+
+Serves POST /generate (see backends.HTTPBackend) and answers with a canned
+eight-line classification. The category is picked from a hash of the prompt,
+weighted like the V9 full-corpus breakdown, so repeated prompts get the same
+answer.
+
+Batched prompts (<<<P1>>> tags, see batching.py) get one [P1] block per tag.
+
+Configurable:
+1. Latency - lognormal with a given median and spread (for tail behaviour),
+   plus an optional per-output-token generation cost
+2. Errors - a fraction of requests fail with a given HTTP status and Retry-After
+3. Batch drops - a fraction of batch blocks are left out, to exercise retries
+4. Rambling - a fraction of answers carry extra explanation after the eight
+   lines, cut off at the request's max_tokens
+
+With "stream": true the answer is sent line by line (chunked), each line
+after its generation time, so a client can stop reading early.
+
+Usage:
+    python fake_llm_server.py --port 8765 --latency-ms 400 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Roughly the V9 full-corpus category mix
+CATEGORY_WEIGHTS = [
+    ('neutral', 49),
+    ('promise_citizen', 21),
+    ('promise_firm', 14),
+    ('demand_citizen', 11),
+    ('demand_firm', 5),
+]
+
+CATEGORIES = ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral']
+
+BATCH_TAG = re.compile(r'^<<<(P\d+)>>>$', re.MULTILINE)
+
+
+def canned_response(prompt: str) -> str:
+    """Deterministic eight-line response for a prompt."""
+    digest = int(hashlib.sha1(prompt.encode('utf-8')).hexdigest(), 16)
+    bucket = digest % 100
+    for category, weight in CATEGORY_WEIGHTS:
+        if bucket < weight:
+            break
+        bucket -= weight
+
+    lines = [f"{c}: {1 if c == category else 0}" for c in CATEGORIES]
+    supportive = 1 if category.startswith('demand') and digest % 3 == 0 else 0
+    lines.append(f"supportive_demand: {supportive}")
+    lines.append("framing_signal: none")
+    lines.append("reason: none" if category == 'neutral' else f"reason: Canned {category.replace('_', ' ')} response")
+    return '\n'.join(lines)
+
+
+def ramble(tokens: int) -> str:
+    """Unrequested explanation a model sometimes appends (~4 chars per token)."""
+    sentence = "This paragraph was assessed against each rule in turn before deciding. "
+    return '\n\nExplanation:\n' + '\n'.join([sentence] * max(1, tokens * 4 // len(sentence)))
+
+
+def batch_response(prompt: str, drop_rate: float = 0.0) -> str:
+    """One tagged block per <<<Pn>>> paragraph in a batched prompt."""
+    parts = BATCH_TAG.split(prompt)
+    # parts = [preamble, tag1, text1, tag2, text2, ...]
+    blocks = []
+    for tag, text in zip(parts[1::2], parts[2::2]):
+        if random.random() < drop_rate:
+            continue
+        blocks.append(f"[{tag}]\n{canned_response(text)}")
+    return '\n\n'.join(blocks)
+
+
+def make_handler(config):
+    class FakeLLMHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            if config.verbose:
+                super().log_message(format, *args)
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, text):
+            """Send `text` a line at a time, each after its generation time."""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for line in text.splitlines(keepends=True):
+                    time.sleep(config.ms_per_token * len(line) / 4 / 1000)
+                    data = line.encode('utf-8')
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # Client stopped reading early
+                self.close_connection = True
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+
+            prompt = request.get('prompt', '')
+            if BATCH_TAG.search(prompt):
+                text = batch_response(prompt, config.batch_drop_rate)
+            else:
+                text = canned_response(prompt)
+            if random.random() < config.ramble_rate:
+                text += ramble(config.ramble_tokens)
+            if request.get('max_tokens'):
+                text = text[:request['max_tokens'] * 4]
+
+            # Lognormal latency: median latency_ms, spread latency_sigma,
+            # plus generation time for the output (~4 chars per token)
+            delay = 0.0
+            if config.latency_ms > 0:
+                delay += config.latency_ms * math.exp(random.gauss(0, config.latency_sigma))
+            if not request.get('stream'):
+                delay += config.ms_per_token * len(text) / 4
+            time.sleep(delay / 1000)
+
+            if random.random() < config.error_rate:
+                self._send(config.error_status, {'error': 'simulated failure'},
+                           headers={'Retry-After': str(config.retry_after)})
+                return
+
+            if request.get('stream'):
+                self._stream(text)
+            else:
+                self._send(200, {'text': text})
+
+    return FakeLLMHandler
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local fake LLM server for load testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=300,
+                        help="median response latency in ms (default: 300)")
+    parser.add_argument('--latency-sigma', type=float, default=0.5,
+                        help="lognormal spread of latency; larger = heavier tail (default: 0.5)")
+    parser.add_argument('--ms-per-token', type=float, default=0.0,
+                        help="extra latency per output token in ms (default: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="fraction of requests that fail (default: 0)")
+    parser.add_argument('--error-status', type=int, default=429,
+                        help="HTTP status for simulated failures (default: 429)")
+    parser.add_argument('--retry-after', type=float, default=1,
+                        help="Retry-After seconds sent with failures (default: 1)")
+    parser.add_argument('--batch-drop-rate', type=float, default=0.0,
+                        help="fraction of blocks left out of batch responses (default: 0)")
+    parser.add_argument('--ramble-rate', type=float, default=0.0,
+                        help="fraction of answers with extra text after the eight lines (default: 0)")
+    parser.add_argument('--ramble-tokens', type=int, default=200,
+                        help="length of the extra text in tokens (default: 200)")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    return parser.parse_args()
+
+
+def start_server(config):
+    """Create (but don't start serving) a threaded server for `config`."""
+    server = ThreadingHTTPServer((config.host, config.port), make_handler(config))
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    config = parse_args()
+    server = start_server(config)
+    print(f"Fake LLM server on http://{config.host}:{config.port}/generate")
+    print(f"  Latency: median {config.latency_ms:.0f}ms (sigma {config.latency_sigma})")
+    print(f"  Errors: {config.error_rate*100:.1f}% -> HTTP {config.error_status}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Dynamic few-shot example selection for the FINAL_PRODUCTION prompt.
+
+The V9 user prompt carries 17 worked examples on every request. Instead:
+1. Example bank - the 17 prompt examples plus the audited validation rows
+   (human category, reason, supportive_demand and framing_signal taken from
+   the human notes; rows whose notes don't settle those fields are left out
+   rather than shown with a guessed 0 / none)
+2. Index - TF-IDF cosine similarity over the bank (same hashed unigram +
+   bigram features as triage.py)
+3. Prompt - the prompt's steps and final instructions, with only the k
+   examples most similar to the paragraph
+
+A paragraph is never shown itself as an example, so evaluating on the
+validation set the bank was built from is leave-one-out.
+
+`evaluate` classifies the validation set with the full static prompt and
+with the dynamic prompt, and reports input tokens per request, latency and
+accuracy for both.
+
+Usage:
+    python few_shot.py build validation_sample_68_classified_audited.csv --bank few_shot_bank.json
+    python few_shot.py evaluate validation_sample_68_classified_audited.csv --k 4
+"""
+
+import argparse
+import json
+import math
+import re
+import time
+
+from async_engine import run_concurrent
+from backends import DEFAULT_MODEL, create_backend
+from FINAL_PRODUCTION_classifier import (SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, compare_with_human_audit,
+                                         load_validation_data, parse_response)
+from metrics import percentile
+from rate_limit import estimate_tokens
+from response_cache import ResponseCache, cached_generate
+from retry import CircuitBreaker, RetryExhausted, RetryPolicy, call_with_retry
+from triage import CATEGORIES, hashed_features
+
+DEFAULT_BANK_PATH = 'few_shot_bank.json'
+EXAMPLES_MARKER = '### EXAMPLES:'
+FINAL_MARKER = '### FINAL INSTRUCTIONS:'
+EXAMPLE_PATTERN = re.compile(
+    r'Example \d+: (?P<title>[^\n]+)\n\nTEXT: "(?P<text>.*?)"\n\nYOUR RESPONSE:\n(?P<response>(?:[a-z_]+: [^\n]*\n?){8})',
+    re.DOTALL,
+)
+
+
+def response_category(response: str) -> str:
+    for line in response.splitlines():
+        key, _, value = line.partition(':')
+        if key.strip() in CATEGORIES and value.strip() == '1':
+            return key.strip()
+    return 'neutral'
+
+
+def template_examples(user_template: str) -> list:
+    """The worked examples embedded in a user prompt template."""
+    section = user_template.split(EXAMPLES_MARKER, 1)[1].split(FINAL_MARKER, 1)[0]
+    return [
+        {'title': m['title'], 'text': m['text'], 'response': m['response'].strip(),
+         'category': response_category(m['response']), 'source': 'prompt'}
+        for m in EXAMPLE_PATTERN.finditer(section)
+    ]
+
+
+FRAMINGS = ['crisis_framing', 'collective_future_framing', 'vulnerability_framing']
+
+
+def notes_supportive_demand(notes: str):
+    """1 / 0 if the audit notes say whether a demand is supportive, else None."""
+    if re.search(r'\b(?:not|no|non)[\s-]+supportive', notes, flags=re.IGNORECASE):
+        return 0
+    if re.search(r'\bsupportive', notes, flags=re.IGNORECASE):
+        return 1
+    return None
+
+
+def notes_framing_signal(notes: str):
+    """The framing named in the audit notes ('none' if they say there is none), else None."""
+    for framing in FRAMINGS:
+        if re.search(framing.replace('_', r'[\s_-]*'), notes, flags=re.IGNORECASE):
+            return framing
+    if re.search(r'\bno[\s_-]+framing|framing[\s_:-]*none', notes, flags=re.IGNORECASE):
+        return 'none'
+    return None
+
+
+def validation_example(row: dict, human_category: str):
+    """Bank entry for an audited validation row, or None if its notes leave a field open.
+
+    supportive_demand only applies to demands (0 otherwise); framing_signal
+    can apply to any paragraph, so the notes have to name it.
+    """
+    notes = row['Human logic -- category and notes']
+    supportive = notes_supportive_demand(notes) if human_category.startswith('demand') else 0
+    framing = notes_framing_signal(notes)
+    if supportive is None or framing is None:
+        return None
+    # Notes usually start with the category label; the rest is the rationale
+    reason = re.sub(r'^\W*' + human_category + r'\W*', '', notes, flags=re.IGNORECASE)
+    reason = ' '.join(reason.split()[:12]) if human_category != 'neutral' else 'none'
+    lines = [f"{c}: {1 if c == human_category else 0}" for c in CATEGORIES]
+    lines += [f"supportive_demand: {supportive}", f"framing_signal: {framing}", f"reason: {reason or 'none'}"]
+    return {
+        'title': f"Audited {human_category.replace('_', ' ').title()}",
+        'text': row['paragraph'].strip(),
+        'response': '\n'.join(lines),
+        'category': human_category,
+        'source': 'validation',
+    }
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+class FewShotSelector:
+    """Picks the k bank examples most similar to a paragraph and builds a compact prompt."""
+
+    def __init__(self, bank: list, user_template: str, k: int = 4):
+        self.bank = bank
+        self.k = k
+        head, rest = user_template.split(EXAMPLES_MARKER, 1)
+        self.head = head
+        self.tail = FINAL_MARKER + rest.split(FINAL_MARKER, 1)[1]
+
+        counts = [hashed_features(e['text']) for e in bank]
+        df = {}
+        for c in counts:
+            for h in c:
+                df[h] = df.get(h, 0) + 1
+        n = len(bank)
+        self.idf = {h: math.log((1 + n) / (1 + d)) + 1 for h, d in df.items()}
+        self.vectors = [self._weigh(c) for c in counts]
+        self._normalized = [normalize(e['text']) for e in bank]
+
+    def _weigh(self, counts: dict) -> dict:
+        vec = {h: (1 + math.log(c)) * self.idf.get(h, 0.0) for h, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {h: v / norm for h, v in vec.items() if v}
+
+    def select(self, text: str, k: int = None) -> list:
+        """Top-k examples by cosine similarity, excluding the paragraph itself."""
+        k = self.k if k is None else k
+        query = self._weigh(hashed_features(text))
+        own = normalize(text)
+        scored = []
+        for i, vec in enumerate(self.vectors):
+            if self._normalized[i] == own:
+                continue
+            small, large = (query, vec) if len(query) < len(vec) else (vec, query)
+            scored.append((sum(v * large.get(h, 0.0) for h, v in small.items()), i))
+        # Most similar first; ties keep bank order
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [self.bank[i] for _, i in scored[:k]]
+
+    def user_template(self, text: str, k: int = None) -> str:
+        """The user prompt template for `text`, with only its k nearest examples.
+
+        Still has a {text} placeholder, so it doubles as the response cache key.
+        """
+        blocks = []
+        for n, e in enumerate(self.select(text, k), 1):
+            block = f"Example {n}: {e['title']}\n\nTEXT: \"{e['text']}\"\n\nYOUR RESPONSE:\n{e['response']}"
+            blocks.append(block.replace('{', '{{').replace('}', '}}'))
+        return self.head + EXAMPLES_MARKER + '\n\n' + '\n\n'.join(blocks) + '\n\n' + self.tail
+
+
+def build_bank(validation_rows: list, user_template: str) -> list:
+    bank = template_examples(user_template)
+    left_out = 0
+    for row in validation_rows:
+        human = compare_with_human_audit({}, row)['human']
+        if human:
+            example = validation_example(row, human)
+            if example:
+                bank.append(example)
+            else:
+                left_out += 1
+    if left_out:
+        print(f"Left out {left_out} audited rows whose notes don't give supportive_demand / framing_signal")
+    return bank
+
+
+def save_bank(bank: list, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(bank, f, ensure_ascii=False, indent=2)
+
+
+def load_bank(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def evaluate(rows, selector, backend, cache, concurrency):
+    """Classify every row with the static and the dynamic prompt; print the comparison."""
+    policy = RetryPolicy()
+    breaker = CircuitBreaker()
+    modes = ['static', 'dynamic']
+    stats = {m: {'correct': 0, 'scored': 0, 'failed': 0, 'tokens': [], 'latency': []} for m in modes}
+
+    def classify(payload):
+        mode, row_idx = payload
+        text = rows[row_idx]['paragraph']
+        template = USER_PROMPT_TEMPLATE if mode == 'static' else selector.user_template(text)
+        prompt = template.format(text=text)
+        start = time.perf_counter()
+        try:
+            pred = call_with_retry(
+                lambda: cached_generate(backend, cache, template, text, prompt, parse=parse_response),
+                policy, breaker,
+            )
+        except RetryExhausted as e:
+            print(f"    ERROR [{mode}] row {row_idx}: {e}")
+            pred = None
+        tokens = estimate_tokens(backend.system_prompt) + estimate_tokens(prompt)
+        return mode, row_idx, pred, tokens, time.perf_counter() - start
+
+    def on_result(_, result):
+        mode, row_idx, pred, tokens, latency = result
+        s = stats[mode]
+        s['tokens'].append(tokens)
+        s['latency'].append(latency)
+        if pred is None:
+            s['failed'] += 1
+            return
+        s['scored'] += 1
+        s['correct'] += compare_with_human_audit(pred, rows[row_idx])['match']
+
+    items = list(enumerate((mode, r) for r in range(len(rows)) for mode in modes))
+    run_concurrent(items, classify, on_result, concurrency=concurrency)
+
+    print(f"\n{'mode':>8} {'accuracy':>14} {'in tok/request':>15} {'p50 ms':>8} {'p95 ms':>8} {'failed':>7}")
+    for m in modes:
+        s = stats[m]
+        lat = sorted(s['latency'])
+        print(f"{m:>8} {s['correct']:>4}/{s['scored']:<3} {s['correct']/s['scored']*100 if s['scored'] else 0:>5.1f}% "
+              f"{sum(s['tokens'])/len(s['tokens']):>15,.0f} {percentile(lat, 50)*1000:>8.0f} "
+              f"{percentile(lat, 95)*1000:>8.0f} {s['failed']:>7}")
+
+    static, dynamic = stats['static'], stats['dynamic']
+    reduction = 1 - sum(dynamic['tokens']) / sum(static['tokens'])
+    delta = (dynamic['correct'] / dynamic['scored'] - static['correct'] / static['scored']) * 100 \
+        if static['scored'] and dynamic['scored'] else 0.0
+    print(f"\nInput token reduction: {reduction*100:.1f}% | Accuracy delta: {delta:+.1f} points (dynamic - static)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build / evaluate the dynamic few-shot example bank")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build')
+    build.add_argument('validation_csv')
+    build.add_argument('--bank', default=DEFAULT_BANK_PATH)
+
+    ev = sub.add_parser('evaluate')
+    ev.add_argument('validation_csv')
+    ev.add_argument('--bank', help="bank JSON (default: build one from the validation CSV)")
+    ev.add_argument('--k', type=int, default=4, help="examples per request (default: 4)")
+    ev.add_argument('--concurrency', type=int, default=4)
+    ev.add_argument('--backend', choices=['gemini', 'fake'], default='gemini')
+    ev.add_argument('--fake-url', default='http://127.0.0.1:8765')
+    ev.add_argument('--cache', default=None, help="response cache file (default: no cache)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rows = load_validation_data(args.validation_csv)
+
+    print("="*80)
+    print(f"DYNAMIC FEW-SHOT - {args.command.upper()}")
+    print("="*80)
+
+    if args.command == 'build' or not args.bank:
+        bank = build_bank(rows, USER_PROMPT_TEMPLATE)
+    else:
+        bank = load_bank(args.bank)
+    by_source = {}
+    for e in bank:
+        by_source[e['source']] = by_source.get(e['source'], 0) + 1
+    print(f"Example bank: {len(bank)} examples ({', '.join(f'{k}={v}' for k, v in by_source.items())})")
+
+    if args.command == 'build':
+        save_bank(bank, args.bank)
+        print(f"Saved to: {args.bank}")
+        return
+
+    if args.backend == 'fake':
+        backend = create_backend('fake', SYSTEM_PROMPT, url=args.fake_url)
+    else:
+        backend = create_backend('gemini', SYSTEM_PROMPT, model_name=DEFAULT_MODEL)
+    cache = ResponseCache(args.cache) if args.cache else None
+
+    selector = FewShotSelector(bank, USER_PROMPT_TEMPLATE, k=args.k)
+    print(f"Validation rows: {len(rows)} | k = {args.k} (leave-one-out)")
+    evaluate(rows, selector, backend, cache, args.concurrency)
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
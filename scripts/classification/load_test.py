@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Offline load test of the classification loop against fake_llm_server.py.
+
+Starts the fake server in-process, then classifies synthetic paragraphs
+serially and with the concurrent engine, reporting throughput and
+p50/p95/p99 latency. No network or API key needed.
+
+Usage:
+    python load_test.py --paragraphs 500 --latency-ms 300 --concurrency 16
+"""
+
+import argparse
+import threading
+import time
+
+import classify_full_corpus_v9 as v9
+from async_engine import run_concurrent
+from backends import create_backend
+from fake_llm_server import start_server
+from metrics import percentile
+
+
+def timed(classify_fn, latencies):
+    def wrapper(text):
+        t0 = time.perf_counter()
+        pred = classify_fn(text)
+        latencies.append(time.perf_counter() - t0)
+        return pred
+    return wrapper
+
+
+def report(label, latencies, failures, elapsed):
+    latencies = sorted(latencies)
+    print(f"\n{label}")
+    print(f"  Paragraphs: {len(latencies):,} ({failures} failed)")
+    print(f"  Wall clock: {elapsed:.2f}s")
+    print(f"  Throughput: {len(latencies)/elapsed:.1f} paragraphs/second")
+    print(f"  Latency p50: {percentile(latencies, 50)*1000:.0f}ms | "
+          f"p95: {percentile(latencies, 95)*1000:.0f}ms | "
+          f"p99: {percentile(latencies, 99)*1000:.0f}ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the classifier against a local fake LLM")
+    parser.add_argument('--paragraphs', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--latency-sigma', type=float, default=0.5)
+    parser.add_argument('--ms-per-token', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=429)
+    parser.add_argument('--retry-after', type=float, default=1)
+    parser.add_argument('--batch-drop-rate', type=float, default=0.0)
+    parser.add_argument('--skip-serial', action='store_true', help="only run the concurrent engine")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.host = '127.0.0.1'
+    args.verbose = False
+    args.ramble_rate = 0.0
+    args.ramble_tokens = 0
+
+    server = start_server(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    backend = create_backend('fake', v9.SYSTEM_PROMPT, url=f"http://{args.host}:{args.port}")
+    classify = lambda text: v9.classify_paragraph(text, backend=backend)
+    texts = [f"Synthetic paragraph {i}: the Government will review the scheme in due course." for i in range(args.paragraphs)]
+
+    print("="*60)
+    print("CLASSIFICATION LOAD TEST (fake LLM)")
+    print("="*60)
+    print(f"Server latency: median {args.latency_ms:.0f}ms, sigma {args.latency_sigma}")
+    print(f"Error rate: {args.error_rate*100:.1f}%")
+
+    if not args.skip_serial:
+        latencies, results = [], []
+        t0 = time.perf_counter()
+        for text in texts:
+            results.append(timed(classify, latencies)(text))
+        report("Serial (no sleep)", latencies, sum(1 for p in results if not p), time.perf_counter() - t0)
+
+    latencies, results = [], []
+    t0 = time.perf_counter()
+    run_concurrent(list(enumerate(texts)), timed(classify, latencies),
+                   lambda i, pred: results.append(pred), concurrency=args.concurrency)
+    report(f"Concurrent (concurrency={args.concurrency})", latencies, sum(1 for p in results if not p), time.perf_counter() - t0)
+
+    server.shutdown()
+    print("\n" + "="*60)
+
+
+if __name__ == '__main__':
+    main()
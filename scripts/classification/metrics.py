@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Per-request metrics for classification runs, and a summary report.
+
+Every classification request (single paragraph or batch) appends one JSON
+line to a metrics file:
+    run, source, ts          - which run, which script, when it finished
+    outcome                  - ok / cache_hit / failed
+    attempts                 - backend calls made (1 = no retries)
+    latency_s                - end to end, including retry backoff
+    api_s                    - time spent inside backend calls
+    items, paragraph_chars   - paragraphs in the request and their total length
+    input_tokens, output_tokens - estimated (len/4) over all attempts
+    error                    - last error, if any
+
+The summary prints latency percentiles, tokens/second, an estimated cost,
+latency by paragraph length and throughput over time.
+
+Usage:
+    python metrics.py classification_metrics_v9.jsonl
+    python metrics.py validation_metrics.jsonl --run latest --bucket 30
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime
+
+from rate_limit import estimate_tokens
+
+# Gemini 2.0 Flash list prices, USD per 1M tokens
+INPUT_PRICE_PER_M = 0.10
+OUTPUT_PRICE_PER_M = 0.40
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime('%Y%m%d-%H%M%S')
+
+
+class MeteredBackend:
+    """Wraps a backend for one request, tallying attempts, API time and tokens."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt = backend.system_prompt
+        self.attempts = 0
+        self.api_s = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def generate(self, prompt):
+        self.attempts += 1
+        self.input_tokens += estimate_tokens(self.system_prompt) + estimate_tokens(prompt)
+        t0 = time.perf_counter()
+        try:
+            text = self.backend.generate(prompt)
+        finally:
+            self.api_s += time.perf_counter() - t0
+        self.output_tokens += estimate_tokens(text)
+        return text
+
+
+class MetricsRecorder:
+    """Append-only JSONL of per-request metrics, safe to share across threads."""
+
+    def __init__(self, path: str, source: str, run_id: str = None):
+        self.path = path
+        self.source = source
+        self.run_id = run_id or new_run_id()
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, meter: MeteredBackend, started: float, items: int, paragraph_chars: int,
+               outcome: str, error=None):
+        """Write one request's record; `started` is its time.perf_counter() start."""
+        entry = {
+            'run': self.run_id,
+            'source': self.source,
+            'ts': round(time.time(), 3),
+            'outcome': outcome,
+            'attempts': meter.attempts,
+            'latency_s': round(time.perf_counter() - started, 4),
+            'api_s': round(meter.api_s, 4),
+            'items': items,
+            'paragraph_chars': paragraph_chars,
+            'input_tokens': meter.input_tokens,
+            'output_tokens': meter.output_tokens,
+        }
+        if error is not None:
+            entry['error'] = str(error)[:200]
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def load_records(path: str, run: str = None) -> list:
+    """Records from `path`, optionally for one run ('latest' = the last run in the file)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if run == 'latest' and records:
+        run = records[-1]['run']
+    if run:
+        records = [r for r in records if r['run'] == run]
+    return records
+
+
+def latency_line(label, values):
+    values = sorted(values)
+    return (f"{label:<22} n={len(values):<7,} p50 {percentile(values, 50)*1000:>7.0f}ms  "
+            f"p95 {percentile(values, 95)*1000:>7.0f}ms  p99 {percentile(values, 99)*1000:>7.0f}ms  "
+            f"max {(values[-1] if values else 0)*1000:>7.0f}ms")
+
+
+def summarize(records, bucket_seconds=60, input_price=INPUT_PRICE_PER_M, output_price=OUTPUT_PRICE_PER_M):
+    if not records:
+        print("No records")
+        return
+
+    runs = sorted({(r['run'], r['source']) for r in records})
+    start = min(r['ts'] - r['latency_s'] for r in records)
+    end = max(r['ts'] for r in records)
+    wall = max(end - start, 1e-9)
+
+    outcomes = {}
+    for r in records:
+        outcomes[r['outcome']] = outcomes.get(r['outcome'], 0) + 1
+    api = [r for r in records if r['attempts'] > 0]
+    paragraphs = sum(r['items'] for r in records)
+    input_tokens = sum(r['input_tokens'] for r in records)
+    output_tokens = sum(r['output_tokens'] for r in records)
+    retries = sum(max(0, r['attempts'] - 1) for r in records)
+    cost = input_tokens / 1e6 * input_price + output_tokens / 1e6 * output_price
+
+    print("="*80)
+    print("CLASSIFICATION METRICS")
+    print("="*80)
+    print(f"Runs: {', '.join(f'{run} ({source})' for run, source in runs)}")
+    print(f"Requests: {len(records):,} | Paragraphs: {paragraphs:,} | Wall clock: {wall:.1f}s")
+    print("Outcomes: " + ', '.join(f"{k}={v:,}" for k, v in sorted(outcomes.items())))
+    print(f"Backend calls: {sum(r['attempts'] for r in records):,} ({retries:,} retries)")
+
+    print(f"\nLatency")
+    for label, values in [
+        ("end to end (API)", [r['latency_s'] for r in api]),
+        ("inside backend calls", [r['api_s'] for r in api]),
+        ("retried requests", [r['latency_s'] for r in api if r['attempts'] > 1]),
+        ("cache hits", [r['latency_s'] for r in records if r['outcome'] == 'cache_hit']),
+    ]:
+        if values:
+            print(latency_line(label, values))
+
+    print(f"\nLatency by paragraph length (single-paragraph API requests)")
+    singles = [r for r in api if r['items'] == 1]
+    for lo, hi in [(0, 400), (400, 800), (800, 1600), (1600, None)]:
+        label = f"{lo}-{hi} chars" if hi else f"{lo}+ chars"
+        values = [r['latency_s'] for r in singles if r['paragraph_chars'] >= lo and (hi is None or r['paragraph_chars'] < hi)]
+        if values:
+            print(latency_line(label, values))
+
+    print(f"\nTokens (estimated)")
+    print(f"Input: {input_tokens:,} | Output: {output_tokens:,} | "
+          f"{(input_tokens + output_tokens)/wall:,.0f} tokens/s ({output_tokens/wall:,.0f} output tokens/s)")
+    print(f"Per paragraph: {input_tokens/paragraphs if paragraphs else 0:,.0f} in, "
+          f"{output_tokens/paragraphs if paragraphs else 0:,.0f} out")
+    print(f"Estimated cost: ${cost:,.4f} (at ${input_price}/M input, ${output_price}/M output)"
+          + (f" | ${cost/paragraphs*10_000:,.2f} per 10k paragraphs" if paragraphs else ''))
+
+    print(f"\nThroughput over time ({bucket_seconds:.0f}s buckets)")
+    print(f"{'t (s)':>8} {'requests':>9} {'para/s':>8} {'p50 ms':>8} {'failed':>7} {'retries':>8}")
+    buckets = {}
+    for r in records:
+        buckets.setdefault(int((r['ts'] - start) // bucket_seconds), []).append(r)
+    # Empty buckets (e.g. between runs) are skipped
+    for b in sorted(buckets):
+        rs = buckets[b]
+        lat = sorted(r['latency_s'] for r in rs if r['attempts'] > 0)
+        print(f"{b * bucket_seconds:>8.0f} {len(rs):>9,} {sum(r['items'] for r in rs)/bucket_seconds:>8.2f} "
+              f"{percentile(lat, 50)*1000:>8.0f} {sum(1 for r in rs if r['outcome'] == 'failed'):>7} "
+              f"{sum(max(0, r['attempts'] - 1) for r in rs):>8}")
+    print("="*80)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summarise a classification metrics file")
+    parser.add_argument('path', nargs='?', default='classification_metrics_v9.jsonl')
+    parser.add_argument('--run', help="run id to report on, or 'latest' (default: all runs)")
+    parser.add_argument('--bucket', type=float, default=60, help="throughput bucket in seconds (default: 60)")
+    parser.add_argument('--input-price', type=float, default=INPUT_PRICE_PER_M, help="USD per 1M input tokens")
+    parser.add_argument('--output-price', type=float, default=OUTPUT_PRICE_PER_M, help="USD per 1M output tokens")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    summarize(load_records(args.path, args.run), args.bucket, args.input_price, args.output_price)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Parallel prompt A/B evaluation against the audited validation set.
+
+Each prompt version is a Python module (or .py file) defining SYSTEM_PROMPT
+and USER_PROMPT_TEMPLATE, e.g. FINAL_PRODUCTION_classifier.py or a copy with
+a V10 prompt. Responses are parsed with the module's own parse_response if
+it has one (so a version is scored as its production script would read it),
+else FINAL_PRODUCTION_classifier's. All versions run concurrently over the same validation rows,
+sharing one rate limiter and the response cache, so unchanged versions cost
+nothing on a rerun.
+
+Reports per version:
+1. Accuracy against the human audit
+2. 5x5 confusion matrix (human rows x predicted columns)
+3. Wall clock, API calls, cache hits and estimated tokens
+plus a CSV of every row where any version disagrees with the human label.
+
+Usage:
+    python prompt_ab_eval.py validation_sample_68_classified_audited.csv \\
+        --prompt v9=FINAL_PRODUCTION_classifier --prompt v10=prompts/v10.py
+"""
+
+import argparse
+import csv
+import importlib
+import importlib.util
+import time
+from pathlib import Path
+
+from async_engine import run_concurrent
+from backends import DEFAULT_MODEL, create_backend
+from FINAL_PRODUCTION_classifier import compare_with_human_audit, load_validation_data, parse_response
+from rate_limit import RateLimiter, estimate_tokens
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache, cache_key, cached_generate
+from retry import CircuitBreaker, RetryExhausted, RetryPolicy, call_with_retry
+
+CATEGORIES = ['promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral']
+SHORT_NAMES = {'promise_citizen': 'p_cit', 'promise_firm': 'p_firm', 'demand_citizen': 'd_cit',
+               'demand_firm': 'd_firm', 'neutral': 'neutral'}
+
+
+def load_prompt_version(spec: str) -> dict:
+    """Parse NAME=MODULE_OR_PATH and load its SYSTEM_PROMPT / USER_PROMPT_TEMPLATE (and parse_response)."""
+    name, _, source = spec.partition('=')
+    if not source:
+        name, source = Path(spec).stem, spec
+
+    if source.endswith('.py'):
+        module_spec = importlib.util.spec_from_file_location(f"prompt_{name}", source)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(source)
+
+    return {
+        'name': name,
+        'system_prompt': module.SYSTEM_PROMPT,
+        'user_template': module.USER_PROMPT_TEMPLATE,
+        'parse_response': getattr(module, 'parse_response', parse_response),
+    }
+
+
+def format_user_prompt(template: str, text: str) -> str:
+    # Versions differ in placeholder name ({text} vs {paragraph_text})
+    return template.format(text=text, paragraph_text=text)
+
+
+def print_confusion_matrix(matrix):
+    header = 'human \\ pred'
+    print(f"    {header:>14} " + ' '.join(f"{SHORT_NAMES[c]:>8}" for c in CATEGORIES))
+    for human in CATEGORIES:
+        cells = ' '.join(f"{matrix[human][pred]:>8}" for pred in CATEGORIES)
+        print(f"    {SHORT_NAMES[human]:>14} {cells}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Evaluate several prompt versions on the validation set")
+    parser.add_argument('validation_csv')
+    parser.add_argument('--prompt', action='append', required=True,
+                        help="NAME=MODULE or NAME=path/to/prompt.py (repeatable)")
+    parser.add_argument('--output', default='prompt_ab_disagreements.csv')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rpm', type=float, default=1000)
+    parser.add_argument('--tpm', type=float, default=1_000_000)
+    parser.add_argument('--backend', choices=['gemini', 'fake'], default='gemini')
+    parser.add_argument('--fake-url', default='http://127.0.0.1:8765')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    parser.add_argument('--no-cache', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    versions = [load_prompt_version(spec) for spec in args.prompt]
+    rows = load_validation_data(args.validation_csv)
+    cache = None if args.no_cache else ResponseCache(args.cache)
+    policy = RetryPolicy()
+    breaker = CircuitBreaker()
+
+    for v in versions:
+        if args.backend == 'fake':
+            v['backend'] = create_backend('fake', v['system_prompt'], url=args.fake_url)
+        else:
+            v['backend'] = create_backend('gemini', v['system_prompt'], model_name=args.model)
+        v['stats'] = {'calls': 0, 'cache_hits': 0, 'tokens': 0, 'failed': 0,
+                      'first_start': None, 'last_end': None}
+        v['matrix'] = {h: {p: 0 for p in CATEGORIES} for h in CATEGORIES}
+        v['predictions'] = {}
+
+    print("="*80)
+    print("PROMPT A/B EVALUATION")
+    print("="*80)
+    print(f"Validation rows: {len(rows)} | Versions: {', '.join(v['name'] for v in versions)}")
+    print(f"Requests: {len(rows) * len(versions)} | Concurrency: {args.concurrency}")
+
+    def is_cached(payload):
+        v_idx, row_idx = payload
+        v = versions[v_idx]
+        return cache is not None and cache.contains(
+            cache_key(v['backend'].model_name, v['system_prompt'], v['user_template'], rows[row_idx]['paragraph']))
+
+    def estimate_request_tokens(payload):
+        """Estimated prompt + response tokens, as classify_full_corpus_v9 charges the limiter."""
+        v_idx, row_idx = payload
+        v = versions[v_idx]
+        prompt = format_user_prompt(v['user_template'], rows[row_idx]['paragraph'])
+        return estimate_tokens(v['system_prompt']) + estimate_tokens(prompt) + 60
+
+    def evaluate(payload):
+        v_idx, row_idx = payload
+        v = versions[v_idx]
+        text = rows[row_idx]['paragraph']
+        prompt = format_user_prompt(v['user_template'], text)
+        backend = v['backend']
+        hit = is_cached(payload)
+
+        start = time.perf_counter()
+        try:
+            pred = call_with_retry(
+                lambda: cached_generate(backend, cache, v['user_template'], text, prompt,
+                                        parse=v['parse_response']),
+                policy, breaker,
+            )
+        except RetryExhausted as e:
+            print(f"    ERROR [{v['name']}] row {row_idx}: {e}")
+            pred = None
+        return {'pred': pred, 'hit': hit, 'start': start, 'end': time.perf_counter()}
+
+    def on_result(_, payload_result):
+        v_idx, row_idx, r = payload_result
+        v = versions[v_idx]
+        stats = v['stats']
+        stats['first_start'] = min(stats['first_start'] or r['start'], r['start'])
+        stats['last_end'] = max(stats['last_end'] or r['end'], r['end'])
+        if r['hit']:
+            stats['cache_hits'] += 1
+        else:
+            stats['calls'] += 1
+            stats['tokens'] += estimate_request_tokens((v_idx, row_idx))
+        if r['pred'] is None:
+            stats['failed'] += 1
+            return
+        v['predictions'][row_idx] = compare_with_human_audit(r['pred'], rows[row_idx])
+
+    # Interleave versions so each progresses at the same pace
+    items = []
+    for row_idx in range(len(rows)):
+        for v_idx in range(len(versions)):
+            items.append((len(items), (v_idx, row_idx)))
+
+    limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    t0 = time.perf_counter()
+    run_concurrent(items, lambda p: (p[0], p[1], evaluate(p)), on_result,
+                   concurrency=args.concurrency, limiter=limiter, token_estimate=estimate_request_tokens,
+                   skip_limit=is_cached)
+    total_time = time.perf_counter() - t0
+
+    # Per-version summary
+    for v in versions:
+        correct = 0
+        for comparison in v['predictions'].values():
+            if comparison['match']:
+                correct += 1
+            if comparison['human'] in CATEGORIES and comparison['predicted'] in CATEGORIES:
+                v['matrix'][comparison['human']][comparison['predicted']] += 1
+        scored = len(v['predictions'])
+        stats = v['stats']
+        wall = (stats['last_end'] - stats['first_start']) if stats['first_start'] else 0.0
+
+        print(f"\n{'='*80}")
+        print(f"VERSION {v['name']}")
+        print(f"{'='*80}")
+        print(f"Accuracy: {correct}/{scored} ({correct/scored*100 if scored else 0:.1f}%)"
+              + (f" | {stats['failed']} failed" if stats['failed'] else ''))
+        print(f"Wall clock: {wall:.1f}s | API calls: {stats['calls']} | Cache hits: {stats['cache_hits']} | "
+              f"Est. tokens: {stats['tokens']:,}")
+        print("Confusion matrix:")
+        print_confusion_matrix(v['matrix'])
+
+    # Rows where any version disagrees with the human label
+    disagreements = []
+    for row_idx, row in enumerate(rows):
+        comparisons = {v['name']: v['predictions'].get(row_idx) for v in versions}
+        if all(c and c['match'] for c in comparisons.values()):
+            continue
+        out = {
+            'speech_id': row['speech_id'],
+            'paragraph_number': row['paragraph_number'],
+            'year': row['year'],
+            'paragraph': row['paragraph'][:100] + '...',
+            'human_category': next((c['human'] for c in comparisons.values() if c), ''),
+        }
+        for name, c in comparisons.items():
+            out[f"{name}_predicted"] = c['predicted'] if c else 'FAILED'
+        out['human_notes'] = row['Human logic -- category and notes']
+        disagreements.append(out)
+
+    if disagreements:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=disagreements[0].keys())
+            writer.writeheader()
+            writer.writerows(disagreements)
+
+    print(f"\n{'='*80}")
+    print(f"Total wall clock: {total_time:.1f}s")
+    print(f"Rows with any disagreement: {len(disagreements)} (saved to {args.output})")
+    if cache:
+        cache.print_stats()
+    print(f"{'='*80}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Token-bucket rate limiting for concurrent Gemini classification.
+
+The serial classifier sleeps 1 second after every call. These buckets instead
+spend the API budget as it refills:
+1. Requests per minute (RPM) - one token per call
+2. Tokens per minute (TPM) - estimated prompt + response tokens per call
+"""
+
+import asyncio
+import time
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Gemini models (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Refills `per_minute` tokens per minute, holding at most `burst_seconds` worth."""
+
+    def __init__(self, per_minute: float, burst_seconds: float = 1.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+    def _get_lock(self):
+        # One lock per event loop, so a bucket (and its budget) can be reused
+        # across run_concurrent() calls
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until `amount` tokens are available, then take them.
+
+        Callers queue on the lock, so waiting requests are served in order.
+        A request larger than the bucket waits for a full bucket and leaves it
+        in debt, so the long-run rate still holds.
+        """
+        needed = min(amount, self.capacity)
+        async with self._get_lock():
+            self._refill()
+            while self.tokens < needed:
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+class RateLimiter:
+    """Combined RPM / TPM budget. Either limit may be None (unlimited)."""
+
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    async def acquire(self, token_count: int = 0):
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens and token_count:
+            await self.tokens.acquire(token_count)
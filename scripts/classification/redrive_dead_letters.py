@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Re-drive dead-lettered paragraphs from classify_full_corpus_v9.py.
+
+Reads classification_dead_letters_v9.jsonl, classifies each paragraph again
+(with the usual retries), appends successes to the checkpoint journal and
+leaves only the still-failing paragraphs in the dead-letter file. The final
+CSV is then re-compacted from the journal.
+
+Usage:
+    python redrive_dead_letters.py
+    python redrive_dead_letters.py --backend fake --concurrency 4
+"""
+
+import argparse
+import csv
+import os
+
+import classify_full_corpus_v9 as v9
+from async_engine import run_concurrent
+from backends import DEFAULT_MODEL, create_backend
+from checkpoint_journal import CheckpointJournal, compact
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache
+from retry import ClassificationFailure, DeadLetterQueue, RetryPolicy
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-drive dead-lettered classifications")
+    parser.add_argument('--dead-letters', default='classification_dead_letters_v9.jsonl')
+    parser.add_argument('--journal', default='classification_journal_v9.jsonl')
+    parser.add_argument('--corpus', default='budget_speeches_paragraphs_v3_clean.csv')
+    parser.add_argument('--output', default='classification_results_full_corpus_v9.csv')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--max-attempts', type=int, default=5)
+    parser.add_argument('--backend', choices=['gemini', 'fake'], default='gemini')
+    parser.add_argument('--fake-url', default='http://127.0.0.1:8765')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    parser.add_argument('--no-cache', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.backend == 'fake':
+        v9.set_backend(create_backend('fake', v9.SYSTEM_PROMPT, url=args.fake_url))
+    else:
+        v9.set_backend(create_backend('gemini', v9.SYSTEM_PROMPT, model_name=DEFAULT_MODEL))
+    if not args.no_cache:
+        v9.set_cache(ResponseCache(args.cache))
+    v9.set_retry_policy(RetryPolicy(max_attempts=args.max_attempts))
+
+    dead_letters = DeadLetterQueue(args.dead_letters)
+    entries = dead_letters.load()
+    journal = CheckpointJournal(args.journal)
+    done = journal.load()
+
+    # Anything classified since it was dead-lettered is already resolved
+    pending = [e for pid, e in entries.items() if pid not in done]
+
+    print("="*60)
+    print("DEAD-LETTER RE-DRIVE")
+    print("="*60)
+    print(f"Dead letters: {len(entries):,} ({len(entries) - len(pending):,} already resolved)")
+    print(f"To re-drive: {len(pending):,}")
+
+    still_failing = []
+
+    def on_result(n, pred):
+        entry = pending[n]
+        para = entry['paragraph']
+        print(f"[{n+1}/{len(pending)}] {para['paragraph_id']} (previous error: {entry['error'][:60]})...", end=' ')
+        if pred:
+            journal.append(v9.build_result(para, pred))
+            print("✓")
+        else:
+            print("FAILED")
+            if isinstance(pred, ClassificationFailure):
+                entry = dict(entry, error=pred.error, attempts=entry['attempts'] + pred.attempts)
+            still_failing.append(entry)
+
+    items = [(n, e['paragraph']['paragraph_text']) for n, e in enumerate(pending)]
+    if args.concurrency > 1:
+        run_concurrent(items, v9.classify_paragraph, on_result, concurrency=args.concurrency)
+    else:
+        for n, text in items:
+            on_result(n, v9.classify_paragraph(text))
+
+    journal.close()
+    dead_letters.rewrite(still_failing)
+
+    print(f"\nRecovered: {len(pending) - len(still_failing):,}")
+    print(f"Still failing: {len(still_failing):,} (left in {args.dead_letters})")
+
+    if os.path.exists(args.corpus):
+        with open(args.corpus, 'r') as f:
+            corpus = list(csv.DictReader(f))
+        rows = compact(journal.load(), corpus, args.output)
+        print(f"Re-compacted {len(rows):,}/{len(corpus):,} paragraphs into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache of raw LLM responses (SQLite).
+
+Key = SHA-256 of (model name, system prompt, user prompt template, paragraph text),
+so:
+1. A rerun with unchanged prompts and text never calls the API again
+2. Any prompt edit (V9 -> V10) changes the key and misses automatically
+3. Identical boilerplate paragraphs in different speeches share one entry
+
+The raw response text is stored (not the parsed dict), so parser fixes apply
+to cached answers too. Size is bounded by least-recently-used eviction.
+
+Usage:
+    python response_cache.py classification_cache.sqlite   # print statistics
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_CACHE_PATH = 'classification_cache.sqlite'
+
+
+def cache_key(model_name: str, system_prompt: str, user_template: str, text: str) -> str:
+    """Hash of everything that determines the model's answer."""
+    h = hashlib.sha256()
+    for part in (model_name, system_prompt, user_template, text):
+        h.update(part.encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of response text, safe to share across threads."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 200_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)')
+        self._count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, key: str):
+        """Return the cached response text, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def contains(self, key: str) -> bool:
+        """True if `key` is cached (doesn't count as a hit or miss)."""
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM responses WHERE key = ?', (key,)).fetchone() is not None
+
+    def delete(self, key: str):
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._count -= cursor.rowcount
+
+    def put(self, key: str, model_name: str, response: str):
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO responses (key, model_name, response, created, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, model_name, response, now, now),
+            )
+            self._count += cursor.rowcount
+            if self._count > self.max_entries:
+                self._evict(self._count - self.max_entries)
+
+    def _evict(self, n: int):
+        # Drop the n least recently used entries
+        self._conn.execute(
+            'DELETE FROM responses WHERE key IN '
+            '(SELECT key FROM responses ORDER BY last_access LIMIT ?)', (n,)
+        )
+        self._count -= n
+        self.evictions += n
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': self._count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"Cache: {s['hits']:,} hits / {s['misses']:,} misses "
+              f"({s['hit_rate']*100:.1f}% hit rate) | {s['entries']:,} entries, "
+              f"{s['size_bytes']/1e6:.1f} MB, {s['evictions']:,} evicted")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def cached_generate(backend, cache, user_template: str, text: str, prompt: str, parse=None):
+    """Return the response for `prompt`, from `cache` if possible.
+
+    With `parse`, returns parse(response) instead, and a fresh response is only
+    cached if parsing succeeds - so a retry after a garbled answer asks again.
+    """
+    if cache is None:
+        response = backend.generate(prompt)
+        return parse(response) if parse else response
+
+    key = cache_key(backend.model_name, backend.system_prompt, user_template, text)
+    response = cache.get(key)
+    if response is not None:
+        if not parse:
+            return response
+        try:
+            return parse(response)
+        except Exception:
+            # Stale entry the current parser rejects - drop it and ask again
+            cache.delete(key)
+
+    response = backend.generate(prompt)
+    result = parse(response) if parse else response
+    cache.put(key, backend.model_name, response)
+    return result
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_PATH
+    if not os.path.exists(path):
+        print(f"No cache at {path}")
+        return
+
+    cache = ResponseCache(path)
+    rows = cache._conn.execute(
+        'SELECT model_name, COUNT(*), MIN(created), MAX(last_access) FROM responses GROUP BY model_name'
+    ).fetchall()
+    print("="*60)
+    print(f"RESPONSE CACHE: {path}")
+    print("="*60)
+    print(f"Entries: {cache._count:,} | Size: {os.path.getsize(path)/1e6:.1f} MB")
+    for model_name, count, created, last_access in rows:
+        print(f"  {model_name:30s}: {count:7,} entries "
+              f"(first {time.strftime('%Y-%m-%d', time.localtime(created))}, "
+              f"last used {time.strftime('%Y-%m-%d', time.localtime(last_access))})")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Retries, circuit breaking and dead letters for classification calls.
+
+1. call_with_retry - jittered exponential backoff; honours Retry-After and
+   waits longer on quota errors (HTTP 429 / RESOURCE_EXHAUSTED)
+2. CircuitBreaker - shared by all workers; after a quota error or a run of
+   consecutive failures it opens and every worker pauses until it closes
+3. DeadLetterQueue - JSONL file of paragraphs that still failed after all
+   retries, re-driven later with redrive_dead_letters.py
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+# HTTP statuses that will not succeed on retry
+PERMANENT_STATUSES = {400, 401, 403, 404}
+
+
+class RetryExhausted(Exception):
+    """Raised when every attempt failed."""
+
+    def __init__(self, last_error, attempts):
+        super().__init__(f"{last_error} (after {attempts} attempts)")
+        self.last_error = last_error
+        self.attempts = attempts
+
+
+class ClassificationFailure:
+    """Falsy stand-in for a prediction that could not be made."""
+
+    def __init__(self, error, attempts):
+        self.error = str(error)
+        self.attempts = attempts
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"ClassificationFailure({self.error!r}, attempts={self.attempts})"
+
+
+def describe_error(e):
+    """Return (retryable, is_quota, retry_after_seconds) for an exception."""
+    status = getattr(e, 'status', None) or getattr(e, 'code', None)
+    retry_after = getattr(e, 'retry_after', None)
+    text = f"{type(e).__name__} {e}".lower()
+
+    is_quota = status == 429 or 'resourceexhausted' in text or 'resource_exhausted' in text or 'quota' in text
+    retryable = is_quota or status not in PERMANENT_STATUSES
+    return retryable, is_quota, retry_after
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep ~ U(0, min(max_delay, base * 2^n))."""
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0, quota_delay=20.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.quota_delay = quota_delay
+
+    def delay(self, attempt, is_quota=False, retry_after=None):
+        if retry_after is not None:
+            return retry_after
+        if is_quota:
+            # Quota windows are per minute - back off harder than for blips
+            return self.quota_delay + random.uniform(0, self.quota_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Pause all workers during an outage.
+
+    Opens on a quota error - for the server's Retry-After if it sent one,
+    otherwise for `cooldown` seconds - or after `failure_threshold`
+    consecutive failures. Each cooldown-based re-open without an intervening
+    success doubles the cooldown, up to `max_cooldown`.
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=30.0, max_cooldown=600.0):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block while the circuit is open."""
+        while True:
+            with self._lock:
+                remaining = self.open_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+
+    def record_failure(self, is_quota=False, retry_after=None):
+        with self._lock:
+            self.consecutive_failures += 1
+            if time.monotonic() < self.open_until:
+                return  # already open
+            if is_quota and retry_after is not None:
+                pause = retry_after
+            elif is_quota or self.consecutive_failures >= self.failure_threshold:
+                pause = self.cooldown
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            else:
+                return
+            self.open_until = time.monotonic() + pause
+            self.consecutive_failures = 0
+            self.times_opened += 1
+        print(f"    Circuit open: pausing all workers for {pause:.1f}s")
+
+
+def call_with_retry(fn, policy=None, breaker=None):
+    """Call fn() until it succeeds or the policy gives up (raises RetryExhausted)."""
+    policy = policy or RetryPolicy()
+    last_error = None
+
+    for attempt in range(policy.max_attempts):
+        if breaker:
+            breaker.wait()
+        try:
+            result = fn()
+        except Exception as e:
+            last_error = e
+            retryable, is_quota, retry_after = describe_error(e)
+            if breaker:
+                breaker.record_failure(is_quota, retry_after)
+            if not retryable or attempt == policy.max_attempts - 1:
+                raise RetryExhausted(e, attempt + 1)
+            time.sleep(policy.delay(attempt, is_quota, retry_after))
+            continue
+        if breaker:
+            breaker.record_success()
+        return result
+
+    raise RetryExhausted(last_error, policy.max_attempts)
+
+
+class DeadLetterQueue:
+    """Append-only JSONL of paragraphs that failed every retry."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def add(self, para: dict, failure: ClassificationFailure):
+        entry = {
+            'paragraph_id': para['paragraph_id'],
+            'error': failure.error,
+            'attempts': failure.attempts,
+            'failed_at': datetime.now().isoformat(timespec='seconds'),
+            'paragraph': para,
+        }
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def load(self) -> dict:
+        """Return {paragraph_id: latest entry}.
+
+        Blank lines are skipped. A torn final line (crash mid-append) is
+        ignored and trimmed so new appends start on a clean line; any other
+        line that doesn't parse raises ValueError, as in CheckpointJournal.load.
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        good_bytes = 0
+        with self._lock:
+            with open(self.path, 'rb') as f:
+                for number, line in enumerate(f, 1):
+                    if not line.endswith(b'\n'):
+                        break  # only the last line can lack one
+                    if line.strip():
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            raise ValueError(f"{self.path}: line {number} is corrupt; "
+                                             f"fix or remove it by hand") from None
+                        entries[entry['paragraph_id']] = entry
+                    good_bytes += len(line)
+
+            if good_bytes < os.path.getsize(self.path):
+                with open(self.path, 'r+b') as f:
+                    f.truncate(good_bytes)
+        return entries
+
+    def rewrite(self, entries):
+        """Replace the file with `entries` (e.g. what's left after a re-drive)."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
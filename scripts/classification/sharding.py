@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Sharded classification across processes or machines, and the shard merge.
+
+classify_full_corpus_v9.py --shard i/N classifies only the paragraphs whose
+paragraph_id hashes to shard i (0 <= i < N), writing its own journal,
+dead-letter, metrics and result files, e.g.
+classification_results_full_corpus_v9.shard2of4.csv. Shards share nothing,
+so they can run in separate processes or on separate machines (copy the
+result files back before merging).
+
+`merge` combines the shard result files into the single results CSV in
+corpus order, after checking:
+1. Coverage - every corpus paragraph appears in some shard
+2. Duplicates - no paragraph appears twice (within or across shards)
+3. Placement - every row sits in the shard its id hashes to
+and reports per-shard throughput from the shard metrics files.
+
+Usage:
+    python classify_full_corpus_v9.py --async --shard 0/4    # ... through 3/4
+    python sharding.py merge 4
+"""
+
+import argparse
+import csv
+import os
+import sys
+import zlib
+
+from metrics import load_records
+
+
+def parse_shard(spec: str):
+    """'i/N' -> (i, N), with 0 <= i < N."""
+    try:
+        index, count = (int(x) for x in spec.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {spec!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{count - 1}, got {spec!r}")
+    return index, count
+
+
+def shard_of(paragraph_id: str, count: int) -> int:
+    # crc32 rather than hash(): the same on every process and machine
+    return zlib.crc32(paragraph_id.encode('utf-8')) % count
+
+
+def shard_path(path: str, index: int, count: int) -> str:
+    """classification_journal_v9.jsonl -> classification_journal_v9.shard1of4.jsonl"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard{index}of{count}{ext}"
+
+
+def shard_throughput(metrics_path: str):
+    """(paragraphs, wall seconds) from a shard's metrics file, or None."""
+    if not os.path.exists(metrics_path):
+        return None
+    records = load_records(metrics_path)
+    if not records:
+        return None
+    start = min(r['ts'] - r['latency_s'] for r in records)
+    end = max(r['ts'] for r in records)
+    return sum(r['items'] for r in records), end - start
+
+
+def merge(count, corpus_path, output_path, metrics_path, partial=False):
+    with open(corpus_path, 'r') as f:
+        corpus = list(csv.DictReader(f))
+    corpus_ids = {para['paragraph_id'] for para in corpus}
+
+    print("="*80)
+    print(f"SHARD MERGE ({count} shards)")
+    print("="*80)
+    print(f"{'shard':>6} {'rows':>8} {'expected':>9} {'misplaced':>10} {'para/s':>8} {'wall (s)':>9}  file")
+
+    rows_by_id = {}
+    duplicates = []
+    misplaced = 0
+    fieldnames = None
+    for index in range(count):
+        path = shard_path(output_path, index, count)
+        expected = sum(1 for pid in corpus_ids if shard_of(pid, count) == index)
+        if not os.path.exists(path):
+            print(f"{index:>6} {'-':>8} {expected:>9,} {'-':>10} {'-':>8} {'-':>9}  {path} (missing)")
+            continue
+
+        with open(path, 'r') as f:
+            reader = csv.DictReader(f)
+            fieldnames = fieldnames or reader.fieldnames
+            rows = list(reader)
+        shard_misplaced = 0
+        for row in rows:
+            pid = row['paragraph_id']
+            if pid in rows_by_id:
+                duplicates.append(pid)
+            rows_by_id[pid] = row
+            if shard_of(pid, count) != index:
+                shard_misplaced += 1
+        misplaced += shard_misplaced
+
+        throughput = shard_throughput(shard_path(metrics_path, index, count))
+        if throughput and throughput[1] > 0:
+            paragraphs, wall = throughput
+            rate = f"{paragraphs/wall:>8.2f} {wall:>9.1f}"
+        else:
+            rate = f"{'n/a':>8} {'n/a':>9}"
+        print(f"{index:>6} {len(rows):>8,} {expected:>9,} {shard_misplaced:>10,} {rate}  {path}")
+
+    missing = [para['paragraph_id'] for para in corpus if para['paragraph_id'] not in rows_by_id]
+    unknown = [pid for pid in rows_by_id if pid not in corpus_ids]
+
+    print(f"\nCorpus paragraphs: {len(corpus):,} | Merged: {len(rows_by_id):,}")
+    print(f"Missing: {len(missing):,}" + (f" (e.g. {', '.join(missing[:5])})" if missing else ''))
+    print(f"Duplicates: {len(duplicates):,}" + (f" (e.g. {', '.join(duplicates[:5])})" if duplicates else ''))
+    print(f"Not in corpus: {len(unknown):,} | In the wrong shard: {misplaced:,}")
+
+    if fieldnames is None:
+        print(f"\nNot writing {output_path}: no shard results found")
+        return False
+    if duplicates or unknown or (missing and not partial):
+        print(f"\nNot writing {output_path}" + ("" if partial else " (use --partial to allow missing paragraphs)"))
+        return False
+
+    ordered = [rows_by_id[para['paragraph_id']] for para in corpus if para['paragraph_id'] in rows_by_id]
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(ordered)
+    print(f"\nWrote {len(ordered):,} rows in corpus order to {output_path}")
+    return True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Merge sharded classification results")
+    sub = parser.add_subparsers(dest='command', required=True)
+    m = sub.add_parser('merge')
+    m.add_argument('shards', type=int, help="number of shards N")
+    m.add_argument('--corpus', default='budget_speeches_paragraphs_v3_clean.csv')
+    m.add_argument('--output', default='classification_results_full_corpus_v9.csv')
+    m.add_argument('--metrics', default='classification_metrics_v9.jsonl',
+                   help="unsharded metrics path; shard suffixes are added")
+    m.add_argument('--partial', action='store_true', help="write even if some paragraphs are missing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    ok = merge(args.shards, args.corpus, args.output, args.metrics, args.partial)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
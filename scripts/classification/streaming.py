@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Streaming classification with early termination.
+
+The classifier only needs eight "key: value" lines, but a blocking call waits
+for the whole answer - including any explanation the model adds after them.
+StreamingBackend streams the response instead, parses lines as they arrive,
+and stops reading as soon as all eight fields are complete. Requests also
+carry a tight max-output-token limit, so a rambling answer is cut off at the
+source too.
+
+Used by classify_full_corpus_v9.py --stream and classify_text(..., stream=True);
+benchmark_streaming.py compares it with blocking calls.
+"""
+
+from batching import REQUIRED_FIELDS
+
+# Eight short lines plus a 12-word reason fit comfortably
+MAX_OUTPUT_TOKENS = 100
+
+
+def read_until_fields(chunks, fields=REQUIRED_FIELDS) -> str:
+    """Consume text chunks until every field has a complete line; return the text so far.
+
+    Stops (and closes the stream) as soon as the last field's line ends, so
+    anything after the eight lines is never waited for.
+    """
+    needed = set(fields)
+    text = ''
+    scanned = 0
+    try:
+        for chunk in chunks:
+            text += chunk
+            # Only whole lines count - the last one may still be growing
+            end = text.rfind('\n')
+            if end < scanned:
+                continue
+            for line in text[scanned:end].splitlines():
+                key = line.split(':', 1)[0].strip()
+                if ':' in line and key in needed:
+                    needed.discard(key)
+            scanned = end + 1
+            if not needed:
+                return text[:end]
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return text
+
+
+class StreamingBackend:
+    """Wraps a backend so generate() streams and stops once the eight fields are in."""
+
+    def __init__(self, backend, fields=REQUIRED_FIELDS, max_output_tokens=MAX_OUTPUT_TOKENS):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt = backend.system_prompt
+        self.fields = fields
+        self.max_output_tokens = max_output_tokens
+
+    def generate(self, prompt):
+        return read_until_fields(self.backend.generate_stream(prompt, self.max_output_tokens), self.fields)
@@ -2,16 +2,263 @@
 """
 Generate viz_data.json from V9 classification results.
 Maintains exact same format as original viz_data.json.
+
+--db reads classifications and full paragraph text from the SQLite corpus
+store in one join (see processing/corpus_store.py) instead of loading both
+CSVs into dicts.
+
+Alongside viz_data.json it writes viz_summary.json, a compact aggregate
+built in the same pass: per speech and per year, counts by primary_type x
+primary_value, the promise ratio, and the speech's [start, end) index range
+in the paragraphs array, so nothing has to rescan every paragraph per
+year to get them.
+
+--shard-dir writes the page's lazily loaded form:
+1. manifest.json - the summary, the list of text shards, and the
+   dictionaries for dots.bin (minified)
+2. dots.bin - every promise/obligation paragraph, packed in columns the
+   page reads straight into typed arrays (see DOTS_HEADER)
+3. layout.bin - every dot's slot in its year's grid (see viz_layout.py)
+4. text/<shard>.json - those paragraphs' full text, one shard per year (or
+   per speech with --shard-by speech), fetched only when the reader reaches
+   that era or hovers a dot
 """
 
+import argparse
 import csv
+import glob
 import json
+import os
+import struct
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'processing'))
+from corpus_store import CorpusStore
+from viz_layout import write_layout
+
+# category -> (primary_type, primary_value); anything else (unknown) is neutral
+CATEGORY_TO_VIZ = {
+    'promise_citizen': ('promise', 'citizen'),
+    'promise_firm': ('promise', 'firm'),
+    'demand_citizen': ('obligation', 'citizen'),
+    'demand_firm': ('obligation', 'firm'),
+    'neutral': (None, 'none'),
+}
+
+
+def to_viz_paragraph(row, text):
+    """One viz_data.json paragraph from a classification row and its full text."""
+    primary_type, primary_value = CATEGORY_TO_VIZ.get(row['category'], (None, 'none'))
+    return {
+        'year': int(row['year']),
+        'text': text,
+        'fm_name': row['fm_name'],
+        'primary_type': primary_type,
+        'primary_value': primary_value,
+        'speech_id': int(row['speech_id'])
+    }
+
+
+# dots.bin: magic and row count, then the columns Uint16 year[n],
+# Uint16 speech_id[n], Uint8 category[n], Uint8 fm_name[n], little-endian.
+# Category codes index DOT_CATEGORIES; fm_name codes the manifest's fm_names.
+DOTS_MAGIC = b'BVZ1'
+DOTS_HEADER = struct.Struct('<4sI')
+DOT_CATEGORIES = [['promise', 'citizen'], ['promise', 'firm'], ['obligation', 'citizen'], ['obligation', 'firm']]
+
+
+def is_dot(para):
+    """Promises and obligations to citizens or firms: the paragraphs the page draws."""
+    return para['primary_type'] in ('promise', 'obligation') and para['primary_value'] in ('citizen', 'firm')
+
+
+class VizSummary:
+    """Per-speech and per-year counts of viz paragraphs, accumulated one paragraph at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.speeches = {}
+        self.years = {}
+
+    @staticmethod
+    def _empty_counts():
+        return {'promise': {'citizen': 0, 'firm': 0}, 'obligation': {'citizen': 0, 'firm': 0}, 'none': 0}
+
+    @staticmethod
+    def _count(counts, para):
+        if is_dot(para):
+            counts[para['primary_type']][para['primary_value']] += 1
+        else:
+            counts['none'] += 1
+
+    def add(self, para):
+        speech = self.speeches.get(para['speech_id'])
+        if speech is None:
+            speech = self.speeches[para['speech_id']] = {
+                'speech_id': para['speech_id'], 'year': para['year'], 'fm_name': para['fm_name'],
+                'range': [self.count, self.count], 'counts': self._empty_counts(),
+            }
+            self.years.setdefault(para['year'], {'year': para['year'], 'speeches': [],
+                                                 'counts': self._empty_counts()})['speeches'].append(para['speech_id'])
+        speech['range'][1] = self.count + 1
+        self._count(speech['counts'], para)
+        self._count(self.years[para['year']]['counts'], para)
+        self.count += 1
+
+    def track(self, paragraphs):
+        """Pass paragraphs through, counting each one."""
+        for para in paragraphs:
+            self.add(para)
+            yield para
+
+    @staticmethod
+    def promise_ratio(counts):
+        promises = sum(counts['promise'].values())
+        total = promises + sum(counts['obligation'].values())
+        return round(promises / total, 4) if total else None
+
+    def to_dict(self):
+        years = []
+        for year in sorted(self.years):
+            entry = dict(self.years[year])
+            ranges = [self.speeches[s]['range'] for s in entry['speeches']]
+            entry['range'] = [min(r[0] for r in ranges), max(r[1] for r in ranges)]
+            entry['promise_ratio'] = self.promise_ratio(entry['counts'])
+            years.append(entry)
+        speeches = [dict(s, promise_ratio=self.promise_ratio(s['counts'])) for s in self.speeches.values()]
+        return {'paragraphs': self.count, 'years': years, 'speeches': speeches}
+
+
+def write_viz_summary(summary, output_path):
+    """viz_summary.json, minified (it's read by the page, not by people)."""
+    with open(output_path, 'w') as f:
+        json.dump(summary.to_dict(), f, separators=(',', ':'))
 
-def main():
-    classification_path = 'data/classification_results_full_corpus_v9.csv'
-    corpus_path = 'data/budget_speeches_paragraphs_v3_clean.csv'
-    output_path = 'viz_data.json'
 
+class VizShardWriter:
+    """Write text shards and dots.bin as paragraphs stream past.
+
+    Only the current text shard is held in memory, plus six bytes per dot.
+    Speeches arrive in corpus order, so a year's paragraphs are normally
+    contiguous; if a year turns up again later, its shard is read back and
+    extended.
+    """
+
+    def __init__(self, shard_dir, shard_by='year'):
+        self.shard_dir = shard_dir
+        self.shard_by = shard_by
+        self.shards = {}
+        self.current = None
+        self.columns = {'year': array('H'), 'speech_id': array('H'), 'category': array('B'), 'fm_name': array('B')}
+        self.fm_names = {}
+        os.makedirs(os.path.join(shard_dir, 'text'), exist_ok=True)
+        # Shards of a previous run (possibly keyed the other way) would linger otherwise
+        for stale in glob.glob(os.path.join(shard_dir, 'text', '*.json')):
+            os.remove(stale)
+
+    def _path(self, key):
+        return os.path.join(self.shard_dir, 'text', f"{self.shard_by}_{key}.json")
+
+    def _dump(self, data, path):
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    def _flush(self):
+        if self.current:
+            key, texts = self.current
+            self._dump(texts, self._path(key))
+            self.shards[key]['rows'] = len(texts)
+            self.current = None
+
+    def _add_dot(self, para):
+        if para['year'] > 0xFFFF or para['speech_id'] > 0xFFFF:
+            raise ValueError(f"year {para['year']} / speech_id {para['speech_id']} doesn't fit dots.bin's Uint16")
+        code = self.fm_names.setdefault(para['fm_name'], len(self.fm_names))
+        if code > 0xFF:
+            raise ValueError("more than 256 distinct fm_name values; dots.bin codes them in a Uint8")
+        self.columns['year'].append(para['year'])
+        self.columns['speech_id'].append(para['speech_id'])
+        self.columns['category'].append(DOT_CATEGORIES.index([para['primary_type'], para['primary_value']]))
+        self.columns['fm_name'].append(code)
+
+    def add(self, para):
+        key = para[self.shard_by if self.shard_by == 'year' else 'speech_id']
+        if self.current is None or self.current[0] != key:
+            self._flush()
+            if key in self.shards:
+                with open(self._path(key)) as f:
+                    texts = json.load(f)
+            else:
+                texts = []
+                self.shards[key] = {'key': key, 'speeches': [], 'rows': 0,
+                                    'text': os.path.relpath(self._path(key), self.shard_dir)}
+            self.current = (key, texts)
+        speeches = self.shards[key]['speeches']
+        if (not speeches or speeches[-1] != para['speech_id']) and para['speech_id'] not in speeches:
+            speeches.append(para['speech_id'])
+        if is_dot(para):
+            self._add_dot(para)
+            self.current[1].append(para['text'])
+
+    def track(self, paragraphs):
+        """Pass paragraphs through, sharding each one."""
+        for para in paragraphs:
+            self.add(para)
+            yield para
+
+    def _write_dots(self, path):
+        with open(path, 'wb') as f:
+            f.write(DOTS_HEADER.pack(DOTS_MAGIC, len(self.columns['year'])))
+            for column in self.columns.values():
+                if sys.byteorder == 'big' and column.itemsize > 1:
+                    column.byteswap()
+                column.tofile(f)
+
+    def close(self, summary):
+        """Write the last shard, dots.bin, layout.bin and manifest.json."""
+        self._flush()
+        manifest = dict(summary.to_dict(), shard_by=self.shard_by, shards=list(self.shards.values()),
+                        dots={'path': 'dots.bin', 'count': len(self.columns['year']), 'categories': DOT_CATEGORIES,
+                              'fm_names': list(self.fm_names)})
+        manifest['layout'] = write_layout(self.shard_dir, manifest, self.columns['year'], self.columns['category'])
+        self._write_dots(os.path.join(self.shard_dir, 'dots.bin'))
+        self._dump(manifest, os.path.join(self.shard_dir, 'manifest.json'))
+        return manifest
+
+
+def write_viz_json(paragraphs, output_path):
+    """Stream paragraphs into viz_data.json, byte-identical to json.dump(..., indent=4).
+
+    Returns the number written; `paragraphs` can be any iterable.
+    """
+    count = 0
+    with open(output_path, 'w') as f:
+        f.write('{\n    "paragraphs": [')
+        for para in paragraphs:
+            item = json.dumps(para, indent=4).replace('\n', '\n        ')
+            f.write((',\n        ' if count else '\n        ') + item)
+            count += 1
+        f.write('\n    ]\n}' if count else ']\n}')
+    return count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate viz_data.json from V9 classification results")
+    parser.add_argument('--classifications', default='data/classification_results_full_corpus_v9.csv')
+    parser.add_argument('--corpus', default='data/budget_speeches_paragraphs_v3_clean.csv')
+    parser.add_argument('--db', help="read both from this corpus store instead of the CSVs")
+    parser.add_argument('--output', default='viz_data.json')
+    parser.add_argument('--summary', help="per-year/per-speech aggregate (default: viz_summary.json beside --output)")
+    parser.add_argument('--shard-dir', help="also write the manifest + lazily loaded shards the page reads")
+    parser.add_argument('--shard-by', choices=['year', 'speech'], default='year')
+    args = parser.parse_args()
+    args.summary = args.summary or os.path.join(os.path.dirname(args.output), 'viz_summary.json')
+    return args
+
+
+def load_paragraphs(classification_path, corpus_path):
+    """viz paragraphs from the classification CSV, with full text joined from the clean corpus CSV."""
     print(f"Reading classification results from: {classification_path}")
 
     with open(classification_path, 'r') as f:
@@ -32,28 +279,6 @@ def main():
     paragraphs = []
 
     for row in results:
-        # Map category to primary_type and primary_value
-        category = row['category']
-
-        if category == 'promise_citizen':
-            primary_type = 'promise'
-            primary_value = 'citizen'
-        elif category == 'promise_firm':
-            primary_type = 'promise'
-            primary_value = 'firm'
-        elif category == 'demand_citizen':
-            primary_type = 'obligation'
-            primary_value = 'citizen'
-        elif category == 'demand_firm':
-            primary_type = 'obligation'
-            primary_value = 'firm'
-        elif category == 'neutral':
-            primary_type = None
-            primary_value = 'none'
-        else:  # unknown
-            primary_type = None
-            primary_value = 'none'
-
         # Get full text from clean corpus
         para_id = row['paragraph_id']
         if para_id in corpus:
@@ -61,27 +286,32 @@ def main():
         else:
             text = row['paragraph_text']  # Fallback to truncated
 
-        para = {
-            'year': int(row['year']),
-            'text': text,
-            'fm_name': row['fm_name'],
-            'primary_type': primary_type,
-            'primary_value': primary_value,
-            'speech_id': int(row['speech_id'])
-        }
+        paragraphs.append(to_viz_paragraph(row, text))
 
-        paragraphs.append(para)
+    return paragraphs
 
-    # Create output structure
-    output = {
-        'paragraphs': paragraphs
-    }
+
+def main():
+    args = parse_args()
+    output_path = args.output
+
+    if args.db:
+        print(f"Reading classified paragraphs from: {args.db}")
+        store = CorpusStore(args.db)
+        paragraphs = [to_viz_paragraph(row, row['paragraph_text']) for row in store.classified_paragraphs()]
+        store.close()
+    else:
+        paragraphs = load_paragraphs(args.classifications, args.corpus)
 
     # Write to file
     print(f"Writing {len(paragraphs)} paragraphs to: {output_path}")
-
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=4)
+    summary = VizSummary()
+    shards = VizShardWriter(args.shard_dir, args.shard_by) if args.shard_dir else None
+    stream = summary.track(paragraphs)
+    write_viz_json(shards.track(stream) if shards else stream, output_path)
+    write_viz_summary(summary, args.summary)
+    if shards:
+        shards.close(summary)
 
     # Statistics
     print("\n" + "="*60)
@@ -103,6 +333,9 @@ def main():
 
     print(f"\nTotal: {len(paragraphs):,} paragraphs")
     print(f"Output: {output_path}")
+    print(f"Summary: {args.summary} ({len(summary.years)} years, {len(summary.speeches)} speeches)")
+    if shards:
+        print(f"Shards: {len(shards.shards)} by {args.shard_by} -> {args.shard_dir}/manifest.json")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Single streaming pipeline: raw speeches -> viz_data.json.
+
+Runs the four stages as generators, one paragraph at a time:
+1. Segment - process_lines_to_paragraphs() per speech file (sorted by name)
+2. Clean - drop should_remove() paragraphs, renumber within each speech
+3. Classify - V9 prompt, a bounded window of paragraphs in flight at a time
+4. Viz - viz_data.json paragraphs, streamed straight to the output file,
+   and the viz_summary.json aggregate beside it (plus the page's shards with --shard-dir)
+
+Memory stays flat regardless of corpus size: nothing holds the whole corpus.
+Intermediate CSVs are optional taps (--tap-*), written as rows flow past,
+in the same format as the standalone scripts produce.
+
+Classification goes through the shared response cache, so a rerun (or a run
+resumed after a crash) only calls the API for paragraphs not seen before.
+Results are also appended to the V9 checkpoint journal, and paragraphs that
+fail every retry go to the V9 dead-letter queue, so they can be re-driven on
+their own with redrive_dead_letters.py instead of rerunning the corpus.
+
+Paths default to the repo layout and work from any directory.
+
+Usage:
+    python scripts/pipeline.py --corpus-dir corpus --metadata metadata.csv
+    python scripts/pipeline.py --backend fake --tap-clean budget_speeches_paragraphs_v3_clean.csv \\
+        --tap-classified classification_results_full_corpus_v9.csv
+    python scripts/classification/redrive_dead_letters.py --dead-letters data/classification_dead_letters_v9.jsonl \\
+        --journal data/classification_journal_v9.jsonl --corpus budget_speeches_paragraphs_v3_clean.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'processing'))
+sys.path.insert(0, str(SCRIPTS_DIR / 'classification'))
+
+import classify_full_corpus_v9 as v9
+from async_engine import run_concurrent
+from backends import DEFAULT_MODEL, create_backend
+from checkpoint_journal import CheckpointJournal
+from clean_corpus_v3 import renumber, should_remove
+from generate_viz_data_from_v9 import VizShardWriter, VizSummary, to_viz_paragraph, write_viz_json, write_viz_summary
+from process_speeches_to_paragraphs import PARAGRAPH_FIELDS, load_metadata, process_speech_file
+from rate_limit import RateLimiter
+from response_cache import DEFAULT_CACHE_PATH, ResponseCache
+from retry import ClassificationFailure, DeadLetterQueue
+from streaming_stats import GroupedStats, StreamingStats, print_breakdown, print_length_summary
+
+RESULT_FIELDS = [
+    'paragraph_id', 'speech_id', 'paragraph_num', 'year', 'date', 'fm_name', 'pm_name',
+    'paragraph_text', 'paragraph_length', 'category', 'promise_citizen', 'promise_firm',
+    'demand_citizen', 'demand_firm', 'neutral', 'supportive_demand', 'framing_signal', 'reason',
+]
+
+
+class Tap:
+    """Optional CSV side output; a no-op without a path."""
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='') if path else None
+        if self._file:
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+            self._writer.writeheader()
+
+    def write(self, row):
+        if self._file:
+            self._writer.writerow(row)
+            self.count += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def segment(corpus_dir, metadata, stats, tap):
+    """Paragraph rows for every speech file, in sorted file-name order."""
+    speech_files = sorted(Path(corpus_dir).glob('*.txt'))
+    print(f"Speech files: {len(speech_files)} in {corpus_dir}")
+    for file_path in speech_files:
+        if file_path.name not in metadata:
+            print(f"Warning: No metadata found for {file_path.name}")
+            continue
+        stats['speeches'] += 1
+        for para in process_speech_file(file_path, metadata[file_path.name]):
+            stats['segmented'] += 1
+            tap.write(para)
+            yield para
+
+
+def clean(paragraphs, stats, removed_tap, clean_tap):
+    """Drop non-content paragraphs; renumber the rest within each speech."""
+    def kept():
+        for para in paragraphs:
+            if should_remove(para):
+                stats['removed'] += 1
+                removed_tap.write(para)
+            else:
+                yield para
+
+    for para in renumber(kept()):
+        stats['kept'] += 1
+        stats['lengths'].add(para['paragraph_length'])
+        stats['by_year'].add(para['year'], para['paragraph_length'])
+        clean_tap.write(para)
+        yield para
+
+
+def classify(paragraphs, stats, tap, journal, dead_letters, concurrency, limiter, window):
+    """(paragraph, result row) for every paragraph the classifier could label.
+
+    At most `window` paragraphs are buffered; each window is classified
+    concurrently and handed on in order. New results are journaled and
+    failures dead-lettered, as classify_full_corpus_v9.py does.
+    """
+    journaled = set(journal.load())
+
+    def flush(buffer):
+        predictions = {}
+        run_concurrent(list(enumerate(p['paragraph_text'] for p in buffer)), v9.classify_paragraph,
+                       predictions.__setitem__, concurrency=concurrency, limiter=limiter,
+                       token_estimate=v9.estimate_request_tokens, skip_limit=v9.is_cached)
+        for i, para in enumerate(buffer):
+            pred = predictions.get(i)
+            if not pred:
+                stats['failed'] += 1
+                if isinstance(pred, ClassificationFailure):
+                    dead_letters.add(para, pred)
+                continue
+            result = v9.build_result(para, pred)
+            stats['classified'] += 1
+            if para['paragraph_id'] not in journaled:
+                journal.append(result)
+                journaled.add(para['paragraph_id'])
+            tap.write(result)
+            yield para, result
+
+    buffer = []
+    for para in paragraphs:
+        buffer.append(para)
+        if len(buffer) >= window:
+            yield from flush(buffer)
+            buffer = []
+    if buffer:
+        yield from flush(buffer)
+
+
+def to_viz(classified, stats):
+    for para, result in classified:
+        stats['categories'][result['category']] = stats['categories'].get(result['category'], 0) + 1
+        yield to_viz_paragraph(result, para['paragraph_text'])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Raw speeches -> viz_data.json in one streaming pass")
+    parser.add_argument('--corpus-dir', default=str(REPO_DIR / 'corpus'), help="directory of speech .txt files")
+    parser.add_argument('--metadata', default=str(REPO_DIR / 'metadata.csv'))
+    parser.add_argument('--output', default=str(REPO_DIR / 'data' / 'viz_data.json'))
+    parser.add_argument('--summary', help="per-year/per-speech aggregate (default: viz_summary.json beside --output)")
+    parser.add_argument('--shard-dir', help="also write the manifest + lazily loaded shards the page reads")
+    parser.add_argument('--shard-by', choices=['year', 'speech'], default='year')
+    parser.add_argument('--tap-paragraphs', metavar='CSV', help="also write segmented paragraphs (pre-cleaning)")
+    parser.add_argument('--tap-clean', metavar='CSV', help="also write the cleaned corpus")
+    parser.add_argument('--tap-removed', metavar='CSV', help="also write paragraphs removed by cleaning")
+    parser.add_argument('--tap-classified', metavar='CSV', help="also write V9 classification results")
+    parser.add_argument('--journal', help="V9 checkpoint journal (default: beside --output)")
+    parser.add_argument('--dead-letters', help="V9 dead-letter queue (default: beside --output)")
+    parser.add_argument('--backend', choices=['gemini', 'fake'], default='gemini')
+    parser.add_argument('--fake-url', default='http://127.0.0.1:8765')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rpm', type=float, default=1000)
+    parser.add_argument('--tpm', type=float, default=1_000_000)
+    parser.add_argument('--window', type=int, default=256, help="max paragraphs buffered for classification")
+    parser.add_argument('--cache', default=str(SCRIPTS_DIR / 'classification' / DEFAULT_CACHE_PATH))
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--by-year', action='store_true', help="also print clean paragraph statistics per year")
+    args = parser.parse_args()
+    output_dir = os.path.dirname(args.output)
+    args.summary = args.summary or os.path.join(output_dir, 'viz_summary.json')
+    args.journal = args.journal or os.path.join(output_dir, 'classification_journal_v9.jsonl')
+    args.dead_letters = args.dead_letters or os.path.join(output_dir, 'classification_dead_letters_v9.jsonl')
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.backend == 'fake':
+        v9.set_backend(create_backend('fake', v9.SYSTEM_PROMPT, url=args.fake_url))
+    else:
+        v9.set_backend(create_backend('gemini', v9.SYSTEM_PROMPT, model_name=DEFAULT_MODEL))
+    cache = None if args.no_cache else ResponseCache(args.cache)
+    v9.set_cache(cache)
+
+    print("="*60)
+    print("STREAMING PIPELINE: SPEECHES -> VIZ DATA")
+    print("="*60)
+
+    metadata = load_metadata(args.metadata)
+    stats = {'speeches': 0, 'segmented': 0, 'removed': 0, 'kept': 0, 'classified': 0, 'failed': 0,
+             'categories': {}, 'lengths': StreamingStats(), 'by_year': GroupedStats()}
+    taps = [
+        Tap(args.tap_paragraphs, PARAGRAPH_FIELDS),
+        Tap(args.tap_removed, PARAGRAPH_FIELDS),
+        Tap(args.tap_clean, PARAGRAPH_FIELDS),
+        Tap(args.tap_classified, RESULT_FIELDS),
+    ]
+    paragraphs_tap, removed_tap, clean_tap, classified_tap = taps
+    limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    journal = CheckpointJournal(args.journal)
+    dead_letters = DeadLetterQueue(args.dead_letters)
+
+    start = time.perf_counter()
+    stream = segment(args.corpus_dir, metadata, stats, paragraphs_tap)
+    stream = clean(stream, stats, removed_tap, clean_tap)
+    stream = classify(stream, stats, classified_tap, journal, dead_letters, args.concurrency, limiter, args.window)
+    summary = VizSummary()
+    shards = VizShardWriter(args.shard_dir, args.shard_by) if args.shard_dir else None
+    stream = summary.track(to_viz(stream, stats))
+    written = write_viz_json(shards.track(stream) if shards else stream, args.output)
+    write_viz_summary(summary, args.summary)
+    if shards:
+        shards.close(summary)
+    elapsed = time.perf_counter() - start
+
+    for tap in taps:
+        tap.close()
+    journal.close()
+
+    print(f"\n{'='*60}")
+    print("PIPELINE COMPLETE")
+    print(f"{'='*60}")
+    print(f"Speeches: {stats['speeches']:,}")
+    print(f"Segmented: {stats['segmented']:,} paragraphs")
+    print(f"Cleaned: {stats['kept']:,} kept, {stats['removed']:,} removed")
+    print(f"Classified: {stats['classified']:,} (journal: {args.journal})")
+    if stats['failed']:
+        print(f"Failed: {stats['failed']:,} -> {args.dead_letters} "
+              f"(re-drive with: python scripts/classification/redrive_dead_letters.py)")
+    print(f"Time: {elapsed:.1f}s")
+    print(f"\nClean paragraph length:")
+    print_length_summary(stats['lengths'])
+    if args.by_year:
+        print(f"\nBy year:")
+        print_breakdown(stats['by_year'], 'year')
+    print(f"\nCategory counts:")
+    for cat in sorted(stats['categories']):
+        print(f"  {cat:20s}: {stats['categories'][cat]:5,}")
+    print(f"\nViz data: {written:,} paragraphs -> {args.output}")
+    print(f"Summary: {len(summary.years)} years, {len(summary.speeches)} speeches -> {args.summary}")
+    if shards:
+        print(f"Shards: {len(shards.shards)} by {args.shard_by} -> {args.shard_dir}/manifest.json")
+    for tap in taps:
+        if tap.path:
+            print(f"Tap: {tap.count:,} rows -> {tap.path}")
+    if cache:
+        cache.print_stats()
+
+
+if __name__ == '__main__':
+    main()
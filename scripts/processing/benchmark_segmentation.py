@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for parallel segmentation.
+
+Generates a synthetic corpus (default 100x the 67 real speeches), then runs
+process_speeches_to_paragraphs.py serially and with --workers 1, 2, 4, 8,
+and reports wall time, speedup and whether each output CSV is byte-identical
+to the serial one.
+
+Usage:
+    python benchmark_segmentation.py --scale 100 --workers 1 2 4 8
+"""
+
+import argparse
+import filecmp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_corpus import REAL_SPEECHES, generate
+
+SCRIPT = Path(__file__).resolve().parent / 'process_speeches_to_paragraphs.py'
+
+
+def run(workdir: Path, workers: int) -> tuple:
+    output = workdir / f"paragraphs_w{workers}.csv"
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(SCRIPT), '--corpus-dir', str(workdir / 'corpus'),
+                    '--metadata', str(workdir / 'metadata.csv'), '--output', str(output),
+                    '--workers', str(workers), '--quiet'],
+                   check=True, stdout=subprocess.DEVNULL)
+    return output, time.perf_counter() - start
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark parallel speech segmentation")
+    parser.add_argument('--scale', type=float, default=100, help="multiple of the real corpus (default: 100)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--workdir', help="reuse/keep the corpus here (default: a temp dir)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    speeches = max(1, round(REAL_SPEECHES * args.scale))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir or tmp)
+        if not (workdir / 'metadata.csv').exists():
+            print(f"Generating {speeches:,} synthetic speeches in {workdir}...")
+            generate(workdir, speeches)
+        size = sum(p.stat().st_size for p in (workdir / 'corpus').glob('*.txt'))
+
+        print("="*60)
+        print(f"SEGMENTATION SCALING ({speeches:,} speeches, {size/1e6:.1f} MB, {os.cpu_count()} CPUs)")
+        print("="*60)
+
+        # Serial baseline: the plain in-process loop
+        baseline, serial_s = run(workdir, 0)
+        print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8} {'MB/s':>7}  identical")
+        print(f"{'serial':>8} {serial_s:>9.2f} {1:>7.2f}x {size/1e6/serial_s:>7.1f}  -")
+        for workers in args.workers:
+            output, elapsed = run(workdir, workers)
+            same = filecmp.cmp(baseline, output, shallow=False)
+            print(f"{workers:>8} {elapsed:>9.2f} {serial_s/elapsed:>7.2f}x {size/1e6/elapsed:>7.1f}  "
+                  f"{'yes' if same else 'NO'}")
+        print("="*60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark long-paragraph splitting on multi-megabyte paragraphs.
+
+Compares split_long_paragraph() (sentence-break index + binary search) with
+the previous loop, kept here as legacy_split(), which re-sliced the remaining
+text and re-scanned a +/-200 char window for every chunk. Checks that both
+produce the same chunks - on the benchmark inputs and on many small random
+paragraphs - and reports the time for each.
+
+The inputs look like OCR'd appendices: sentences joined into one block with
+no blank lines, plus stretches of table numbers with no terminators at all.
+
+Usage:
+    python benchmark_splitting.py --sizes-mb 0.25 1 4
+"""
+
+import argparse
+import random
+import re
+import time
+
+from process_speeches_to_paragraphs import split_long_paragraph
+from synthetic_corpus import sentence
+
+
+def legacy_find_sentence_break(text: str, target_pos: int) -> int:
+    search_start = max(0, target_pos - 200)
+    search_end = min(len(text), target_pos + 200)
+    search_region = text[search_start:search_end]
+    terminators = [search_start + m.end() for m in re.finditer(r'[.!?]+\s', search_region)]
+    if not terminators:
+        return target_pos
+    return min(terminators, key=lambda x: abs(x - target_pos))
+
+
+def legacy_split(para: str) -> list:
+    chunks = []
+    remaining = para
+    while len(remaining) > 800:
+        break_pos = legacy_find_sentence_break(remaining, 800)
+        chunk = remaining[:break_pos].strip()
+        if chunk:
+            chunks.append(chunk)
+        remaining = remaining[break_pos:].strip()
+    if remaining:
+        chunks.append(remaining)
+    return chunks
+
+
+def appendix_text(rng, size: int) -> str:
+    """One paragraph of about `size` chars: prose with table runs mixed in."""
+    parts, length = [], 0
+    while length < size:
+        if rng.random() < 0.05:
+            part = ' '.join(f"{rng.randint(1960, 2026)} {rng.randint(1, 99999):,}" for _ in range(rng.randint(20, 150)))
+        else:
+            part = sentence(rng) + rng.choice(['', '..', '?!', ' .'])
+        parts.append(part)
+        length += len(part) + 1
+    return ' '.join(parts)
+
+
+def check_small(rng, count: int) -> int:
+    """Random short paragraphs with awkward terminator/whitespace placement; returns mismatches."""
+    alphabet = ['a', 'b', ' ', '.', '!', '?', '\t', '...', ' . ', 'word ', 'x' * 50]
+    mismatches = 0
+    for _ in range(count):
+        para = ''.join(rng.choice(alphabet) for _ in range(rng.randint(100, 1200))).strip()
+        mismatches += legacy_split(para) != split_long_paragraph(para)
+    return mismatches
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark long-paragraph splitting")
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[0.25, 1, 4, 8])
+    parser.add_argument('--random-checks', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+
+    print("="*60)
+    print("LONG-PARAGRAPH SPLITTING")
+    print("="*60)
+    print(f"Random paragraphs: {args.random_checks:,} | mismatches: {check_small(rng, args.random_checks)}")
+
+    print(f"\n{'size (MB)':>9} {'chunks':>8} {'legacy (s)':>11} {'indexed (s)':>12} {'speedup':>8}  identical")
+    for size_mb in args.sizes_mb:
+        para = appendix_text(rng, int(size_mb * 1e6))
+
+        start = time.perf_counter()
+        old = legacy_split(para)
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = split_long_paragraph(para)
+        indexed_s = time.perf_counter() - start
+
+        print(f"{len(para)/1e6:>9.2f} {len(new):>8,} {legacy_s:>11.3f} {indexed_s:>12.3f} "
+              f"{legacy_s/indexed_s:>7.1f}x  {'yes' if old == new else 'NO'}")
+    print("="*60)
+
+
+if __name__ == '__main__':
+    main()
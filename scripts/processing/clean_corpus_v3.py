@@ -9,111 +9,131 @@ Remove:
 4. Very short fragments (< 20 chars)
 5. Just numbers/years
 6. Connector-only fragments ("And", "But", "Or" at start with < 100 chars)
+
+The tests live in RULES, a table of precompiled rules evaluated in order.
+Each rule counts calls, hits and time, and main() prints which rules fired.
+
+--db cleans the segmented paragraphs in the SQLite corpus store instead of a
+CSV (see corpus_store.py), recording the clean ids and, for removed
+paragraphs, the rule that removed them.
+
+Rows are filtered, renumbered and written in a single pass, and the report
+statistics are streamed (see streaming_stats.py), so memory stays flat
+however large the input is. --by-year / --by-speech break them down.
 """
 
+import argparse
 import csv
 import re
+import time
+from collections import deque
 
-def should_remove(para):
-    """Return True if paragraph should be removed."""
-    text = para['paragraph_text'].strip()
-    length = len(text)
+from corpus_store import CorpusStore
+from streaming_stats import GroupedStats, StreamingStats, print_breakdown, print_length_summary
 
-    # 1. Very short (< 20 chars) - likely headers or fragments
-    if length < 20:
-        return True
 
-    # 2. Table data patterns
-    # Year-number pairs: "1966 - 51,272"
-    if re.match(r'^\d{4}\s*[-–]\s*[\d,]+$', text):
-        return True
+class Rule:
+    """A named removal test with hit and timing counters."""
 
-    # Year with ellipsis: "1964  ...  $2,700 million"
-    if re.match(r'^\d{4}\s+\.\.\.\s+', text):
-        return True
+    def __init__(self, name, test):
+        self.name = name
+        self.test = test
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
 
-    # Table headers: "From     To", "Per Kilogram"
-    table_headers = ['From', 'To', 'Per Kilogram', 'Consumption', 'Present', 'Proposed']
-    if text in table_headers or (length < 50 and any(h in text for h in table_headers)):
-        return True
 
-    # 3. Section headers (short text ending without punctuation)
-    section_header_patterns = [
-        r'^(Revenue|Expenditure|Conclusion|Introduction|Summary),?\s*\d{4}$',
-        r'^Tax (Changes|Increases|Measures)$',
-        r'^(Budget|Fiscal|Economic)\s+(Policy|Outlook|Measures)$',
-        r'^\d+-Room Flats$',
-        r'^Duty on ',
-    ]
-    for pattern in section_header_patterns:
-        if re.match(pattern, text):
-            return True
-
-    # Generic short header without punctuation
+def _regex(pattern):
+    match = re.compile(pattern).match
+    return lambda text, length: match(text) is not None
+
+
+# Table headers: "From     To", "Per Kilogram"
+_TABLE_HEADER = re.compile('|'.join(map(re.escape, ['From', 'To', 'Per Kilogram', 'Consumption', 'Present', 'Proposed'])))
+_HEADER_SMALL_WORDS = frozenset(['the', 'of', 'and', 'or', 'in', 'on', 'to'])
+_NUMBER_PUNCTUATION = str.maketrans('', '', ',.$% -')
+
+
+def _generic_header(text, length):
+    # Could be header if it's all caps or title case and short
     if length < 50 and not text[-1] in '.!?;"' and text[0].isupper():
-        # Could be header if it's all caps or title case and short
         words = text.split()
-        if len(words) <= 4 and all(w[0].isupper() or w.lower() in ['the', 'of', 'and', 'or', 'in', 'on', 'to'] for w in words):
-            return True
+        return len(words) <= 4 and all(w[0].isupper() or w.lower() in _HEADER_SMALL_WORDS for w in words)
+    return False
 
+
+# Evaluated in order; the first rule that matches gets the hit
+RULES = [
+    # 1. Very short (< 20 chars) - likely headers or fragments
+    Rule('short_fragment', lambda text, length: length < 20),
+    # 2. Table data: year-number pairs "1966 - 51,272", year with ellipsis "1964  ...  $2,700 million"
+    Rule('table_row', _regex(r'\d{4}\s*[-–]\s*[\d,]+$|\d{4}\s+\.\.\.\s+')),
+    # "text in headers" implies a short text containing a header
+    Rule('table_header', lambda text, length: length < 50 and _TABLE_HEADER.search(text) is not None),
+    # 3. Section headers (short text ending without punctuation)
+    Rule('section_header', _regex(
+        r'(?:Revenue|Expenditure|Conclusion|Introduction|Summary),?\s*\d{4}$'
+        r'|Tax (?:Changes|Increases|Measures)$'
+        r'|(?:Budget|Fiscal|Economic)\s+(?:Policy|Outlook|Measures)$'
+        r'|\d+-Room Flats$'
+        r'|Duty on '
+    )),
+    Rule('generic_header', _generic_header),
     # 4. Speech procedure markers - ONLY pure procedure text
     # Keep paragraphs that END with "I beg to move" (conclusions with content)
-    # Only remove paragraphs that START with procedure and have minimal content
-    procedure_start_patterns = [
-        r'^(Mr|Madam) (Speaker|Deputy Speaker), Sir, I beg to move,?\s*(That|"That) Parliament approves',
-        r'^(Mr|Madam) (Speaker|Deputy Speaker), Sir, I beg to move\.$',
-        r'^Sir, I beg to move\.$',
-        r'^Question put and agreed to',
-        r'^Bill read the (First|Second|Third) time',
-    ]
-    for pattern in procedure_start_patterns:
-        if re.match(pattern, text):
-            return True
-
+    Rule('procedure', _regex(
+        r'(?:Mr|Madam) (?:Speaker|Deputy Speaker), Sir, I beg to move,?\s*(?:That|"That) Parliament approves'
+        r'|(?:Mr|Madam) (?:Speaker|Deputy Speaker), Sir, I beg to move\.$'
+        r'|Sir, I beg to move\.$'
+        r'|Question put and agreed to'
+        r'|Bill read the (?:First|Second|Third) time'
+    )),
     # Very short procedure fragments (but NOT conclusions)
-    if length < 50 and text.startswith(('Mr Speaker', 'Madam Speaker', 'Mr President')) and not 'beg to move' in text[-30:]:
-        return True
-
+    Rule('procedure_fragment', lambda text, length: (
+        length < 50 and text.startswith(('Mr Speaker', 'Madam Speaker', 'Mr President'))
+        and not 'beg to move' in text[-30:])),
     # 5. Just numbers or just a year
-    if text.replace(',', '').replace('.', '').replace('$', '').replace('%', '').replace(' ', '').replace('-', '').isdigit():
-        return True
-
+    Rule('number_only', lambda text, length: text.translate(_NUMBER_PUNCTUATION).isdigit()),
     # 6. Connector fragments (starts with And/But/Or and is short)
-    connectors = ['And ', 'But ', 'Or ', 'So ']
-    if any(text.startswith(conn) for conn in connectors) and length < 100:
-        return True
-
+    Rule('connector_fragment', lambda text, length: length < 100 and text.startswith(('And ', 'But ', 'Or ', 'So '))),
     # 7. Isolated list item that slipped through
-    if re.match(r'^\([a-z]\)\s*$', text) or re.match(r'^\([ivxl]+\)\s*$', text):
-        return True
+    Rule('list_item', _regex(r'\((?:[a-z]|[ivxl]+)\)\s*$')),
+]
 
-    # Keep everything else
-    return False
 
+def matching_rule(text):
+    """The first rule that removes `text` (already stripped), or None."""
+    length = len(text)
+    clock = time.perf_counter
+    for rule in RULES:
+        start = clock()
+        hit = rule.test(text, length)
+        rule.seconds += clock() - start
+        rule.calls += 1
+        if hit:
+            rule.hits += 1
+            return rule
+    return None
 
-def main():
-    input_path = 'budget_speeches_paragraphs_v2.csv'
-    output_path = 'budget_speeches_paragraphs_v3_clean.csv'
 
-    with open(input_path, 'r') as f:
-        reader = csv.DictReader(f)
-        paragraphs = list(reader)
+def should_remove(para):
+    """Return True if paragraph should be removed."""
+    return matching_rule(para['paragraph_text'].strip()) is not None
 
-    print(f"Analyzing {len(paragraphs)} paragraphs from V2...")
 
-    # Filter
-    removed = []
-    kept = []
+def print_rule_stats():
+    total = sum(rule.seconds for rule in RULES)
+    print(f"{'rule':<20} {'calls':>9} {'hits':>8} {'time (ms)':>10} {'ns/call':>8}")
+    for rule in RULES:
+        per_call = rule.seconds / rule.calls * 1e9 if rule.calls else 0
+        print(f"{rule.name:<20} {rule.calls:>9,} {rule.hits:>8,} {rule.seconds*1000:>10.2f} {per_call:>8.0f}")
+    print(f"{'total':<20} {'':>9} {sum(rule.hits for rule in RULES):>8,} {total*1000:>10.2f}")
 
-    for para in paragraphs:
-        if should_remove(para):
-            removed.append(para)
-        else:
-            kept.append(para)
 
-    # Renumber paragraphs within each speech
+def renumber(paragraphs):
+    """Renumber kept paragraphs 1..n within each speech (yields them in order)."""
     speech_counters = {}
-    for para in kept:
+    for para in paragraphs:
         speech_id = para['speech_id']
         if speech_id not in speech_counters:
             speech_counters[speech_id] = 1
@@ -122,49 +142,149 @@ def main():
 
         para['paragraph_num'] = speech_counters[speech_id]
         para['paragraph_id'] = f"{speech_id}_{speech_counters[speech_id]}"
+        yield para
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Remove non-content paragraphs from the segmented corpus")
+    parser.add_argument('--input', default='budget_speeches_paragraphs_v2.csv')
+    parser.add_argument('--output', help="clean CSV (default: budget_speeches_paragraphs_v3_clean.csv unless --db)")
+    parser.add_argument('--removed', help="removed-paragraph CSV (default: removed_paragraphs_v3.csv unless --db)")
+    parser.add_argument('--db', help="read and update the corpus store instead of --input")
+    parser.add_argument('--by-year', action='store_true', help="also print clean paragraph statistics per year")
+    parser.add_argument('--by-speech', action='store_true', help="also print clean paragraph statistics per speech")
+    args = parser.parse_args()
+    if not args.db:
+        args.output = args.output or 'budget_speeches_paragraphs_v3_clean.csv'
+        args.removed = args.removed or 'removed_paragraphs_v3.csv'
+    return args
+
+
+class LazyCsvWriter:
+    """DictWriter that creates its file on the first row, with that row's keys as the header."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def writerow(self, row):
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='')
+            self._writer = csv.DictWriter(self._file, fieldnames=row.keys())
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
 
-    # Write cleaned corpus
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=kept[0].keys())
-        writer.writeheader()
-        writer.writerows(kept)
+def main():
+    args = parse_args()
+    output_path = args.output
+    removed_path = args.removed
+    store = CorpusStore(args.db) if args.db else None
+
+    print(f"Analyzing paragraphs from {args.db or 'V2'}...")
+
+    # Filter, renumber and write in one pass; only counts, samples and sketches stay in memory
+    input_file = None if store else open(args.input, 'r')
+    paragraphs = store.segments() if store else csv.DictReader(input_file)
+    kept_writer = LazyCsvWriter(output_path)
+    removed_writer = LazyCsvWriter(removed_path)
+    samples = []
+    decisions = []
+    segment_nums = deque()
+    total = 0
+    removed = 0
+
+    def kept_paragraphs():
+        nonlocal total, removed
+        for para in paragraphs:
+            total += 1
+            rule = matching_rule(para['paragraph_text'].strip())
+            if rule:
+                removed += 1
+                removed_writer.writerow(para)
+                if len(samples) < 30:
+                    samples.append(para)
+                if store:
+                    decisions.append((para['speech_id'], para['paragraph_num'], None, rule.name))
+            else:
+                if store:
+                    segment_nums.append(para['paragraph_num'])
+                yield para
+
+    lengths = StreamingStats()
+    by_year = GroupedStats()
+    by_speech = GroupedStats(k=32)
+
+    # Renumber paragraphs within each speech
+    for para in renumber(kept_paragraphs()):
+        kept_writer.writerow(para)
+        length = len(para['paragraph_text'])
+        lengths.add(length)
+        by_year.add(para['year'], length)
+        by_speech.add(para['speech_id'], length)
+        if store:
+            decisions.append((para['speech_id'], segment_nums.popleft(), para['paragraph_num'], None))
+
+    kept_writer.close()
+    removed_writer.close()
+    if input_file:
+        input_file.close()
+    kept = lengths.count
 
-    # Write removed paragraphs for review
-    removed_path = 'removed_paragraphs_v3.csv'
-    if removed:
-        with open(removed_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=removed[0].keys())
-            writer.writeheader()
-            writer.writerows(removed)
+    if store:
+        store.save_cleaning(decisions)
+        store.close()
 
     # Statistics
     print(f"\n{'='*60}")
     print(f"CLEANING RESULTS")
     print(f"{'='*60}")
-    print(f"Input (V2): {len(paragraphs)} paragraphs")
-    print(f"Kept: {len(kept)} paragraphs ({len(kept)/len(paragraphs)*100:.1f}%)")
-    print(f"Removed: {len(removed)} paragraphs ({len(removed)/len(paragraphs)*100:.1f}%)")
-    print(f"\nSaved to: {output_path}")
-    print(f"Removed items saved to: {removed_path}")
+    print(f"Input (V2): {total} paragraphs")
+    print(f"Kept: {kept} paragraphs ({kept/total*100:.1f}%)")
+    print(f"Removed: {removed} paragraphs ({removed/total*100:.1f}%)")
+    if store:
+        print(f"\nSaved to: {args.db} (paragraphs.paragraph_id / removed_by)")
+    if output_path:
+        print(f"\nSaved to: {output_path}")
+    if removed_path:
+        print(f"Removed items saved to: {removed_path}")
+
+    # Which rules fire, and what they cost
+    print(f"\n{'='*60}")
+    print(f"REMOVAL RULES")
+    print(f"{'='*60}")
+    print_rule_stats()
 
     # Show examples of what was removed
     print(f"\n{'='*60}")
     print(f"SAMPLE OF REMOVED PARAGRAPHS")
     print(f"{'='*60}")
-    for i, para in enumerate(removed[:30], 1):
+    for i, para in enumerate(samples, 1):
         print(f"[{i}] {para['speech_id']}-{para['paragraph_num']} ({para['year']}): {para['paragraph_text'][:80]}")
 
     # Final corpus statistics
-    lengths = [len(p['paragraph_text']) for p in kept]
     print(f"\n{'='*60}")
     print(f"FINAL CORPUS STATISTICS")
     print(f"{'='*60}")
-    print(f"Total paragraphs: {len(kept)}")
+    print(f"Total paragraphs: {kept}")
     print(f"Paragraph length:")
-    print(f"  Min: {min(lengths)} chars")
-    print(f"  Max: {max(lengths)} chars")
-    print(f"  Average: {sum(lengths)/len(lengths):.1f} chars")
-    print(f"  Median: {sorted(lengths)[len(lengths)//2]} chars")
+    print_length_summary(lengths, unit='chars')
+
+    if args.by_year:
+        print(f"\nBy year:")
+        print_breakdown(by_year, 'year')
+    if args.by_speech:
+        print(f"\nBy speech:")
+        print_breakdown(by_speech, 'speech')
 
     # Comparison
     print(f"\n{'='*60}")
@@ -172,7 +292,7 @@ def main():
     print(f"{'='*60}")
     print(f"V1 (original): 12,803 paragraphs")
     print(f"V2 (lists merged): 11,609 paragraphs (-9.3%)")
-    print(f"V3 (cleaned): {len(kept)} paragraphs ({(len(kept)-12803)/12803*100:+.1f}%)")
+    print(f"V3 (cleaned): {kept} paragraphs ({(kept-12803)/12803*100:+.1f}%)")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite corpus store (corpus.sqlite).
+
+One database instead of the chain of CSV files:
+1. speeches - one row per metadata.csv row, indexed on year
+2. paragraphs - every segmented paragraph, indexed on speech_id. Cleaning
+   fills in the clean paragraph_id/paragraph_num (unique index on
+   paragraph_id), or the name of the rule that removed it
+3. classifications - one V9 result per paragraph_id
+
+Scripts read and write it with --db:
+    process_speeches_to_paragraphs.py --db corpus.sqlite   # speeches + paragraphs
+    clean_corpus_v3.py --db corpus.sqlite                  # clean ids / removal rules
+    classify_full_corpus_v9.py --db corpus.sqlite          # reads clean corpus, writes classifications
+    generate_viz_data_from_v9.py --db corpus.sqlite        # one join, full text included
+
+Re-segmenting a speech replaces its paragraphs and drops its
+classifications; re-cleaning drops those of paragraphs whose id changed
+(rerunning V9 refills them from the response cache).
+
+Rows come back as dicts in the same shape (and order) as the CSV rows the
+scripts used to read.
+
+Usage:
+    python corpus_store.py import corpus.sqlite --metadata metadata.csv \\
+        --clean budget_speeches_paragraphs_v3_clean.csv --classifications classification_results_full_corpus_v9.csv
+    python corpus_store.py stats corpus.sqlite
+"""
+
+import argparse
+import csv
+import sqlite3
+
+DEFAULT_DB_PATH = 'corpus.sqlite'
+SPEECH_FIELDS = ['speech_id', 'file_name', 'year', 'date', 'fm_name', 'pm_name', 'parliament_term',
+                 'election_budget']
+CLASSIFICATION_FIELDS = ['category', 'promise_citizen', 'promise_firm', 'demand_citizen', 'demand_firm', 'neutral',
+                         'supportive_demand', 'framing_signal', 'reason']
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS speeches (
+        speech_id INTEGER PRIMARY KEY,
+        file_name TEXT NOT NULL UNIQUE,
+        year INTEGER NOT NULL,
+        date TEXT,
+        fm_name TEXT,
+        pm_name TEXT,
+        parliament_term INTEGER,
+        election_budget INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS idx_speeches_year ON speeches(year);
+
+    CREATE TABLE IF NOT EXISTS paragraphs (
+        id INTEGER PRIMARY KEY,
+        speech_id INTEGER NOT NULL REFERENCES speeches(speech_id),
+        segment_num INTEGER,
+        paragraph_id TEXT,
+        paragraph_num INTEGER,
+        paragraph_text TEXT NOT NULL,
+        paragraph_length INTEGER NOT NULL,
+        removed_by TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_paragraphs_speech ON paragraphs(speech_id, segment_num);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_paragraphs_id ON paragraphs(paragraph_id);
+
+    CREATE TABLE IF NOT EXISTS classifications (
+        paragraph_id TEXT PRIMARY KEY,
+        category TEXT NOT NULL,
+        promise_citizen INTEGER,
+        promise_firm INTEGER,
+        demand_citizen INTEGER,
+        demand_firm INTEGER,
+        neutral INTEGER,
+        supportive_demand INTEGER,
+        framing_signal TEXT,
+        reason TEXT
+    );
+'''
+
+# Paragraph rows in the CSV column order
+_PARAGRAPH_COLUMNS = '''
+    p.paragraph_text, p.paragraph_length, s.year, s.date, s.fm_name, s.pm_name, s.parliament_term,
+    s.election_budget, s.file_name
+'''
+
+
+class CorpusStore:
+    """The corpus database; every write method commits its own transaction."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def _delete_speech_paragraphs(self, speech_id):
+        self._conn.execute('DELETE FROM classifications WHERE paragraph_id IN '
+                           '(SELECT paragraph_id FROM paragraphs WHERE speech_id = ?)', (speech_id,))
+        self._conn.execute('DELETE FROM paragraphs WHERE speech_id = ?', (speech_id,))
+
+    # Writes
+
+    def replace_speech(self, metadata: dict, paragraphs: list):
+        """Store a speech's metadata row and its segmented paragraphs (not yet cleaned)."""
+        with self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO speeches ({', '.join(SPEECH_FIELDS)}) "
+                               f"VALUES ({', '.join('?' * len(SPEECH_FIELDS))})",
+                               [metadata[k] for k in SPEECH_FIELDS])
+            self._delete_speech_paragraphs(metadata['speech_id'])
+            self._conn.executemany(
+                'INSERT INTO paragraphs (speech_id, segment_num, paragraph_text, paragraph_length) VALUES (?, ?, ?, ?)',
+                [(metadata['speech_id'], p['paragraph_num'], p['paragraph_text'], p['paragraph_length'])
+                 for p in paragraphs],
+            )
+
+    def retain_speeches(self, file_names) -> int:
+        """Delete speeches (and their paragraphs) not in `file_names`. Returns how many went."""
+        keep = set(file_names)
+        gone = [row['speech_id'] for row in self._conn.execute('SELECT speech_id, file_name FROM speeches')
+                if row['file_name'] not in keep]
+        with self._conn:
+            for speech_id in gone:
+                self._delete_speech_paragraphs(speech_id)
+                self._conn.execute('DELETE FROM speeches WHERE speech_id = ?', (speech_id,))
+        return len(gone)
+
+    def save_cleaning(self, decisions):
+        """Record cleaning for every segmented paragraph.
+
+        `decisions` are (speech_id, segment_num, paragraph_num, removed_by):
+        kept paragraphs have a clean paragraph_num and removed_by None,
+        removed ones the other way round. Classifications of ids that end
+        up on a different paragraph (or none) are dropped with them.
+        """
+        with self._conn:
+            self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS previous_ids (id INTEGER PRIMARY KEY, paragraph_id TEXT)')
+            self._conn.execute('DELETE FROM previous_ids')
+            self._conn.execute('INSERT INTO previous_ids SELECT id, paragraph_id FROM paragraphs '
+                               'WHERE segment_num IS NOT NULL AND paragraph_id IS NOT NULL')
+            # Clear first: renumbering can move an id from one row to another
+            self._conn.execute('UPDATE paragraphs SET paragraph_id = NULL, paragraph_num = NULL, removed_by = NULL '
+                               'WHERE segment_num IS NOT NULL')
+            self._conn.executemany(
+                'UPDATE paragraphs SET paragraph_id = ?, paragraph_num = ?, removed_by = ? '
+                'WHERE speech_id = ? AND segment_num = ?',
+                [(f"{speech_id}_{num}" if num is not None else None, num, rule, speech_id, segment)
+                 for speech_id, segment, num, rule in decisions],
+            )
+            # A label belongs to the text it was given for, not to the id
+            self._conn.execute('DELETE FROM classifications WHERE paragraph_id IN ('
+                               'SELECT o.paragraph_id FROM previous_ids o JOIN paragraphs p USING (id) '
+                               'WHERE p.paragraph_id IS NOT o.paragraph_id)')
+
+    def import_clean(self, rows):
+        """Load clean-corpus CSV rows directly (no segmentation record)."""
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO paragraphs (speech_id, paragraph_id, paragraph_num, paragraph_text, '
+                'paragraph_length) VALUES (?, ?, ?, ?, ?)',
+                [(r['speech_id'], r['paragraph_id'], r['paragraph_num'], r['paragraph_text'], r['paragraph_length'])
+                 for r in rows],
+            )
+
+    def save_classifications(self, results):
+        """Insert or replace V9 result rows (keyed by paragraph_id)."""
+        columns = ['paragraph_id'] + CLASSIFICATION_FIELDS
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO classifications ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [[r[k] for k in columns] for r in results],
+            )
+
+    # Reads
+
+    def load_metadata(self) -> dict:
+        """Speech rows indexed by file name, like process_speeches_to_paragraphs.load_metadata()."""
+        return {row['file_name']: dict(row) for row in self._conn.execute(
+            f"SELECT {', '.join(SPEECH_FIELDS)} FROM speeches")}
+
+    def segments(self):
+        """Segmented paragraph rows, as process_speeches_to_paragraphs.py writes them."""
+        for row in self._conn.execute(f'''
+                SELECT p.speech_id || '_' || p.segment_num AS paragraph_id, p.speech_id,
+                       p.segment_num AS paragraph_num, {_PARAGRAPH_COLUMNS}
+                FROM paragraphs p JOIN speeches s USING (speech_id)
+                WHERE p.segment_num IS NOT NULL
+                ORDER BY s.file_name, p.segment_num'''):
+            yield dict(row)
+
+    def clean_paragraphs(self, year: int = None):
+        """Clean corpus rows (optionally one year), as budget_speeches_paragraphs_v3_clean.csv."""
+        where = 'WHERE p.paragraph_id IS NOT NULL' + (' AND s.year = ?' if year is not None else '')
+        for row in self._conn.execute(f'''
+                SELECT p.paragraph_id, p.speech_id, p.paragraph_num, {_PARAGRAPH_COLUMNS}
+                FROM paragraphs p JOIN speeches s USING (speech_id)
+                {where}
+                ORDER BY s.file_name, p.paragraph_num''', () if year is None else (year,)):
+            yield dict(row)
+
+    def classified_paragraphs(self, year: int = None):
+        """Classification rows joined with the full paragraph text and speech metadata, in corpus order."""
+        where = ' WHERE s.year = ?' if year is not None else ''
+        for row in self._conn.execute(f'''
+                SELECT c.paragraph_id, p.speech_id, p.paragraph_num, s.year, s.date, s.fm_name, s.pm_name,
+                       p.paragraph_text, p.paragraph_length, {', '.join('c.' + k for k in CLASSIFICATION_FIELDS)}
+                FROM classifications c
+                JOIN paragraphs p USING (paragraph_id)
+                JOIN speeches s USING (speech_id){where}
+                ORDER BY s.file_name, p.paragraph_num''', () if year is None else (year,)):
+            yield dict(row)
+
+    def year_counts(self) -> list:
+        """(year, speeches, clean paragraphs, classified paragraphs) per year."""
+        return [tuple(row) for row in self._conn.execute('''
+            SELECT s.year, COUNT(DISTINCT s.speech_id), COUNT(p.paragraph_id), COUNT(c.paragraph_id)
+            FROM speeches s
+            LEFT JOIN paragraphs p ON p.speech_id = s.speech_id
+            LEFT JOIN classifications c ON c.paragraph_id = p.paragraph_id
+            GROUP BY s.year ORDER BY s.year''')]
+
+
+def read_csv(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import into / inspect the SQLite corpus store")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    imp = sub.add_parser('import', help="load existing CSVs into the store")
+    imp.add_argument('db')
+    imp.add_argument('--metadata', required=True)
+    imp.add_argument('--clean', help="budget_speeches_paragraphs_v3_clean.csv")
+    imp.add_argument('--classifications', help="classification_results_full_corpus_v9.csv")
+
+    stats = sub.add_parser('stats')
+    stats.add_argument('db')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    store = CorpusStore(args.db)
+
+    print("="*60)
+    print(f"CORPUS STORE - {args.command.upper()}: {args.db}")
+    print("="*60)
+
+    if args.command == 'import':
+        metadata = read_csv(args.metadata)
+        clean = read_csv(args.clean) if args.clean else []
+        for row in metadata:
+            # Replaces the speech's paragraphs; the clean rows go in below
+            store.replace_speech(row, [])
+        store.import_clean(clean)
+        print(f"Speeches: {len(metadata):,} | Clean paragraphs: {len(clean):,}")
+        if args.classifications:
+            results = read_csv(args.classifications)
+            store.save_classifications(results)
+            print(f"Classifications: {len(results):,}")
+
+    print(f"\n{'year':>6} {'speeches':>9} {'paragraphs':>11} {'classified':>11}")
+    for year, speeches, paragraphs, classified in store.year_counts():
+        print(f"{year:>6} {speeches:>9,} {paragraphs:>11,} {classified:>11,}")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
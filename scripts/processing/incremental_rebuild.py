@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Incremental corpus rebuild driven by a file-hash manifest.
+
+A full rebuild re-segments every speech and re-cleans every paragraph. This
+script keeps a manifest (corpus_manifest.json) recording, for every speech
+file, its size, content hash and metadata row hash, plus how many rows it
+contributed to the paragraph and clean CSVs. On the next run:
+1. Unchanged speeches - rows are copied from the existing CSVs as they are
+2. New or changed speeches (content or metadata) - re-segmented and
+   re-cleaned, and their rows spliced in at the speech's place in
+   file-name order
+3. Speeches no longer in the corpus or metadata - rows dropped
+
+Paragraph ids are numbered within each speech, so splicing one speech never
+renumbers another; the output is the same as a full rebuild. A speech whose
+rows in the CSVs don't match the manifest counts is treated as changed.
+
+Cleaning runs straight on the segmented rows, the same way pipeline.py does.
+
+Usage:
+    python incremental_rebuild.py --corpus-dir corpus --metadata metadata.csv
+    python incremental_rebuild.py --corpus-dir corpus --metadata metadata.csv --dry-run
+    python incremental_rebuild.py --corpus-dir corpus --metadata metadata.csv --full
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from clean_corpus_v3 import renumber, should_remove
+from process_speeches_to_paragraphs import PARAGRAPH_FIELDS, load_metadata, segment_speeches
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def metadata_sha256(row: dict) -> str:
+    return hashlib.sha256(json.dumps(row, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_manifest(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest['files'] if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def save_manifest(path: str, files: dict):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def rows_by_file(path: str) -> dict:
+    """Existing CSV rows grouped by file_name (empty if the CSV doesn't exist)."""
+    grouped = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                grouped.setdefault(row['file_name'], []).append(row)
+    return grouped
+
+
+def write_rows(path: str, groups):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PARAGRAPH_FIELDS)
+        writer.writeheader()
+        for rows in groups:
+            writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def clean_speech(paragraphs: list) -> tuple:
+    """(kept and renumbered, removed) for one speech's segmented paragraphs."""
+    kept, removed = [], []
+    for para in paragraphs:
+        (removed if should_remove(para) else kept).append(dict(para))
+    return list(renumber(kept)), removed
+
+
+def plan(corpus_dir: Path, metadata: dict, manifest: dict, existing: dict, full: bool) -> tuple:
+    """Fingerprint every speech file; return (fingerprints, status per file name)."""
+    fingerprints, status = {}, {}
+    for file_path in sorted(corpus_dir.glob('*.txt')):
+        name = file_path.name
+        if name not in metadata:
+            print(f"Warning: No metadata found for {name}")
+            continue
+        entry = {
+            'size': file_path.stat().st_size,
+            'sha256': file_sha256(file_path),
+            'metadata_sha256': metadata_sha256(metadata[name]),
+        }
+        fingerprints[name] = entry
+        old = manifest.get(name)
+        if old is None:
+            status[name] = 'added'
+        elif full or any(old[k] != entry[k] for k in entry):
+            status[name] = 'changed'
+        elif any(len(existing[csv_name].get(name, [])) != old[count]
+                 for csv_name, count in (('paragraphs', 'paragraphs'), ('clean', 'clean'), ('removed', 'removed'))):
+            # The CSVs were rebuilt or edited behind the manifest's back
+            status[name] = 'stale'
+        else:
+            status[name] = 'unchanged'
+    return fingerprints, status
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rebuild the paragraph and clean CSVs for changed speeches only")
+    parser.add_argument('--corpus-dir', required=True, help="directory of speech .txt files")
+    parser.add_argument('--metadata', required=True)
+    parser.add_argument('--paragraphs', default='budget_speeches_paragraphs.csv')
+    parser.add_argument('--clean', default='budget_speeches_paragraphs_v3_clean.csv')
+    parser.add_argument('--removed', default='removed_paragraphs_v3.csv')
+    parser.add_argument('--manifest', default='corpus_manifest.json')
+    parser.add_argument('--workers', type=int, default=1, help="processes to segment changed speeches in")
+    parser.add_argument('--full', action='store_true', help="reprocess every speech")
+    parser.add_argument('--dry-run', action='store_true', help="report what would change without writing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+
+    print("="*60)
+    print("INCREMENTAL CORPUS REBUILD")
+    print("="*60)
+
+    metadata = load_metadata(args.metadata)
+    manifest = load_manifest(args.manifest)
+    existing = {
+        'paragraphs': rows_by_file(args.paragraphs),
+        'clean': rows_by_file(args.clean),
+        'removed': rows_by_file(args.removed),
+    }
+    fingerprints, status = plan(Path(args.corpus_dir), metadata, manifest, existing, args.full)
+    dropped = sorted(set(manifest) - set(fingerprints))
+
+    todo = [name for name in fingerprints if status[name] != 'unchanged']
+    counts = {s: sum(1 for v in status.values() if v == s) for s in ('unchanged', 'added', 'changed', 'stale')}
+    print(f"Manifest: {len(manifest)} speeches | Corpus: {len(fingerprints)} speeches")
+    print(f"Unchanged: {counts['unchanged']} | Added: {counts['added']} | Changed: {counts['changed']} | "
+          f"Out of sync with CSVs: {counts['stale']} | Dropped: {len(dropped)}")
+
+    if args.dry_run:
+        for name in todo:
+            print(f"  {status[name]:>9}  {name}")
+        for name in dropped:
+            print(f"  {'dropped':>9}  {name}")
+        return
+
+    jobs = [(Path(args.corpus_dir) / name, metadata[name]) for name in todo]
+    rebuilt = {}
+    for name, paragraphs in zip(todo, segment_speeches(jobs, args.workers)):
+        kept, removed = clean_speech(paragraphs)
+        rebuilt[name] = {'paragraphs': paragraphs, 'clean': kept, 'removed': removed}
+
+    def groups(csv_name):
+        for name in fingerprints:
+            yield rebuilt[name][csv_name] if name in rebuilt else existing[csv_name].get(name, [])
+
+    write_rows(args.paragraphs, groups('paragraphs'))
+    write_rows(args.clean, groups('clean'))
+    write_rows(args.removed, groups('removed'))
+
+    files = {}
+    for name, entry in fingerprints.items():
+        rows = rebuilt.get(name) or {k: existing[k].get(name, []) for k in existing}
+        files[name] = dict(entry, **{k: len(v) for k, v in rows.items()})
+    save_manifest(args.manifest, files)
+
+    print(f"\n{'='*60}")
+    print("CHANGES")
+    print(f"{'='*60}")
+    if not todo and not dropped:
+        print("Nothing to do - every speech is up to date")
+    for name in todo:
+        old = manifest.get(name, {})
+        new = files[name]
+        print(f"{status[name]:>9}  {name}: paragraphs {old.get('paragraphs', 0)} -> {new['paragraphs']}, "
+              f"clean {old.get('clean', 0)} -> {new['clean']}")
+    for name in dropped:
+        print(f"{'dropped':>9}  {name}: {manifest[name]['paragraphs']} paragraphs, {manifest[name]['clean']} clean")
+
+    total = {k: sum(f[k] for f in files.values()) for k in ('paragraphs', 'clean', 'removed')}
+    print(f"\nReprocessed {len(todo)} of {len(fingerprints)} speeches in {time.perf_counter() - start:.1f}s")
+    print(f"Paragraphs: {total['paragraphs']:,} -> {args.paragraphs}")
+    print(f"Clean: {total['clean']:,} -> {args.clean}")
+    print(f"Removed: {total['removed']:,} -> {args.removed}")
+    print(f"Manifest: {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
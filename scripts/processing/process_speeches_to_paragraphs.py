@@ -7,12 +7,50 @@ This script:
 2. Splits long paragraphs (> 800 chars) at sentence boundaries
 3. Merges lines that don't end with proper punctuation
 4. Preserves all metadata for each paragraph
+
+Speech files are independent, so --workers N segments them in a process pool;
+results come back in sorted file-name order, so the output CSV is
+byte-identical to a serial run.
+
+--db also stores the speeches and paragraphs in the SQLite corpus store
+(see corpus_store.py); without --output, no CSV is written.
+
+Paragraphs are written as each speech finishes and the length statistics
+are streamed (see streaming_stats.py), so memory doesn't grow with the
+corpus. --by-year / --by-speech add per-year and per-speech breakdowns.
+
+Usage:
+    python process_speeches_to_paragraphs.py --corpus-dir corpus --metadata metadata.csv \
+        --output budget_speeches_paragraphs.csv --workers 8
 """
 
+import argparse
 import csv
+import os
 import re
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from corpus_store import CorpusStore
+from streaming_stats import GroupedStats, StreamingStats, print_breakdown, print_length_summary
+
+PARAGRAPH_FIELDS = [
+    'paragraph_id',
+    'speech_id',
+    'paragraph_num',
+    'paragraph_text',
+    'paragraph_length',
+    'year',
+    'date',
+    'fm_name',
+    'pm_name',
+    'parliament_term',
+    'election_budget',
+    'file_name'
+]
 
 
 def load_metadata(metadata_path: str) -> Dict[str, Dict]:
@@ -34,30 +72,70 @@ def ends_with_sentence_terminator(text: str) -> bool:
     return text[-1] in '.!?;:' or text.endswith('...')
 
 
-def find_sentence_break(text: str, target_pos: int) -> int:
+SENTENCE_END = re.compile(r'[.!?]+\s')
+
+
+def sentence_break_index(text: str) -> List[int]:
+    """Offsets just after every sentence terminator (and its following space), ascending."""
+    return [match.end() for match in SENTENCE_END.finditer(text)]
+
+
+def find_sentence_break(breaks: List[int], start: int, end: int, target: int, window: int = 200) -> int:
     """
     Find a good sentence break near the target position.
     Returns position after the sentence terminator.
+
+    `breaks` is sentence_break_index() of the whole paragraph; `start`/`end`
+    bound the text still to be split, and `target` is an absolute offset.
+    Only breaks whose terminator lies within +/- `window` chars of the target
+    count; the closest one wins, the earlier one on a tie.
     """
-    # Look for sentence terminators near the target position
-    # Search within +/- 200 chars of target
-    search_start = max(0, target_pos - 200)
-    search_end = min(len(text), target_pos + 200)
-    search_region = text[search_start:search_end]
-
-    # Find all sentence terminators in the region
-    terminators = []
-    for match in re.finditer(r'[.!?]+\s', search_region):
-        pos = search_start + match.end()
-        terminators.append(pos)
-
-    if not terminators:
+    low = max(start, target - window)
+    high = min(end, target + window)
+
+    i = bisect_left(breaks, target)
+    candidates = []
+    # The terminator itself (2 chars before the break) must be inside the window
+    if i > 0 and breaks[i - 1] - 2 >= low:
+        candidates.append(breaks[i - 1])
+    if i < len(breaks) and breaks[i] <= high:
+        candidates.append(breaks[i])
+
+    if not candidates:
         # No good break found, return target
-        return target_pos
+        return target
 
     # Find the terminator closest to target
-    closest = min(terminators, key=lambda x: abs(x - target_pos))
-    return closest
+    return min(candidates, key=lambda x: abs(x - target))
+
+
+def split_long_paragraph(para: str, max_length: int = 800) -> List[str]:
+    """Split a paragraph into chunks of about max_length chars at sentence boundaries.
+
+    Sentence breaks are indexed once and each split point found by binary
+    search, so this is linear in the paragraph length.
+    """
+    chunks = []
+    breaks = sentence_break_index(para)
+    start, end = 0, len(para)
+    while end - start > max_length:
+        # Find a good break point around max_length chars in
+        break_pos = find_sentence_break(breaks, start, end, start + max_length)
+
+        # Extract the chunk
+        chunk = para[start:break_pos].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        # Continue with the rest, skipping the whitespace between chunks
+        start = break_pos
+        while start < end and para[start].isspace():
+            start += 1
+
+    # Add the final chunk
+    if start < end:
+        chunks.append(para[start:end])
+    return chunks
 
 
 def process_lines_to_paragraphs(lines: List[str]) -> List[str]:
@@ -101,22 +179,7 @@ def process_lines_to_paragraphs(lines: List[str]) -> List[str]:
             final_paragraphs.append(para)
         else:
             # Split at sentence boundaries
-            remaining = para
-            while len(remaining) > 800:
-                # Find a good break point around position 800
-                break_pos = find_sentence_break(remaining, 800)
-
-                # Extract the chunk
-                chunk = remaining[:break_pos].strip()
-                if chunk:
-                    final_paragraphs.append(chunk)
-
-                # Continue with the rest
-                remaining = remaining[break_pos:].strip()
-
-            # Add the final chunk
-            if remaining:
-                final_paragraphs.append(remaining)
+            final_paragraphs.extend(split_long_paragraph(para))
 
     # Filter out very short paragraphs (likely artifacts)
     final_paragraphs = [p for p in final_paragraphs if len(p) > 10]
@@ -155,74 +218,123 @@ def process_speech_file(file_path: Path, metadata: Dict) -> List[Dict]:
     return results
 
 
+def _process_job(job: Tuple[Path, Dict]) -> List[Dict]:
+    return process_speech_file(*job)
+
+
+def segment_speeches(jobs: Iterable[Tuple[Path, Dict]], workers: int = 1) -> Iterator[List[Dict]]:
+    """Yield process_speech_file() results for (file_path, metadata) jobs, in job order.
+
+    With workers > 1 the files are segmented in a process pool; at most a few
+    files per worker are in flight, so memory stays bounded.
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield _process_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for job in jobs:
+            in_flight.append(pool.submit(_process_job, job))
+            if len(in_flight) >= workers * 4:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Segment budget speeches into paragraphs")
+    parser.add_argument('--corpus-dir', default='/Users/wongpeiting/Desktop/CU/python-work/budget-strict/corpus')
+    parser.add_argument('--metadata', default='/Users/wongpeiting/Desktop/CU/python-work/budget-strict/metadata.csv')
+    parser.add_argument('--output', help="paragraph CSV (default: budget_speeches_paragraphs.csv unless --db)")
+    parser.add_argument('--db', help="also store speeches and paragraphs in this corpus store (see corpus_store.py)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f"processes to segment speeches in (default: 1; this machine has {os.cpu_count()} CPUs)")
+    parser.add_argument('--quiet', action='store_true', help="skip the per-file progress lines")
+    parser.add_argument('--by-year', action='store_true', help="also print paragraph statistics per year")
+    parser.add_argument('--by-speech', action='store_true', help="also print paragraph statistics per speech")
+    args = parser.parse_args()
+    if args.output is None and not args.db:
+        args.output = '/Users/wongpeiting/Desktop/CU/python-work/budget_in_one_chart/budget_speeches_paragraphs.csv'
+    return args
+
+
 def main():
     """Main processing function."""
+    args = parse_args()
+
     # Paths
-    corpus_dir = Path('/Users/wongpeiting/Desktop/CU/python-work/budget-strict/corpus')
-    metadata_path = Path('/Users/wongpeiting/Desktop/CU/python-work/budget-strict/metadata.csv')
-    output_path = Path('/Users/wongpeiting/Desktop/CU/python-work/budget_in_one_chart/budget_speeches_paragraphs.csv')
+    corpus_dir = Path(args.corpus_dir)
+    metadata_path = Path(args.metadata)
+    output_path = Path(args.output) if args.output else None
+    store = CorpusStore(args.db) if args.db else None
 
     # Load metadata
     print("Loading metadata...")
     metadata = load_metadata(metadata_path)
     print(f"Loaded metadata for {len(metadata)} speeches")
 
-    # Process all speeches
-    all_paragraphs = []
+    # Process all speeches, writing rows and collecting statistics as they stream past
+    lengths = StreamingStats()
+    by_year = GroupedStats()
+    by_speech = GroupedStats(k=32)
 
     speech_files = sorted(corpus_dir.glob('*.txt'))
-    print(f"\nProcessing {len(speech_files)} speech files...")
-
-    for i, file_path in enumerate(speech_files, 1):
-        file_name = file_path.name
+    print(f"\nProcessing {len(speech_files)} speech files" +
+          (f" with {args.workers} workers..." if args.workers > 1 else "..."))
 
-        if file_name not in metadata:
-            print(f"Warning: No metadata found for {file_name}")
+    jobs = []
+    for file_path in speech_files:
+        if file_path.name not in metadata:
+            print(f"Warning: No metadata found for {file_path.name}")
             continue
+        jobs.append((file_path, metadata[file_path.name]))
 
-        print(f"[{i}/{len(speech_files)}] Processing {file_name}...")
-
-        # Process the speech
-        paragraphs = process_speech_file(file_path, metadata[file_name])
-        all_paragraphs.extend(paragraphs)
-
-        print(f"  -> Generated {len(paragraphs)} paragraphs")
-
-    # Write output CSV
-    print(f"\nWriting {len(all_paragraphs)} paragraphs to {output_path}...")
-
-    fieldnames = [
-        'paragraph_id',
-        'speech_id',
-        'paragraph_num',
-        'paragraph_text',
-        'paragraph_length',
-        'year',
-        'date',
-        'fm_name',
-        'pm_name',
-        'parliament_term',
-        'election_budget',
-        'file_name'
-    ]
-
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    output_file = open(output_path, 'w', encoding='utf-8', newline='') if output_path else None
+    if output_file:
+        print(f"Writing paragraphs to {output_path}...")
+        writer = csv.DictWriter(output_file, fieldnames=PARAGRAPH_FIELDS)
         writer.writeheader()
-        writer.writerows(all_paragraphs)
+
+    for i, ((file_path, _), paragraphs) in enumerate(zip(jobs, segment_speeches(jobs, args.workers)), 1):
+        if output_file:
+            writer.writerows(paragraphs)
+        if store:
+            store.replace_speech(metadata[file_path.name], paragraphs)
+        for para in paragraphs:
+            lengths.add(para['paragraph_length'])
+            by_year.add(para['year'], para['paragraph_length'])
+            by_speech.add(para['speech_id'], para['paragraph_length'])
+        if not args.quiet:
+            print(f"[{i}/{len(jobs)}] Processing {file_path.name}...")
+            print(f"  -> Generated {len(paragraphs)} paragraphs")
+
+    if output_file:
+        output_file.close()
+        print(f"\nWrote {lengths.count} paragraphs to {output_path}")
+
+    if store:
+        dropped = store.retain_speeches(file_path.name for file_path, _ in jobs)
+        store.close()
+        print(f"\nStored {len(jobs)} speeches and {lengths.count} paragraphs in {args.db}" +
+              (f" ({dropped} speeches no longer in the corpus removed)" if dropped else ""))
 
     print(f"\nProcessing complete!")
     print(f"Total speeches processed: {len(speech_files)}")
-    print(f"Total paragraphs generated: {len(all_paragraphs)}")
-    print(f"Average paragraphs per speech: {len(all_paragraphs) / len(speech_files):.1f}")
+    print(f"Total paragraphs generated: {lengths.count}")
+    print(f"Average paragraphs per speech: {lengths.count / len(speech_files):.1f}")
 
     # Print some statistics
-    lengths = [p['paragraph_length'] for p in all_paragraphs]
     print(f"\nParagraph length statistics:")
-    print(f"  Min: {min(lengths)} characters")
-    print(f"  Max: {max(lengths)} characters")
-    print(f"  Average: {sum(lengths) / len(lengths):.1f} characters")
-    print(f"  Median: {sorted(lengths)[len(lengths) // 2]} characters")
+    print_length_summary(lengths)
+
+    if args.by_year:
+        print(f"\nBy year:")
+        print_breakdown(by_year, 'year')
+    if args.by_speech:
+        print(f"\nBy speech:")
+        print_breakdown(by_speech, 'speech')
 
 
 if __name__ == '__main__':
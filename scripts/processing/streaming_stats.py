@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Constant-memory streaming statistics for corpus reports.
+
+StreamingStats keeps count/min/max/mean exactly and quantiles (median,
+p90, ...) in a KLL sketch, in one pass over the values. Memory is bounded
+by the sketch size (about 1.5k values at the default k=512), however long
+the stream is; quantile rank error is a fraction of a percent. Up to k
+values, quantiles are exact: the median is sorted(lengths)[n // 2], as the
+reports used to compute it.
+
+GroupedStats keeps one StreamingStats per key (year, speech), with a
+smaller sketch each, for per-year and per-speech breakdowns.
+
+Used by the report printouts in process_speeches_to_paragraphs.py,
+clean_corpus_v3.py and pipeline.py.
+"""
+
+import math
+import random
+
+
+class KLLSketch:
+    """KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Values go into level 0. When a level fills, it is sorted and every other
+    value (random offset) moves up a level with twice the weight. Lower
+    levels get geometrically smaller capacities, so the total size stays
+    O(k). The offsets come from a seeded generator, so reports repeat exactly.
+    """
+
+    def __init__(self, k: int = 512, c: float = 2 / 3, seed: int = 0):
+        self.k = k
+        self.c = c
+        self._rng = random.Random(seed)
+        self.levels = [[]]
+        self.size = 0
+        self.max_size = self._capacity(0)
+
+    def _capacity(self, level: int) -> int:
+        height = len(self.levels) - level - 1
+        return int(math.ceil(self.k * self.c ** height)) + 1
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def _compress(self):
+        for level in range(len(self.levels)):
+            if len(self.levels[level]) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                    self.max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+                items = sorted(self.levels[level])
+                self.levels[level] = []
+                self.levels[level + 1].extend(items[self._rng.random() < 0.5::2])
+                self.size = sum(len(items) for items in self.levels)
+                if self.size < self.max_size:
+                    break
+
+    def quantile(self, q: float):
+        """The value at rank q (0..1); the upper median for q=0.5, like sorted(v)[n // 2]."""
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        if not weighted:
+            return None
+        target = q * sum(weight for _, weight in weighted)
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen > target:
+                return value
+        return weighted[-1][0]
+
+
+class StreamingStats:
+    """count/min/max/mean (exact) and quantiles (sketched) of a stream of numbers."""
+
+    def __init__(self, k: int = 512):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sketch = KLLSketch(k)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float):
+        return self.sketch.quantile(q)
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+
+class GroupedStats:
+    """One StreamingStats per key, e.g. per year or per speech."""
+
+    def __init__(self, k: int = 64):
+        self.k = k
+        self.groups = {}
+
+    def add(self, key, value):
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = StreamingStats(self.k)
+        stats.add(value)
+
+    def items(self):
+        return sorted(self.groups.items(), key=lambda kv: _sort_key(kv[0]))
+
+
+def _sort_key(key):
+    # Numeric keys (years, speech ids read back from CSV as text) in numeric order
+    try:
+        return 0, int(key), ''
+    except (TypeError, ValueError):
+        return 1, 0, str(key)
+
+
+def print_length_summary(stats: StreamingStats, unit: str = 'characters', indent: str = '  '):
+    """The Min/Max/Average/Median block the processing scripts print."""
+    print(f"{indent}Min: {stats.min} {unit}")
+    print(f"{indent}Max: {stats.max} {unit}")
+    print(f"{indent}Average: {stats.mean:.1f} {unit}")
+    print(f"{indent}Median: {stats.median} {unit}")
+    print(f"{indent}p90 / p99: {stats.quantile(0.9)} / {stats.quantile(0.99)} {unit}")
+
+
+def print_breakdown(grouped: GroupedStats, label: str):
+    """Per-group paragraph count and length table."""
+    print(f"{label:>10} {'paragraphs':>11} {'min':>6} {'median':>7} {'mean':>7} {'p90':>6} {'max':>6}")
+    for key, stats in grouped.items():
+        print(f"{key:>10} {stats.count:>11,} {stats.min:>6} {stats.median:>7} {stats.mean:>7.1f} "
+              f"{stats.quantile(0.9):>6} {stats.max:>6}")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic budget-speech corpus for benchmarking.
+
+Writes speech .txt files plus a matching metadata.csv, shaped like the real
+67-speech corpus:
+1. ~175 paragraphs per speech, 1-8 sentences each, hard-wrapped into
+   60-100 character lines like the OCR'd originals
+2. Section headers ("Revenue, 1987", "Tax Changes") and procedure text
+   ("Mr Speaker, Sir, I beg to move")
+3. Tables ("1986 - 51,272", "From     To") and list items ("(a)")
+4. The occasional long appendix block with no blank lines
+
+Each speech is seeded from (seed, speech number), so a given scale always
+produces the same files. benchmark_segmentation.py and ../benchmark_suite.py
+generate their corpora with it.
+
+Usage:
+    python synthetic_corpus.py synthetic_100x --scale 100
+    python synthetic_corpus.py synthetic_1x --speeches 67
+"""
+
+import argparse
+import csv
+import random
+from pathlib import Path
+
+REAL_SPEECHES = 67
+
+WORDS = (
+    "the government will continue to support households firms workers seniors families our people "
+    "Singapore economy budget revenue expenditure growth productivity skills training housing healthcare "
+    "reserves fiscal prudence investment companies enterprises sectors infrastructure transport schools "
+    "we must raise improve strengthen ensure provide help enable adapt transform innovate compete "
+    "this year next years decade future stability resilience opportunities challenges global regional "
+    "tax rebate subsidy scheme grant fund committee review measures policy rates duty levy "
+    "and of in for to with on by as at from a an our their all more new"
+).split()
+
+FM_NAMES = ['Goh Keng Swee', 'Lim Kim San', 'Hon Sui Sen', 'Tony Tan', 'Richard Hu',
+            'Lee Hsien Loong', 'Tharman Shanmugaratnam', 'Heng Swee Keat', 'Lawrence Wong']
+PM_NAMES = ['Lee Kuan Yew', 'Goh Chok Tong', 'Lee Hsien Loong', 'Lawrence Wong']
+SECTION_HEADERS = ['Revenue, {year}', 'Expenditure, {year}', 'Tax Changes', 'Tax Measures',
+                   'Economic Outlook', 'Fiscal Policy', 'Conclusion', 'Introduction', '4-Room Flats',
+                   'Duty on Petroleum', 'Helping Families', 'Building Our Future Together']
+
+
+def sentence(rng) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 30))]
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words)), f"${rng.randint(1, 999)} million")
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + rng.choice('.....;!?')
+
+
+def wrap(text: str, rng) -> list:
+    """Hard-wrap into OCR-like lines of 60-100 characters."""
+    lines, current = [], ''
+    width = rng.randint(60, 100)
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+            width = rng.randint(60, 100)
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def table(rng, year: int) -> list:
+    if rng.random() < 0.5:
+        return [f"{year - k}  ...  ${rng.randint(100, 9999):,} million" for k in range(rng.randint(2, 6))]
+    rows = ['From     To'] if rng.random() < 0.5 else ['Present     Proposed']
+    rows += [f"{year - k} - {rng.randint(1000, 99999):,}" for k in range(rng.randint(2, 8))]
+    return rows
+
+
+def speech_lines(rng, year: int) -> list:
+    lines = ["Mr Speaker, Sir, I beg to move, That Parliament approves the financial policy "
+             "of the Government.", ""]
+    for _ in range(rng.randint(120, 230)):
+        r = rng.random()
+        if r < 0.05:
+            block = [rng.choice(SECTION_HEADERS).format(year=year)]
+        elif r < 0.08:
+            block = table(rng, year)
+        elif r < 0.10:
+            block = [f"({rng.choice('abcdefg')})"] + wrap(sentence(rng), rng)
+        elif r < 0.105:
+            # Appendix-style block: many sentences, no blank lines
+            block = wrap(' '.join(sentence(rng) for _ in range(rng.randint(20, 60))), rng)
+        else:
+            block = wrap(' '.join(sentence(rng) for _ in range(rng.randint(1, 8))), rng)
+        lines.extend(block)
+        lines.append('')
+    lines.append("Sir, I beg to move.")
+    return lines
+
+
+def generate(output_dir, speeches: int, seed: int = 0) -> Path:
+    """Write `speeches` speech files and metadata.csv into output_dir. Returns its path."""
+    output_dir = Path(output_dir)
+    corpus_dir = output_dir / 'corpus'
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+
+    metadata = []
+    for n in range(1, speeches + 1):
+        rng = random.Random(f"{seed}-{n}")
+        year = 1965 + (n - 1) % 62
+        file_name = f"{year}_budget_{n:05d}.txt"
+        with open(corpus_dir / file_name, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(speech_lines(rng, year)) + '\n')
+        metadata.append({
+            'file_name': file_name,
+            'speech_id': n,
+            'year': year,
+            'date': f"{year}-{rng.randint(2, 3):02d}-{rng.randint(1, 28):02d}",
+            'fm_name': FM_NAMES[min(len(FM_NAMES) - 1, (year - 1965) // 7)],
+            'pm_name': PM_NAMES[0 if year < 1991 else 1 if year < 2004 else 2 if year < 2024 else 3],
+            'parliament_term': 1 + (year - 1965) // 5,
+            'election_budget': int(year % 5 == 0),
+        })
+
+    with open(output_dir / 'metadata.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=metadata[0].keys())
+        writer.writeheader()
+        writer.writerows(metadata)
+    return output_dir
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic budget-speech corpus")
+    parser.add_argument('output_dir')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help=f"multiple of the real corpus ({REAL_SPEECHES} speeches; default: 1)")
+    parser.add_argument('--speeches', type=int, help="exact number of speeches (overrides --scale)")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    speeches = args.speeches or max(1, round(REAL_SPEECHES * args.scale))
+    output_dir = generate(args.output_dir, speeches, args.seed)
+    size = sum(p.stat().st_size for p in (output_dir / 'corpus').glob('*.txt'))
+    print(f"Wrote {speeches:,} speeches ({size/1e6:.1f} MB) to {output_dir / 'corpus'}")
+    print(f"Metadata: {output_dir / 'metadata.csv'}")
+
+
+if __name__ == '__main__':
+    main()
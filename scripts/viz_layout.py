@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Precompute the page's dot layout (layout.bin and the manifest's year spans).
+
+The page used to group every dot by year and type on each load to find its
+place in the chart. Most of that is the same for every visitor, so it is
+done here once, with the page's own rules:
+1. Years get widths in proportion to min(dots, max columns), scaled to fill
+   the chart. As fractions of the chart width these spans don't depend on
+   the width, only on the breakpoint (dot size, gap, max columns)
+2. Within its year, each dot gets a slot: promises stack up from the
+   baseline, obligations down; citizen dots take the first slots, firm dots
+   the ones after them, each in paragraph order. Slots are the same at every
+   breakpoint
+
+The page only works out how many columns fit in each year's span at the
+actual width (one division per year), then places a dot from its slot:
+column = slot % cols, row = slot / cols.
+
+layout.bin holds Uint16 slot[n], little-endian, in dots.bin row order. Year
+spans ([year, start, center, end] as fractions of the chart width, between
+the margins) go in the manifest, under "layout", per breakpoint.
+
+generate_viz_data_from_v9.py --shard-dir runs this; run it directly to
+redo the layout of an existing shard directory, e.g. after changing
+BREAKPOINTS.
+
+Usage:
+    python scripts/viz_layout.py data/viz
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+from array import array
+
+# Must match getResponsiveConfig() in script.js
+BREAKPOINTS = [
+    {'name': 'small', 'max_width': 480, 'dot_size': 2.2, 'dot_gap': 0.3, 'max_cols': 4},
+    {'name': 'mobile', 'max_width': 768, 'dot_size': 2.8, 'dot_gap': 0.4, 'max_cols': 5},
+    {'name': 'desktop', 'max_width': None, 'dot_size': 3.3, 'dot_gap': 0.6, 'max_cols': 6},
+]
+YEAR_GAP = 2
+
+
+def dot_count(counts: dict) -> int:
+    return sum(counts['promise'].values()) + sum(counts['obligation'].values())
+
+
+def year_spans(bp: dict, years: list) -> list:
+    """[year, start, center, end] per year with dots, as fractions of the chart width (initVisualization())."""
+    step = bp['dot_size'] + bp['dot_gap']
+    widths = [(y['year'], min(dot_count(y['counts']), bp['max_cols']) * step + YEAR_GAP)
+              for y in years if dot_count(y['counts']) > 0]
+    total = sum(width for _, width in widths)
+    spans, x = [], 0
+    for year, width in widths:
+        spans.append([year, round(x / total, 9), round((x + width / 2) / total, 9),
+                      round((x + width - YEAR_GAP) / total, 9)])
+        x += width
+    return spans
+
+
+def dot_slots(years: list, year_column, category_column, categories: list):
+    """Each dot's slot in its year's promise or obligation grid: citizen first, then firm, in row order."""
+    next_slot = {y['year']: {'promise': {'citizen': 0, 'firm': y['counts']['promise']['citizen']},
+                             'obligation': {'citizen': 0, 'firm': y['counts']['obligation']['citizen']}}
+                 for y in years}
+    slots = array('H')
+    for year, code in zip(year_column, category_column):
+        primary_type, primary_value = categories[code]
+        slot = next_slot[year][primary_type][primary_value]
+        if slot > 0xFFFF:
+            raise ValueError(f"{year} has more than 65,536 {primary_type} dots; layout.bin codes slots in a Uint16")
+        next_slot[year][primary_type][primary_value] += 1
+        slots.append(slot)
+    return slots
+
+
+def write_layout(shard_dir: str, manifest: dict, year_column, category_column) -> dict:
+    """Write layout.bin for dots.bin's rows; returns the manifest's "layout" entry."""
+    slots = dot_slots(manifest['years'], year_column, category_column, manifest['dots']['categories'])
+    if sys.byteorder == 'big':
+        slots.byteswap()
+    with open(os.path.join(shard_dir, 'layout.bin'), 'wb') as f:
+        slots.tofile(f)
+    return {'path': 'layout.bin', 'count': len(slots), 'year_gap': YEAR_GAP,
+            'breakpoints': [{'name': bp['name'], 'max_width': bp['max_width'], 'years': year_spans(bp, manifest['years'])}
+                            for bp in BREAKPOINTS]}
+
+
+def read_dots(shard_dir: str, manifest: dict) -> tuple:
+    """(year column, category column) from dots.bin."""
+    with open(os.path.join(shard_dir, manifest['dots']['path']), 'rb') as f:
+        magic, count = struct.unpack('<4sI', f.read(8))
+        if magic != b'BVZ1' or count != manifest['dots']['count']:
+            raise ValueError("dots.bin does not match manifest.json")
+        years, speech_ids, categories = array('H'), array('H'), array('B')
+        years.fromfile(f, count)
+        speech_ids.fromfile(f, count)
+        categories.fromfile(f, count)
+    if sys.byteorder == 'big':
+        years.byteswap()
+    return years, categories
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Precompute dot slots and per-breakpoint year spans for the page")
+    parser.add_argument('shard_dir', help="directory with manifest.json and dots.bin (generate_viz_data_from_v9.py)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    manifest_path = os.path.join(args.shard_dir, 'manifest.json')
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest['layout'] = write_layout(args.shard_dir, manifest, *read_dots(args.shard_dir, manifest))
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+
+    print(f"Layout: {manifest['layout']['count']:,} dots, year spans for {len(BREAKPOINTS)} breakpoints "
+          f"({', '.join(bp['name'] for bp in BREAKPOINTS)}) -> {os.path.join(args.shard_dir, 'layout.bin')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+"""Put the scripts' directories on sys.path, as the scripts do for their sibling imports."""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+for directory in (SCRIPTS_DIR, SCRIPTS_DIR / 'processing', SCRIPTS_DIR / 'classification'):
+    sys.path.insert(0, str(directory))
@@ -0,0 +1,66 @@
+import pytest
+
+from batching import format_batch_prompt, parse_batch_response, parse_block
+
+BATCH = [(10, 'first paragraph'), (11, 'second paragraph'), (12, 'third paragraph')]
+
+
+def block(tag, promise_citizen='1', reason='cash support for households'):
+    return (f"[{tag}]\npromise_citizen: {promise_citizen}\npromise_firm: 0\ndemand_citizen: 0\n"
+            f"demand_firm: 0\nneutral: 0\nsupportive_demand: 0\nframing_signal: none\nreason: {reason}\n")
+
+
+def test_parse_block_reads_all_fields():
+    parsed = parse_block(block('P1').split('\n', 1)[1])
+    assert parsed['promise_citizen'] == 1
+    assert parsed['neutral'] == 0
+    assert parsed['framing_signal'] == 'none'
+    assert parsed['reason'] == 'cash support for households'
+
+
+def test_parse_block_accepts_bracketed_values():
+    assert parse_block(block('P1', promise_citizen='[1]'))['promise_citizen'] == 1
+
+
+def test_parse_block_rejects_missing_or_invalid_fields():
+    assert parse_block(block('P1').replace('reason: cash support for households\n', '')) is None
+    assert parse_block(block('P1', promise_citizen='yes')) is None
+    assert parse_block(block('P1', promise_citizen='2')) is None
+
+
+def test_batch_prompt_tags_items_in_order():
+    prompt = format_batch_prompt(BATCH)
+    assert prompt.index('<<<P1>>>') < prompt.index('<<<P2>>>') < prompt.index('<<<P3>>>')
+    assert '<<<P4>>>' not in prompt
+
+
+def test_parse_batch_response_maps_tags_to_items():
+    predictions, missing = parse_batch_response(block('P1') + block('P2') + block('P3'), BATCH)
+    assert sorted(predictions) == [10, 11, 12]
+    assert missing == []
+
+
+def test_parse_batch_response_reports_dropped_items():
+    predictions, missing = parse_batch_response(block('P1') + block('P3'), BATCH)
+    assert sorted(predictions) == [10, 12]
+    assert missing == [(11, 'second paragraph')]
+
+
+def test_parse_batch_response_keeps_first_valid_duplicate():
+    text = block('P1', promise_citizen='x') + block('P1', reason='first valid') + block('P1', reason='later')
+    predictions, missing = parse_batch_response(text + block('P2'), BATCH)
+    assert predictions[10]['reason'] == 'first valid'
+    assert missing == [(12, 'third paragraph')]
+
+
+def test_parse_batch_response_ignores_out_of_range_tags():
+    predictions, missing = parse_batch_response(block('P0') + block('P2') + block('P4'), BATCH)
+    assert sorted(predictions) == [11]
+    assert missing == [(10, 'first paragraph'), (12, 'third paragraph')]
+
+
+def test_parse_batch_response_raises_when_no_block_parses():
+    with pytest.raises(ValueError):
+        parse_batch_response('Sorry, I cannot help with that.', BATCH)
+    with pytest.raises(ValueError):
+        parse_batch_response(block('P7') + block('P1', promise_citizen='maybe'), BATCH)
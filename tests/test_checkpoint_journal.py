@@ -0,0 +1,75 @@
+import csv
+import json
+
+import pytest
+
+from checkpoint_journal import RESULT_FIELDS, CheckpointJournal, compact
+
+
+def line(paragraph_id):
+    return json.dumps({'paragraph_id': paragraph_id, 'category': 'neutral'}) + '\n'
+
+
+def test_load_skips_blank_lines(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    content = line('a') + '\n' + line('b') + '  \n' + line('c')
+    path.write_text(content)
+
+    assert list(CheckpointJournal(str(path)).load()) == ['a', 'b', 'c']
+    assert path.read_text() == content
+
+
+def test_load_trims_torn_last_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text(line('a') + line('b') + '{"paragraph_id": "c", "cat')
+
+    journal = CheckpointJournal(str(path))
+    assert list(journal.load()) == ['a', 'b']
+    assert path.read_text() == line('a') + line('b')
+
+    journal.append({'paragraph_id': 'c', 'category': 'neutral'})
+    journal.close()
+    assert list(CheckpointJournal(str(path)).load()) == ['a', 'b', 'c']
+
+
+def test_load_trims_unterminated_last_record(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text(line('a') + line('b').rstrip('\n'))
+
+    assert list(CheckpointJournal(str(path)).load()) == ['a']
+    assert path.read_text() == line('a')
+
+
+def test_load_refuses_corrupt_line_mid_file(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    content = line('a') + '{"paragraph_id": "b", "cat\n' + line('c')
+    path.write_text(content)
+
+    with pytest.raises(ValueError, match='line 2'):
+        CheckpointJournal(str(path)).load()
+    assert path.read_text() == content
+
+
+def test_compact_writes_corpus_order_and_last_record(tmp_path):
+    output = tmp_path / 'results.csv'
+    records = {'b': {'paragraph_id': 'b', 'category': 'promise_firm'},
+               'a': {'paragraph_id': 'a', 'category': 'neutral'}}
+    corpus = [{'paragraph_id': 'a'}, {'paragraph_id': 'x'}, {'paragraph_id': 'b'}]
+
+    rows = compact(records, corpus, str(output))
+
+    assert [r['paragraph_id'] for r in rows] == ['a', 'b']
+    with open(output) as f:
+        assert [r['paragraph_id'] for r in csv.DictReader(f)] == ['a', 'b']
+    assert not (tmp_path / 'results.csv.tmp').exists()
+
+
+def test_compact_with_no_rows_replaces_old_output(tmp_path):
+    output = tmp_path / 'results.csv'
+    output.write_text('paragraph_id,category\nold,neutral\n')
+
+    assert compact({}, [{'paragraph_id': 'a'}], str(output)) == []
+    with open(output) as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == RESULT_FIELDS
+        assert list(reader) == []
@@ -0,0 +1,32 @@
+from few_shot import validation_example
+
+
+def row(notes):
+    return {'Human logic -- category and notes': notes, 'paragraph': 'Help Singaporeans acquire skills and adapt.'}
+
+
+def fields(example):
+    return dict(line.split(': ', 1) for line in example['response'].split('\n'))
+
+
+def test_supportive_demand_and_framing_come_from_notes():
+    example = validation_example(row('demand_citizen - supportive demand, help to upskill; crisis framing'),
+                                 'demand_citizen')
+    assert fields(example)['supportive_demand'] == '1'
+    assert fields(example)['framing_signal'] == 'crisis_framing'
+
+
+def test_explicit_negatives_in_notes():
+    example = validation_example(row('demand_firm - not supportive; no framing'), 'demand_firm')
+    assert fields(example)['supportive_demand'] == '0'
+    assert fields(example)['framing_signal'] == 'none'
+
+
+def test_rows_with_unstated_fields_are_left_out():
+    assert validation_example(row('demand_citizen - workers must upskill; no framing'), 'demand_citizen') is None
+    assert validation_example(row('promise_citizen - cash handout'), 'promise_citizen') is None
+
+
+def test_supportive_demand_is_zero_outside_demands():
+    example = validation_example(row('promise_firm - grant; framing: none'), 'promise_firm')
+    assert fields(example)['supportive_demand'] == '0'
@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from retry import DeadLetterQueue
+
+
+def entry(paragraph_id):
+    return json.dumps({'paragraph_id': paragraph_id, 'error': 'timeout', 'attempts': 3}) + '\n'
+
+
+def test_dead_letters_skip_blank_lines_and_trim_torn_tail(tmp_path):
+    path = tmp_path / 'dead_letters.jsonl'
+    path.write_text(entry('a') + '\n' + entry('b') + '{"paragraph_id": "c", "err')
+
+    assert list(DeadLetterQueue(str(path)).load()) == ['a', 'b']
+    assert path.read_text() == entry('a') + '\n' + entry('b')
+
+
+def test_dead_letters_refuse_corrupt_line_mid_file(tmp_path):
+    path = tmp_path / 'dead_letters.jsonl'
+    content = entry('a') + 'not json\n' + entry('c')
+    path.write_text(content)
+
+    with pytest.raises(ValueError, match='line 2'):
+        DeadLetterQueue(str(path)).load()
+    assert path.read_text() == content